@@ -2,11 +2,34 @@
 from __future__ import annotations
 
 import base64
+import os
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple
 
 from openai import OpenAI
 
+from app.cost_estimator import image_cost_units
+from app.image_cache import cache_get, cache_put, image_cache_key
+from app.image_hedge import HedgePolicy, hedged_call
+
+
+# 캐시 적중으로 아낀 비용 단위(호출부가 요청 단위로 더한 비용에서 빼는 용도). hero/body 동시 요청이라 lock.
+_SAVED_LOCK = threading.Lock()
+_SAVED_UNITS = 0.0
+
+
+def cached_image_units() -> float:
+    """이번 프로세스에서 캐시 적중으로 API를 안 부른 이미지 비용 단위 합(1024x1024/medium = 1.0)"""
+    with _SAVED_LOCK:
+        return _SAVED_UNITS
+
+
+def _add_saved_units(units: float) -> None:
+    global _SAVED_UNITS
+    with _SAVED_LOCK:
+        _SAVED_UNITS += units
+
 
 def make_gemini_client(api_key: str) -> Any:
     """
@@ -51,6 +74,94 @@ def _is_jpg(b: bytes) -> bool:
     return len(b) >= 3 and b[:3] == b"\xff\xd8\xff"
 
 
+def _b64_at(resp: Any, i: int) -> Optional[str]:
+    """images.generate 응답의 i번째 b64_json (SDK 객체/dict 모두)"""
+    b64 = None
+    try:
+        # SDK object
+        b64 = getattr(resp.data[i], "b64_json", None)
+    except Exception:
+        b64 = None
+    if not b64 and isinstance(resp, dict):
+        try:
+            b64 = resp["data"][i].get("b64_json")
+        except Exception:
+            b64 = None
+    return b64 or None
+
+
+def _check_image_bytes(img_bytes: bytes) -> bytes:
+    if not img_bytes or len(img_bytes) < 200:
+        raise RuntimeError(f"이미지 바이트가 너무 작습니다(len={len(img_bytes) if img_bytes else 0}).")
+
+    if not (_is_png(img_bytes) or _is_jpg(img_bytes)):
+        head = img_bytes[:40]
+        raise RuntimeError(f"이미지 바이트가 PNG/JPG가 아닙니다. head={head!r}")
+    return img_bytes
+
+
+def _request_timeout_sec() -> float:
+    try:
+        return float((os.getenv("IMAGE_REQUEST_TIMEOUT_SEC") or "180").strip())
+    except Exception:
+        return 180.0
+
+
+# 남은 시간이 이보다 짧으면 새 요청/재시도를 보내지 않음(어차피 결과를 못 씀)
+_MIN_REQUEST_SEC = 5.0
+
+
+class _DeadlineReached(TimeoutError):
+    pass
+
+
+def _timeout_until(deadline: Optional[float], attempts_left: int = 1) -> float:
+    """
+    이번 시도의 SDK timeout(초).
+    - deadline(time.monotonic() 기준 절대 시각)이 있으면 남은 시간을 남은 시도 수로 나눈 몫까지만
+      (IMAGE_REQUEST_TIMEOUT_SEC 상한) → 느린 요청 1번이 한도를 다 써서 재시도가 없어지지 않게,
+      호출부가 포기한 요청이 계속 돌며 과금되지도 않게
+    - 남은 시간이 _MIN_REQUEST_SEC 미만이면 _DeadlineReached(TimeoutError)
+    """
+    t = _request_timeout_sec()
+    if deadline is None:
+        return t
+    left = deadline - time.monotonic()
+    if left < _MIN_REQUEST_SEC:
+        raise _DeadlineReached(f"image deadline reached ({max(0.0, left):.1f}s left)")
+    return min(t, max(_MIN_REQUEST_SEC, left / max(1, attempts_left)))
+
+
+def _client_for(gemini_client: Any, deadline: Optional[float]) -> OpenAI:
+    # deadline이 있으면 SDK 자체 재시도(기본 2회)를 끔: 재시도는 호출부 루프가 남은 시간을 보고 결정
+    if deadline is not None and hasattr(gemini_client, "with_options"):
+        return gemini_client.with_options(max_retries=0)
+    return gemini_client
+
+
+# variant별 생성 프로필 기본값: 기존과 같이 둘 다 1024/medium(→ 기본은 n=2 pair 요청 경로).
+# body를 저품질로 받으려면 opt-in: IMAGE_BODY_QUALITY=low (장당 비용 1/4, 본문 이미지 화질 저하)
+# — 프로필이 달라지면 pair 요청 대신 hero/body 개별 동시 요청으로 바뀝니다.
+_PROFILE_DEFAULTS = {
+    "hero": ("1024x1024", "medium"),
+    "body": ("1024x1024", "medium"),
+}
+
+
+def image_profile(variant: str) -> Tuple[str, str]:
+    """
+    variant("hero"/"body")별 (size, quality).
+    - IMAGE_HERO_SIZE / IMAGE_HERO_QUALITY / IMAGE_BODY_SIZE / IMAGE_BODY_QUALITY
+    - 작은 size(모델이 지원할 때)로 받으면 thumb_overlay에서 LANCZOS로 1024까지 키웁니다(body 업로드는 약한 샤픈까지).
+    """
+    size, quality = _PROFILE_DEFAULTS.get(variant, ("1024x1024", "medium"))
+    key = (variant or "").upper()
+    if key:
+        size = (os.getenv(f"IMAGE_{key}_SIZE") or size).strip()
+        quality = (os.getenv(f"IMAGE_{key}_QUALITY") or quality).strip()
+    return size, quality
+
+
 def generate_nanobanana_image_png_bytes(
     gemini_client: Any,
     model: str,
@@ -58,61 +169,88 @@ def generate_nanobanana_image_png_bytes(
     *,
     retries: int = 3,
     sleep_sec: float = 1.2,
-    size: str = "1024x1024",
-    quality: str = "medium",
+    size: Optional[str] = None,
+    quality: Optional[str] = None,
     output_format: str = "png",
+    use_cache: bool = False,
+    cache_id: str = "",
+    variant: str = "",
+    hedge: Optional[HedgePolicy] = None,
+    deadline: Optional[float] = None,
 ) -> bytes:
     """
     OpenAI 이미지 생성 후 bytes 반환.
 
+    ✅ variant("hero"/"body")를 주면 size/quality 기본값을 image_profile(variant)에서 가져옵니다.
+    - 명시한 size/quality가 우선, 둘 다 없으면 1024x1024/medium
+
+    ✅ 지연 상한:
+    - 요청마다 IMAGE_REQUEST_TIMEOUT_SEC(기본 180초) 타임아웃(SDK 기본 10분 대기 방지)
+    - hedge(HedgePolicy)를 주면 과거 p90 지연을 넘긴 요청에 동일 요청을 1번 더 보내 먼저 끝난 쪽 사용
+    - deadline(time.monotonic() 기준)을 주면 요청 timeout을 남은 시간으로 줄이고, 시간이 없으면 재시도하지 않음
+
+    ✅ use_cache=True면 hash(model, size, quality, cache_id 또는 prompt) 디스크 캐시를 먼저 봅니다.
+    - 프롬프트는 실행마다 seed가 달라지므로, 재실행에서도 같아야 하는 호출은
+      cache_id(예: 날짜|슬롯|topic|keyword|style|variant)를 주세요 → 발행 실패 후 재실행 시 이미지 비용 재지불 없음
+
     ✅ 안정성 우선:
     - 일부 환경에서 Responses API의 image_generation tool 출력 파싱이 깨지거나
       SDK 버전 차이로 result가 비어 fallback만 업로드되는 문제가 있었으므로,
       여기서는 OpenAI Images API (`client.images.generate`)를 1순위로 사용합니다.
     - model 파라미터는 호출부 호환을 위해 그대로 받습니다.
     """
+    model = model or "gpt-image-1"
+    p_size, p_quality = image_profile(variant) if variant else ("1024x1024", "medium")
+    size = size or p_size
+    quality = quality or p_quality
+    key = ""
+    if use_cache:
+        key = image_cache_key(model, size, quality, cache_id or prompt)
+        cached = cache_get(key)
+        if cached:
+            print(f"🗃️ image cache hit: {key[:12]}")
+            _add_saved_units(image_cost_units(size, quality))
+            return cached
+
     last_err: Optional[Exception] = None
+    client: OpenAI = _client_for(gemini_client, deadline)  # 이름만 gemini_client일 뿐, OpenAI client입니다.
 
     for attempt in range(1, retries + 1):
         try:
-            client: OpenAI = gemini_client  # 이름만 gemini_client일 뿐, OpenAI client입니다.
+            timeout = _timeout_until(deadline, retries - attempt + 1)
 
             # OpenAI Images API
             # - 최신 SDK에서는 `data[0].b64_json`로 base64가 옵니다.
-            resp = client.images.generate(
-                model=(model or "gpt-image-1"),
-                prompt=prompt,
-                size=size,
-                # quality는 SDK/모델에 따라 지원 여부가 달라서 best-effort로만 사용
-                # (미지원이면 예외가 날 수 있어 try/except가 감싸줍니다)
-                quality=quality,
+            resp = hedged_call(
+                lambda: client.images.generate(
+                    model=model,
+                    prompt=prompt,
+                    size=size,
+                    # quality는 SDK/모델에 따라 지원 여부가 달라서 best-effort로만 사용
+                    # (미지원이면 예외가 날 수 있어 try/except가 감싸줍니다)
+                    quality=quality,
+                    timeout=timeout,
+                ),
+                hedge,
+                units=image_cost_units(size, quality),
+                label=variant or "image",
+                profile=f"{variant or 'image'}:{size}/{quality}",
             )
 
-            b64 = None
-            try:
-                # SDK object
-                b64 = getattr(resp.data[0], "b64_json", None)
-            except Exception:
-                b64 = None
-            if not b64 and isinstance(resp, dict):
-                try:
-                    b64 = resp["data"][0].get("b64_json")
-                except Exception:
-                    b64 = None
+            b64 = _b64_at(resp, 0)
             if not b64:
                 raise RuntimeError("OpenAI 이미지 응답에서 b64_json을 찾지 못했습니다.")
 
-            img_bytes = base64.b64decode(b64)
-
-            if not img_bytes or len(img_bytes) < 200:
-                raise RuntimeError(f"이미지 바이트가 너무 작습니다(len={len(img_bytes) if img_bytes else 0}).")
-
-            if not (_is_png(img_bytes) or _is_jpg(img_bytes)):
-                head = img_bytes[:40]
-                raise RuntimeError(f"이미지 바이트가 PNG/JPG가 아닙니다. head={head!r}")
+            img_bytes = _check_image_bytes(base64.b64decode(b64))
 
+            if use_cache:
+                cache_put(key, img_bytes)
             return img_bytes
 
+        except _DeadlineReached as e:
+            last_err = e
+            print(f"⚠️ OpenAI 이미지 생성 중단: {e}")
+            break
         except Exception as e:
             last_err = e
             print(f"⚠️ OpenAI 이미지 생성 실패 {attempt}/{retries}: {e}")
@@ -120,3 +258,116 @@ def generate_nanobanana_image_png_bytes(
                 time.sleep(sleep_sec * attempt)
 
     raise RuntimeError(f"OpenAI 이미지 생성 최종 실패: {last_err}")
+
+
+def generate_hero_body_png_bytes(
+    gemini_client: Any,
+    model: str,
+    hero_prompt: str,
+    body_prompt: str,
+    *,
+    retries: int = 3,
+    sleep_sec: float = 1.2,
+    size: str = "1024x1024",
+    quality: str = "medium",
+    use_cache: bool = False,
+    cache_ids: Optional[Tuple[str, str]] = None,
+    deadline: Optional[float] = None,
+    hedge: Optional[HedgePolicy] = None,
+) -> Tuple[Optional[bytes], Optional[bytes], int]:
+    """
+    hero/body 두 장을 images.generate 1회(n=2)로 받습니다.
+    - 두 장은 같은 프롬프트의 서로 다른 샘플이므로, hero 프롬프트에 '구도/각도를 서로 다르게'를 붙입니다.
+    - 장별로 검증하고, 못 쓰는 장만 자기 프롬프트로 다시 생성합니다(재생성도 실패하면 None).
+    - 요청 자체가 retries번 모두 실패하면 RuntimeError.
+    반환: (hero_bytes|None, body_bytes|None, image_calls)
+    - image_calls: 요청한 이미지 장수(n=2 요청 2 + 개별 재생성 수, 둘 다 캐시 적중이면 0). 호출부 비용 추정용.
+      개별 재생성이 캐시 적중이면 그 단위는 cached_image_units()에 잡힙니다.
+    - cache_ids: (hero, body) 캐시 키 입력(없으면 프롬프트) — generate_nanobanana_image_png_bytes의 cache_id와 같음
+    - n=2 샘플은 pair 프롬프트 하나에서 나온 것이므로 pair 키(…#0/#1)에 저장합니다.
+      body 단독 프롬프트 키에는 넣지 않음(단독 요청 캐시를 다른 프롬프트 결과로 오염시키지 않도록).
+    - deadline: generate_nanobanana_image_png_bytes와 같음(n=2 요청/개별 재생성 모두 남은 시간 안에서만)
+    - hedge: n=2 요청도 헤징(지연 샘플은 "pair:size/quality" 프로필, 추가 비용은 2장분), 개별 재생성에도 같은 정책
+    """
+    model = model or "gpt-image-1"
+    prompts = [hero_prompt, body_prompt]
+    ids = list(cache_ids) if cache_ids else prompts
+    keys = [image_cache_key(model, size, quality, p) for p in ids]
+    pair_prompt = (
+        f"{hero_prompt}, the two images must differ in camera angle and composition "
+        f"(second image: {body_prompt})"
+    )
+    pair_id = "|".join(ids) + "|pair" if cache_ids else pair_prompt
+    pair_keys = [image_cache_key(model, size, quality, f"{pair_id}#{i}") for i in (0, 1)]
+    out: List[Optional[bytes]] = [None, None]
+
+    if use_cache:
+        for i in (0, 1):
+            # pair 샘플 → 없으면 같은 variant의 단독 요청 결과
+            out[i] = cache_get(pair_keys[i]) or cache_get(keys[i])
+        if out[0] and out[1]:
+            print("🗃️ image cache hit: hero+body")
+            return out[0], out[1], 0
+
+    missing = [i for i in (0, 1) if not out[i]]
+    image_calls = 0
+
+    if len(missing) == 2:
+        image_calls = 2
+        last_err: Optional[Exception] = None
+        resp = None
+        client: OpenAI = _client_for(gemini_client, deadline)
+        for attempt in range(1, retries + 1):
+            try:
+                timeout = _timeout_until(deadline, retries - attempt + 1)
+                resp = hedged_call(
+                    lambda: client.images.generate(
+                        model=model, prompt=pair_prompt, size=size, quality=quality, n=2, timeout=timeout,
+                    ),
+                    hedge,
+                    units=2 * image_cost_units(size, quality),
+                    label="hero+body",
+                    profile=f"pair:{size}/{quality}",
+                )
+                break
+            except _DeadlineReached as e:
+                last_err = e
+                print(f"⚠️ OpenAI 이미지(n=2) 요청 중단: {e}")
+                break
+            except Exception as e:
+                last_err = e
+                print(f"⚠️ OpenAI 이미지(n=2) 요청 실패 {attempt}/{retries}: {e}")
+                if attempt < retries:
+                    time.sleep(sleep_sec * attempt)
+        if resp is None:
+            raise RuntimeError(f"OpenAI 이미지(n=2) 최종 실패: {last_err}")
+
+        for i in (0, 1):
+            try:
+                b64 = _b64_at(resp, i)
+                if not b64:
+                    raise RuntimeError("b64_json 없음")
+                out[i] = _check_image_bytes(base64.b64decode(b64))
+                if use_cache:
+                    cache_put(pair_keys[i], out[i])
+            except Exception as e:
+                print(f"⚠️ {'hero' if i == 0 else 'body'} 변주 검증 실패: {e}")
+                out[i] = None
+
+    # 못 쓰는(또는 캐시에 없던) 변주만 개별 재생성
+    for i in (0, 1):
+        if out[i]:
+            continue
+        label = "hero" if i == 0 else "body"
+        image_calls += 1  # 개별 1장(캐시 적중이면 cached_image_units로 상쇄)
+        try:
+            out[i] = generate_nanobanana_image_png_bytes(
+                gemini_client, model, prompts[i],
+                retries=max(1, retries - 1), sleep_sec=sleep_sec, size=size, quality=quality,
+                use_cache=use_cache, cache_id=ids[i], variant=label, hedge=hedge, deadline=deadline,
+            )
+            print(f"🔁 {label} 변주만 재생성")
+        except Exception as e:
+            print(f"⚠️ {label} 변주 재생성 실패: {e}")
+
+    return out[0], out[1], image_calls
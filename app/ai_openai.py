@@ -5,7 +5,7 @@ import json
 import re
 from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 
 # ------------------------------------------------------------
@@ -15,6 +15,10 @@ def make_openai_client(api_key: str) -> OpenAI:
     return OpenAI(api_key=api_key)
 
 
+def make_async_openai_client(api_key: str) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=api_key)
+
+
 # ------------------------------------------------------------
 # Internal helpers
 # ------------------------------------------------------------
@@ -247,10 +251,7 @@ def generate_blog_post(
     return post2
 
 
-def generate_thumbnail_title(client: OpenAI, model: str, title: str) -> str:
-    """
-    썸네일 오버레이용: 2~8단어 정도의 매우 짧은 문구.
-    """
+def _thumbnail_title_messages(title: str) -> List[Dict[str, str]]:
     title = (title or "").strip()
     prompt = f"""
 다음 글 제목을 보고, 썸네일에 넣을 "짧은 문구"를 2~8단어로 만들어 주세요.
@@ -260,17 +261,30 @@ def generate_thumbnail_title(client: OpenAI, model: str, title: str) -> str:
 
 제목: {title}
 """.strip()
+    return [
+        {"role": "system", "content": "Output ONE short line in Korean. No extra text."},
+        {"role": "user", "content": prompt},
+    ]
 
-    resp = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": "Output ONE short line in Korean. No extra text."},
-            {"role": "user", "content": prompt},
-        ],
-    )
+
+def _clean_thumbnail_title(resp: Any) -> str:
     out = (resp.choices[0].message.content or "").strip()
     out = re.sub(r"[\r\n]+", " ", out).strip()
     # 안전장치: 너무 길면 앞쪽만
     if len(out) > 18:
         out = out[:18].strip()
     return out
+
+
+def generate_thumbnail_title(client: OpenAI, model: str, title: str) -> str:
+    """
+    썸네일 오버레이용: 2~8단어 정도의 매우 짧은 문구.
+    """
+    resp = client.chat.completions.create(model=model, messages=_thumbnail_title_messages(title))
+    return _clean_thumbnail_title(resp)
+
+
+async def generate_thumbnail_title_async(client: AsyncOpenAI, model: str, title: str) -> str:
+    """generate_thumbnail_title의 비동기 버전(같은 프롬프트/후처리)"""
+    resp = await client.chat.completions.create(model=model, messages=_thumbnail_title_messages(title))
+    return _clean_thumbnail_title(resp)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-import requests
+from app import http_pool
 from typing import Dict, Any
 
 from app.image_stats import record_click as record_image_click, update_score as update_image_score
@@ -22,7 +22,7 @@ def ingest_click_log(state: Dict[str, Any], wp_base_url: str) -> Dict[str, Any]:
     log_url = wp_base_url.rstrip("/") + "/wp-content/uploads/auto-click.log"
 
     try:
-        resp = requests.get(log_url, timeout=10)
+        resp = http_pool.get(log_url, timeout=10)
         if resp.status_code != 200:
             print("ℹ️ 클릭 로그 없음")
             return state
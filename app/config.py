@@ -58,5 +58,11 @@ class Settings:
     ADSENSE_SLOT_MID: str = os.getenv("ADSENSE_SLOT_MID", "").strip() or os.getenv("ADSENSE_SLOT_2", "").strip()
     ADSENSE_SLOT_BOTTOM: str = os.getenv("ADSENSE_SLOT_BOTTOM", "").strip() or os.getenv("ADSENSE_SLOT_3", "").strip()
 
+    # 상/중/하 슬롯에 AdSense 광고 자동 삽입(1=켜기). 기본 0: 슬롯 값만 있어도 넣지 않습니다.
+    ADSENSE_AUTO_INSERT: int = int(os.getenv("ADSENSE_AUTO_INSERT", "0") or "0")
+
     # 본문에 adsbygoogle.js 스크립트를 같이 넣을지 (테마/플러그인에서 이미 넣었으면 0 권장)
     ADSENSE_INCLUDE_SCRIPT: int = int(os.getenv("ADSENSE_INCLUDE_SCRIPT", "0") or "0")
+
+    # 광고 스크립트 방식: inline(슬롯마다 push) / deferred(초기화 1개로 묶음) / lazy(중·하단은 스크롤 시 push)
+    ADSENSE_SCRIPT_MODE: str = os.getenv("ADSENSE_SCRIPT_MODE", "inline").strip() or "inline"
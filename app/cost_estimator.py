@@ -4,13 +4,24 @@ from __future__ import annotations
 def estimate_post_usd(
     *,
     text_tokens: int,
-    image_count: int,
+    image_count: float,
     text_usd_per_1k: float = 0.002,   # 예: gpt-5 mini 추정
     image_usd_each: float = 0.02,     # 이미지 1장 추정
 ) -> float:
     """
     보수적 비용 추정
+    - image_count: 1024x1024/medium 1장 = 1.0 단위 (image_cost_units 합계를 넣어도 됨)
     """
     text_cost = (text_tokens / 1000.0) * text_usd_per_1k
     image_cost = image_count * image_usd_each
     return round(text_cost + image_cost, 4)
+
+
+# 1024x1024/medium 대비 상대 단가(gpt-image-1 공개 단가 비율 기준)
+_SIZE_UNITS = {"512x512": 0.5, "1024x1024": 1.0, "1536x1024": 1.5, "1024x1536": 1.5}
+_QUALITY_UNITS = {"low": 0.25, "medium": 1.0, "high": 4.0, "auto": 1.0}
+
+
+def image_cost_units(size: str = "1024x1024", quality: str = "medium") -> float:
+    """이미지 1장의 비용 단위(1024x1024/medium = 1.0)"""
+    return _SIZE_UNITS.get((size or "").lower(), 1.0) * _QUALITY_UNITS.get((quality or "").lower(), 1.0)
@@ -2,7 +2,7 @@
 import os
 import hmac
 import hashlib
-import requests
+from app import http_pool
 from datetime import datetime, timezone
 from urllib.parse import quote
 
@@ -51,7 +51,7 @@ def search_products(keyword: str, *, limit: int = 8, sub_id: str = "") -> list[d
         "Content-Type": "application/json",
     }
 
-    r = requests.get(url, headers=headers, timeout=15)
+    r = http_pool.get(url, headers=headers, timeout=15)
     if r.status_code != 200:
         raise RuntimeError(f"Coupang API error {r.status_code}: {r.text[:500]}")
 
@@ -3,7 +3,22 @@ from __future__ import annotations
 import html
 import os
 import re
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# -------------------------
+# 슬롯(삽입 위치) 이름
+# -------------------------
+# format_post_v2(with_slots=True)가 렌더링하면서 각 위치의 오프셋을 기록합니다.
+# 광고/쿠팡 블록은 렌더 후 HTML을 다시 검색하지 않고 assemble_slots()로 한 번에 채웁니다.
+SLOT_TOP = "top"                          # 본문 래퍼 시작 직후(대가성 문구 등)
+SLOT_AFTER_SUMMARY = "after_summary"      # 요약 박스 다음
+SLOT_AFTER_FIRST_LIST = "after_first_list"  # 첫 목록(ul)이 들어간 블록 다음
+SLOT_END = "end"                          # 본문 래퍼 닫기 직전
+
+
+def slot_before_section(n: int) -> str:
+    """n번째(1부터) 섹션 h2 바로 앞 슬롯 이름"""
+    return f"before_section_{int(n)}"
 
 
 def _env(key: str, default: str = "") -> str:
@@ -68,6 +83,23 @@ def _h2(title: str) -> str:
 """.strip()
 
 
+# 이미지 파이프라인(to_square_1024) 출력 크기 → width/height로 박아 레이아웃 밀림(CLS) 방지
+IMAGE_W = 1024
+IMAGE_H = 1024
+
+
+def _img(src: str, alt: str, *, hero: bool, shadow: str) -> str:
+    """
+    - hero(첫 화면, LCP 후보): fetchpriority="high" + 즉시 로딩
+    - 그 외(스크롤 아래): loading="lazy" decoding="async"
+    """
+    load = 'fetchpriority="high"' if hero else 'loading="lazy" decoding="async"'
+    return (
+        f'<img src="{src}" alt="{alt}" width="{IMAGE_W}" height="{IMAGE_H}" {load} '
+        f'style="width:100%; height:auto; border-radius:16px; box-shadow:{shadow};" />'
+    )
+
+
 def _para(text: str) -> str:
     t = _bold_to_color(text)
     if not t:
@@ -75,6 +107,75 @@ def _para(text: str) -> str:
     return f"<p style='margin:0 0 14px; font-size:17px; line-height:1.85; color:#111827;'>{t}</p>"
 
 
+class _SlotWriter:
+    """
+    parts를 "\n"으로 이어붙이면서 이름 붙은 슬롯의 문자 오프셋을 함께 기록합니다.
+    (빈 part는 건너뛰므로 "\n".join([p for p in parts if p.strip()])와 결과가 같습니다.)
+    """
+
+    def __init__(self, head: str):
+        self._chunks: List[str] = [head]
+        self._pos = len(head)
+        self._empty = True
+        self.slots: Dict[str, int] = {}
+
+    def add(self, part: str) -> None:
+        if not part or not part.strip():
+            return
+        if not self._empty:
+            self._chunks.append("\n")
+            self._pos += 1
+        self._chunks.append(part)
+        self._pos += len(part)
+        self._empty = False
+
+    def mark(self, name: str) -> None:
+        # 같은 이름은 처음 기록된 위치를 유지
+        self.slots.setdefault(name, self._pos)
+
+    def close(self, tail: str) -> str:
+        self._chunks.append(tail)
+        return "".join(self._chunks)
+
+
+def assemble_slots(
+    html: str,
+    slots: Dict[str, int],
+    fills: Sequence[Tuple[str, str]],
+) -> str:
+    """
+    format_post_v2(with_slots=True)가 돌려준 slots 오프셋에 블록들을 한 번에 채웁니다.
+    - fills: [(슬롯이름, html블록), ...] (같은 슬롯이면 넣은 순서 유지)
+    - 없는 슬롯 이름은 SLOT_END로 보냅니다(섹션 수가 적은 글 등).
+    - 렌더된 문서를 다시 정규식/문자열 검색하지 않습니다.
+    """
+    if not html:
+        return html
+
+    end_pos = slots.get(SLOT_END, len(html))
+    placed: List[Tuple[int, int, str]] = []
+    for i, (name, block) in enumerate(fills or []):
+        if not block or not block.strip():
+            continue
+        pos = slots.get(name)
+        if pos is None:
+            pos = end_pos
+        placed.append((pos, i, block))
+
+    if not placed:
+        return html
+
+    placed.sort(key=lambda x: (x[0], x[1]))
+    out: List[str] = []
+    cur = 0
+    for pos, _, block in placed:
+        out.append(html[cur:pos])
+        out.append("\n" + block)
+        cur = pos
+    out.append(html[cur:])
+    return "".join(out)
+
+
 def format_post_v2(
     *,
     title: str,
@@ -87,9 +188,12 @@ def format_post_v2(
     warning_bullets: Optional[List[str]] = None,
     checklist_bullets: Optional[List[str]] = None,
     outro: Optional[str] = None,
+    with_slots: bool = False,
 ):
     """
-    main.py에서 _as_html()로 감싸 쓰고 있으니 문자열 반환하면 됩니다.
+    본문 HTML 문자열을 반환합니다.
+    - with_slots=True면 (html, slots)를 반환합니다.
+      slots는 {슬롯이름: 문자 오프셋}이며 assemble_slots()로 블록을 채웁니다.
     """
     sections = sections or []
     # 섹션 3개 기준으로 우선 배치(더 많으면 뒤로 이어붙임)
@@ -125,7 +229,7 @@ def format_post_v2(
     # 히어로 이미지(요약 다음)
     hero_html = f"""
 <div style="margin:18px 0 22px;">
-  <img src="{hero_url}" alt="{_escape(title)}" style="width:100%; border-radius:16px; box-shadow:0 6px 18px rgba(0,0,0,0.10);" />
+  {_img(hero_url, _escape(title), hero=True, shadow="0 6px 18px rgba(0,0,0,0.10)")}
 </div>
 """.strip()
 
@@ -153,45 +257,61 @@ def format_post_v2(
 """.strip()
 
     # 본문 구성(요청하신 포맷 고정)
-    parts: List[str] = []
+    doc = _SlotWriter("<div style=\"font-family:'Malgun Gothic','Apple SD Gothic Neo',sans-serif;\">\n")
+    has_list = False
+
+    def _mark_list(block: str) -> None:
+        nonlocal has_list
+        if block and not has_list:
+            has_list = True
+            doc.mark(SLOT_AFTER_FIRST_LIST)
+
+    doc.mark(SLOT_TOP)
     if disclosure_html:
-        parts.append(disclosure_html)
+        doc.add(disclosure_html)
 
-    parts.append(_ad_block("top"))          # 2. 에드센스 수동광고(상단)
-    parts.append(summary_html)              # 3. 본글 요약
-    parts.append(hero_html)                 # 4. 이미지(히어로)
+    doc.add(_ad_block("top"))               # 2. 에드센스 수동광고(상단)
+    doc.add(summary_html)                   # 3. 본글 요약
+    doc.mark(SLOT_AFTER_SUMMARY)
+    _mark_list(summary_html)
+    doc.add(hero_html)                      # 4. 이미지(히어로)
 
     # 섹션 1~N
     for idx, (h, b) in enumerate(zip(sec_titles, sec_bodies)):
         if idx == 2:
-            parts.append(_ad_block("mid"))  # 9. 에드센스 수동광고(중간) - 3번째 섹션 앞
-        parts.append(_h2(h))
+            doc.add(_ad_block("mid"))       # 9. 에드센스 수동광고(중간) - 3번째 섹션 앞
+        doc.mark(slot_before_section(idx + 1))
+        doc.add(_h2(h))
         # 본문은 여러 문단일 수 있으니 줄바꿈 기준으로 p 분리
         for para in [x.strip() for x in b.split("\n") if x.strip()]:
-            parts.append(_para(para))
+            doc.add(_para(para))
 
         # 중간 이미지(원하시면 2번째 섹션 끝에 넣기)
         if idx == 1 and body_url:
-            parts.append(f"""
+            doc.add(f"""
 <div style="margin:22px 0;">
-  <img src="{body_url}" alt="{_escape(title)} 관련 이미지" style="width:100%; border-radius:16px; box-shadow:0 6px 18px rgba(0,0,0,0.08);" />
+  {_img(body_url, _escape(title) + " 관련 이미지", hero=False, shadow="0 6px 18px rgba(0,0,0,0.08)")}
 </div>
 """.strip())
 
-    parts.append(warn_html)
-    parts.append(checklist_html)
+    doc.add(warn_html)
+    _mark_list(warn_html)
+    doc.add(checklist_html)
+    _mark_list(checklist_html)
 
     if outro:
-        parts.append(_h2("마무리"))
+        doc.add(_h2("마무리"))
         for para in [x.strip() for x in str(outro).split("\n") if x.strip()]:
-            parts.append(_para(para))
+            doc.add(_para(para))
 
-    parts.append(_ad_block("bottom"))       # 12. 에드센스 수동광고(하단)
+    doc.add(_ad_block("bottom"))            # 12. 에드센스 수동광고(하단)
+    doc.mark(SLOT_END)
 
-    final = "\n".join([p for p in parts if p and p.strip()])
+    # 목록이 하나도 없으면 맨 위(기존 main.py 동작과 동일)
+    if not has_list:
+        doc.slots[SLOT_AFTER_FIRST_LIST] = doc.slots[SLOT_TOP]
 
-    return f"""
-<div style="font-family:'Malgun Gothic','Apple SD Gothic Neo',sans-serif;">
-{final}
-</div>
-""".strip()
+    html_out = doc.close("\n</div>")
+    if with_slots:
+        return html_out, dict(doc.slots)
+    return html_out
@@ -65,3 +65,30 @@ def increment_post_count(
     by_month[month_key] = float(by_month.get(month_key, 0.0)) + float(estimated_usd)
 
     return state
+
+
+def month_usage_ratio(state: Dict[str, Any], cfg: GuardConfig) -> float:
+    """이번 달 누적 비용 / 월 예산 (예산 압박 판단용)"""
+    limits = state.get("limits", {}) if isinstance(state.get("limits"), dict) else {}
+    month_usd = float(limits.get("usd_by_month", {}).get(_kst_month_key(), 0.0))
+    if cfg.max_usd_per_month <= 0:
+        return 0.0
+    return month_usd / cfg.max_usd_per_month
+
+
+def image_budget_pressure(state: Dict[str, Any], cfg: GuardConfig, ratio: float = 0.9) -> bool:
+    """
+    이미지 절차 생성 전환 기준: 이번 달 비용만 봅니다(일일 발행 수 초과는 비용과 무관).
+    - 월 비용 / 예산 >= ratio(IMAGE_PROCEDURAL_BUDGET_RATIO), 월 예산을 넘었으면 ratio와 상관없이 True
+    """
+    used = month_usage_ratio(state, cfg)
+    return used >= min(float(ratio), 1.0)
+
+
+def add_month_usd(state: Dict[str, Any], usd: float) -> Dict[str, Any]:
+    """발행 없이 비용만 누적(예: 이미지 풀 채우기)"""
+    limits = state.setdefault("limits", {})
+    by_month = limits.setdefault("usd_by_month", {})
+    month_key = _kst_month_key()
+    by_month[month_key] = float(by_month.get(month_key, 0.0)) + float(usd)
+    return state
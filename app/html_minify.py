@@ -0,0 +1,102 @@
+# app/html_minify.py
+from __future__ import annotations
+
+import re
+from typing import List
+
+
+# 내용을 절대 건드리지 않는 블록(<pre>/<script>/<style>/<textarea>)
+_PROTECTED_RE = re.compile(
+    r"<(pre|script|style|textarea)\b[^>]*>.*?</\1\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# 따옴표 값 안의 ">"까지 포함해 속성을 읽음(alt="a > b"). 이 형태로 안 읽히는 태그는 건드리지 않습니다.
+_TAG_RE = re.compile(
+    r"""<([A-Za-z][A-Za-z0-9:-]*)"""
+    r"""((?:\s+[^\s"'<>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*)\s*(/?)>""",
+    re.DOTALL,
+)
+_ATTR_RE = re.compile(
+    r"""([^\s=/"'<>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""",
+    re.DOTALL,
+)
+# 태그 사이 공백: 블록 태그 둘 사이에서만 삭제(렌더링에 영향 없음).
+# 인라인 요소 사이(</strong> <a>)는 단어 간격이므로 1칸으로만 줄입니다.
+_BLOCK_TAGS = (
+    "address|article|aside|blockquote|body|caption|col|colgroup|dd|details|div|dl|dt|fieldset|"
+    "figcaption|figure|footer|form|h[1-6]|head|header|hr|html|li|link|main|meta|nav|ol|p|section|"
+    "summary|table|tbody|td|tfoot|th|thead|title|tr|ul"
+)
+_BETWEEN_BLOCKS_RE = re.compile(
+    rf"""(</?(?:{_BLOCK_TAGS})\b(?:"[^"]*"|'[^']*'|[^"'<>])*>)\s+(?=</?(?:{_BLOCK_TAGS})\b)""",
+    re.IGNORECASE,
+)
+_WS_RE = re.compile(r"\s+")
+
+# 남겨둘 주석: 광고 마커, WP 블록 주석, WP 구조 마커(more/nextpage/noteaser), IE 조건부 주석
+_KEEP_COMMENT_RE = re.compile(
+    r"^<!--\s*(?:AD_|ADSENSE|SUMMARY\s*END|/?wp:|more\b|nextpage\b|noteaser\b|\[if|<!\[endif|\x00)",
+    re.IGNORECASE,
+)
+
+
+def _keep_comment(m: "re.Match[str]") -> str:
+    c = m.group(0)
+    return c if _KEEP_COMMENT_RE.match(c) else ""
+
+
+def _norm_tag(m: "re.Match[str]", vals: List[str]) -> str:
+    """
+    속성 사이 공백 정리 + 따옴표를 큰따옴표로 통일. 값 내용(공백/줄바꿈 포함)은 그대로 둡니다.
+    - 전체 공백 압축에 걸리는 값은 vals에 보관하고 자리표시(\x01n\x01)로 바꿔 둠 → minify_html 끝에서 복원
+    """
+    name, attrs, slash = m.group(1), m.group(2) or "", m.group(3)
+    parts: List[str] = [name]
+    for am in _ATTR_RE.finditer(attrs):
+        key = am.group(1)
+        if am.group(2) is not None:
+            val = am.group(2)
+        elif am.group(3) is not None:
+            val = am.group(3).replace('"', "&quot;")
+        elif am.group(4) is not None:
+            val = am.group(4)
+        else:
+            parts.append(key)  # boolean 속성
+            continue
+        if _WS_RE.sub(" ", val) != val:
+            vals.append(val)
+            val = f"\x01{len(vals) - 1}\x01"
+        parts.append(f'{key}="{val}"')
+    return "<" + " ".join(parts) + ("/" if slash else "") + ">"
+
+
+def minify_html(html: str) -> str:
+    """
+    WP로 보내기 전 본문 HTML 경량화(안전 모드).
+    - 연속 공백은 1칸으로, 블록 태그 사이 공백만 제거(인라인 요소 사이 간격은 유지)
+    - 광고 마커/WP 블록·구조 주석이 아닌 주석 제거
+    - 속성 따옴표를 "..."로 통일(속성 값은 바이트 그대로)
+    - <pre>/<script>/<style>/<textarea> 내용은 그대로 둡니다.
+    """
+    if not html:
+        return html or ""
+
+    kept: List[str] = []
+    vals: List[str] = []
+
+    def _stash(m: "re.Match[str]") -> str:
+        kept.append(m.group(0))
+        return f"<!--\x00{len(kept) - 1}\x00-->"
+
+    s = _PROTECTED_RE.sub(_stash, html)
+    s = _COMMENT_RE.sub(_keep_comment, s)
+    s = _TAG_RE.sub(lambda m: _norm_tag(m, vals), s)
+    s = _WS_RE.sub(" ", s).strip()
+    s = _BETWEEN_BLOCKS_RE.sub(r"\1", s)
+
+    for i, val in enumerate(vals):
+        s = s.replace(f"\x01{i}\x01", val, 1)
+    for i, block in enumerate(kept):
+        s = s.replace(f"<!--\x00{i}\x00-->", block, 1)
+    return s
@@ -0,0 +1,211 @@
+# app/http_pool.py
+"""
+모든 외부 HTTP 호출이 공유하는 세션 계층.
+
+- 호스트(scheme://netloc)별 requests.Session 1개: keep-alive로 같은 호스트의 TCP/TLS 핸드셰이크를 재사용
+- 풀 크기: HTTP_POOL_MAXSIZE(기본 8) — 스레드 동시 요청(이미지 재렌더링 업로드, 네이버 병렬 조회 등)용
+- timeout을 안 주면 기본 (연결 HTTP_CONNECT_TIMEOUT=5s, 읽기 HTTP_READ_TIMEOUT=30s)
+- Accept-Encoding: gzip, deflate (응답 압축)
+- http_stats()/report_http(): 호스트별 요청 수 / 새 연결 수 / 재사용 수
+  (비동기 요청은 httpx 연결 trace로 따로 세어 합산 → 재사용 수가 부풀지 않음)
+- async_request/async_get/async_post: main.async_run()용 비동기 버전.
+  httpx가 있으면 호스트별 httpx.AsyncClient(같은 풀/timeout 규칙), 없으면 동기 세션을 스레드로 실행
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx  # openai SDK 의존성으로 보통 함께 설치됨
+except Exception:  # pragma: no cover
+    httpx = None
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
+
+
+def default_timeout() -> Tuple[float, float]:
+    return _env_float("HTTP_CONNECT_TIMEOUT", 5.0), _env_float("HTTP_READ_TIMEOUT", 30.0)
+
+
+_LOCK = threading.Lock()
+_SESSIONS: Dict[str, requests.Session] = {}
+_REQUESTS: Dict[str, int] = {}
+# async_request(httpx) 전용: 요청 수 / 새 TCP 연결 수(requests 세션 풀과 별개)
+_ASYNC_REQUESTS: Dict[str, int] = {}
+_ASYNC_CONNECTIONS: Dict[str, int] = {}
+
+
+def _host_key(url: str) -> str:
+    p = urlsplit(url)
+    return f"{p.scheme}://{p.netloc}".lower()
+
+
+def _new_session() -> requests.Session:
+    s = requests.Session()
+    size = max(1, int(_env_float("HTTP_POOL_MAXSIZE", 8)))
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=size, pool_block=False)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+    return s
+
+
+def session_for(url: str) -> requests.Session:
+    key = _host_key(url)
+    with _LOCK:
+        s = _SESSIONS.get(key)
+        if s is None:
+            s = _new_session()
+            _SESSIONS[key] = s
+        return s
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """requests.request와 같은 인자. timeout 기본값만 채워서 호스트 세션으로 보냅니다."""
+    kwargs.setdefault("timeout", default_timeout())
+    s = session_for(url)
+    key = _host_key(url)
+    with _LOCK:
+        _REQUESTS[key] = _REQUESTS.get(key, 0) + 1
+    return s.request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def _new_connections(s: requests.Session) -> int:
+    n = 0
+    for adapter in set(s.adapters.values()):
+        pm = getattr(adapter, "poolmanager", None)
+        pools = getattr(pm, "pools", None)
+        if pools is None:
+            continue
+        for k in list(pools.keys()):
+            pool = pools.get(k)
+            n += int(getattr(pool, "num_connections", 0) or 0)
+    return n
+
+
+def http_stats() -> Dict[str, Dict[str, int]]:
+    """{host: {"requests", "connections", "reused"}} (이번 프로세스 누적)"""
+    with _LOCK:
+        sessions = dict(_SESSIONS)
+        counts = dict(_REQUESTS)
+        async_counts = dict(_ASYNC_REQUESTS)
+        async_conns = dict(_ASYNC_CONNECTIONS)
+    out: Dict[str, Dict[str, int]] = {}
+    for key in set(sessions) | set(async_counts):
+        s = sessions.get(key)
+        req = counts.get(key, 0)
+        conns = _new_connections(s) if s is not None else 0
+        a_req = async_counts.get(key, 0)
+        a_conns = async_conns.get(key, 0)
+        out[key] = {
+            "requests": req + a_req,
+            "connections": conns + a_conns,
+            "reused": max(0, req - conns) + max(0, a_req - a_conns),
+        }
+    return out
+
+
+def report_http() -> None:
+    stats = http_stats()
+    if not stats:
+        return
+    total_req = sum(v["requests"] for v in stats.values())
+    total_reused = sum(v["reused"] for v in stats.values())
+    print(f"🌐 http: {total_req} requests, {total_reused} reused connections")
+    for host, v in sorted(stats.items(), key=lambda kv: -kv[1]["requests"]):
+        print(f"   - {host}: req={v['requests']} conn={v['connections']} reused={v['reused']}")
+
+
+# -----------------------------
+# async (main.async_run)
+# -----------------------------
+_ASYNC_CLIENTS: Dict[Tuple[int, str], Any] = {}
+
+
+def _httpx_timeout(timeout: Any) -> Any:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _async_client_for(url: str) -> Any:
+    # AsyncClient는 이벤트 루프에 묶이므로 (루프, 호스트)별로 보관
+    key = (id(asyncio.get_running_loop()), _host_key(url))
+    c = _ASYNC_CLIENTS.get(key)
+    if c is None:
+        size = max(1, int(_env_float("HTTP_POOL_MAXSIZE", 8)))
+        c = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+        _ASYNC_CLIENTS[key] = c
+    return c
+
+
+async def async_request(method: str, url: str, **kwargs: Any) -> Any:
+    """
+    request()와 같은 인자(headers/params/data/json/auth/timeout).
+    반환 객체는 status_code/text/json()을 가집니다(httpx.Response 또는 requests.Response).
+    """
+    kwargs.setdefault("timeout", default_timeout())
+    if httpx is None:
+        return await asyncio.to_thread(request, method, url, **kwargs)
+
+    key = _host_key(url)
+    with _LOCK:
+        _ASYNC_REQUESTS[key] = _ASYNC_REQUESTS.get(key, 0) + 1
+
+    async def _trace(event: str, info: Any) -> None:
+        # httpcore trace: 새 TCP 연결을 맺을 때만 발생(풀에서 재사용하면 없음)
+        if event == "connection.connect_tcp.complete":
+            with _LOCK:
+                _ASYNC_CONNECTIONS[key] = _ASYNC_CONNECTIONS.get(key, 0) + 1
+
+    kwargs["extensions"] = {**(kwargs.get("extensions") or {}), "trace": _trace}
+    kwargs["timeout"] = _httpx_timeout(kwargs["timeout"])
+    data = kwargs.pop("data", None)
+    if isinstance(data, (bytes, bytearray)):
+        kwargs["content"] = bytes(data)
+    elif data is not None:
+        kwargs["data"] = data
+    return await _async_client_for(url).request(method, url, **kwargs)
+
+
+async def async_get(url: str, **kwargs: Any) -> Any:
+    return await async_request("GET", url, **kwargs)
+
+
+async def async_post(url: str, **kwargs: Any) -> Any:
+    return await async_request("POST", url, **kwargs)
+
+
+async def aclose_async_clients() -> None:
+    """현재 루프에서 만든 AsyncClient 정리(asyncio.run 종료 전에 호출)"""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [k for k in _ASYNC_CLIENTS if k[0] == loop_id]:
+        c = _ASYNC_CLIENTS.pop(key)
+        try:
+            await c.aclose()
+        except Exception:
+            pass
@@ -0,0 +1,223 @@
+# app/image_bench.py
+"""
+글 1개 기준 이미지 단계 벤치마크: 경로별 벽시계 시간 + API 비용(추정).
+
+    python -m app.image_bench            # 시뮬레이션(요청 지연은 IMAGE_BENCH_LATENCY_SEC로 가정)
+    python -m app.image_bench --live     # 실제 이미지 API 호출(OPENAI_API_KEY 필요, 비용 발생)
+    python -m app.image_bench --render   # 로컬 렌더링만: 기존 체인 vs 단일 디코드 파이프라인(benchmark_pipeline)
+
+경로
+- two  : 1024 정사각 2회(hero, body 순차) — 기존
+- pair : 1024 정사각 n=2 요청 1회
+- wide : 1536×1024 1회 → 로컬 엔트로피 크롭(hero/body)
+- profile : hero 1024/medium + body 1024/low 동시 요청(opt-in: IMAGE_BODY_QUALITY=low)
+- profile_small : hero 1024/medium + body 512/low 동시 요청 → 로컬 LANCZOS 업스케일(작은 size 지원 모델용)
+
+시뮬레이션 비용은 cost_estimator 단가표, 시간은 가정한 지연 기준이라 실측이 아닙니다(--live로 확인).
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Tuple
+
+from PIL import Image, ImageDraw
+
+from app.ai_gemini_image import generate_hero_body_png_bytes, generate_nanobanana_image_png_bytes
+from app.cost_estimator import estimate_post_usd, image_cost_units
+from app.thumb_overlay import add_title_to_image, render_square_image, to_square_1024, wide_canvas_crops
+
+_PROMPT = "morning stretching routine, calm illustration, clean background, no text"
+_TITLE = "아침 스트레칭 핵심 정리"
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
+
+
+# 시뮬레이션 가정: quality별 상대 지연(medium = 1.0)
+_SIM_QUALITY_LATENCY = {"low": 0.4, "medium": 1.0, "high": 2.5}
+
+
+class _SimImages:
+    """images.generate 흉내: 크기/quality에 비례한 지연 + 합성 이미지(b64)"""
+
+    def __init__(self, latency_sec: float):
+        self.latency_sec = latency_sec
+        self.requests = 0
+
+    def generate(self, *, model: str, prompt: str, size: str, quality: str, n: int = 1, **_: Any):
+        import base64
+
+        self.requests += 1
+        w, h = (int(x) for x in size.split("x"))
+        # 지연은 픽셀 수의 제곱근에 비례한다고 가정(1024² = latency_sec), n장은 병렬 생성으로 가정
+        time.sleep(
+            self.latency_sec * ((w * h) / float(1024 * 1024)) ** 0.5 * _SIM_QUALITY_LATENCY.get(quality, 1.0)
+        )
+
+        data = []
+        for i in range(n):
+            rng = random.Random(hash((prompt, size, i)))
+            img = Image.effect_noise((w, h), 30).convert("RGB")
+            d = ImageDraw.Draw(img)
+            for _ in range(12):
+                x, y, r = rng.randrange(w), rng.randrange(h), rng.randrange(40, 220)
+                d.ellipse((x - r, y - r, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+            out = BytesIO()
+            img.save(out, format="PNG", compress_level=1)
+            data.append(type("D", (), {"b64_json": base64.b64encode(out.getvalue()).decode()})())
+        return type("R", (), {"data": data})()
+
+
+class _SimClient:
+    def __init__(self, latency_sec: float):
+        self.images = _SimImages(latency_sec)
+
+
+def _finish(hero: bytes, body: bytes) -> None:
+    render_square_image(hero, _TITLE)
+    render_square_image(body, sharpen_upscaled=True)
+
+
+def _path_two(client: Any, model: str) -> float:
+    h = generate_nanobanana_image_png_bytes(client, model, _PROMPT + ", centered subject", retries=1)
+    b = generate_nanobanana_image_png_bytes(client, model, _PROMPT + ", different angle", retries=1)
+    _finish(h, b)
+    return 2 * image_cost_units()
+
+
+def _path_pair(client: Any, model: str) -> float:
+    h, b, units = generate_hero_body_png_bytes(
+        client, model, _PROMPT + ", centered subject", _PROMPT + ", different angle", retries=1
+    )
+    _finish(h or b"", b or h or b"")
+    return float(units) * image_cost_units()
+
+
+def _path_wide(client: Any, model: str, size: str = "1536x1024") -> float:
+    wide = generate_nanobanana_image_png_bytes(client, model, _PROMPT + ", wide 3:2 landscape", size=size, retries=1)
+    h, b = wide_canvas_crops(wide)
+    _finish(h, b)
+    return image_cost_units(size)
+
+
+def _concurrent(client: Any, model: str, hero: Tuple[str, str], body: Tuple[str, str]) -> float:
+    def one(prompt: str, prof: Tuple[str, str]) -> bytes:
+        return generate_nanobanana_image_png_bytes(client, model, prompt, size=prof[0], quality=prof[1], retries=1)
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        fh = ex.submit(one, _PROMPT + ", centered subject", hero)
+        fb = ex.submit(one, _PROMPT + ", different angle", body)
+        h, b = fh.result(), fb.result()
+    _finish(h, b)
+    return image_cost_units(*hero) + image_cost_units(*body)
+
+
+def _path_profile(client: Any, model: str) -> float:
+    return _concurrent(client, model, ("1024x1024", "medium"), ("1024x1024", "low"))
+
+
+def _path_profile_small(client: Any, model: str) -> float:
+    return _concurrent(client, model, ("1024x1024", "medium"), ("512x512", "low"))
+
+
+PATHS: Dict[str, Callable[[Any, str], float]] = {
+    "two": _path_two,
+    "pair": _path_pair,
+    "wide": _path_wide,
+    "profile": _path_profile,
+    "profile_small": _path_profile_small,
+}
+
+
+def benchmark_paths(client: Any, model: str = "gpt-image-1", *, names: List[str] | None = None) -> Dict[str, Dict[str, Any]]:
+    """경로별 {sec, cost_units, usd} (글 1개 이미지 단계)"""
+    out: Dict[str, Dict[str, Any]] = {}
+    for name in names or list(PATHS):
+        t0 = time.perf_counter()
+        units = PATHS[name](client, model)
+        out[name] = {
+            "sec": round(time.perf_counter() - t0, 3),
+            "cost_units": units,
+            "usd": estimate_post_usd(text_tokens=0, image_count=units),
+        }
+    return out
+
+
+# -----------------------------
+# 로컬 렌더링(오버레이) 단계
+# -----------------------------
+def _legacy_chain(hero_bytes: bytes, body_bytes: bytes, title: str):
+    hero = to_square_1024(hero_bytes)
+    body = to_square_1024(body_bytes)
+    return to_square_1024(add_title_to_image(hero, title)), body
+
+
+def _pipeline_chain(hero_bytes: bytes, body_bytes: bytes, title: str):
+    return render_square_image(hero_bytes, title), render_square_image(body_bytes)
+
+
+def _measure(fn, *args, rounds: int = 5):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(*args)
+    elapsed = (time.perf_counter() - t0) / rounds
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def benchmark_pipeline(hero_bytes: bytes, body_bytes: bytes, title: str, *, rounds: int = 5) -> dict:
+    """
+    run()의 이미지 단계(히어로+본문) 기존 체인 vs 단일 디코드 파이프라인 비교.
+    - sec: 1회 평균 시간
+    - peak_py_bytes: tracemalloc 최대치(파이썬 힙의 PNG 버퍼 등; Pillow 내부 픽셀 버퍼는 제외)
+    """
+    legacy_t, legacy_m = _measure(_legacy_chain, hero_bytes, body_bytes, title, rounds=rounds)
+    pipe_t, pipe_m = _measure(_pipeline_chain, hero_bytes, body_bytes, title, rounds=rounds)
+    return {
+        "legacy_sec": round(legacy_t, 4),
+        "pipeline_sec": round(pipe_t, 4),
+        "legacy_peak_py_bytes": legacy_m,
+        "pipeline_peak_py_bytes": pipe_m,
+    }
+
+
+def _sample(seed: int) -> bytes:
+    rng = random.Random(seed)
+    img = Image.effect_noise((1536, 1024), 40).convert("RGB")
+    ImageDraw.Draw(img).ellipse((200, 100, 1200, 900), fill=tuple(rng.randrange(256) for _ in range(3)))
+    out = BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+if __name__ == "__main__":
+    if "--render" in sys.argv:
+        print(benchmark_pipeline(_sample(1), _sample(2), "혈압 관리 핵심 정리"))
+        sys.exit(0)
+
+    names = [a for a in sys.argv[1:] if a in PATHS] or None
+    if "--live" in sys.argv:
+        from app.ai_gemini_image import make_gemini_client
+
+        client: Any = make_gemini_client(os.getenv("IMAGE_API_KEY") or os.getenv("OPENAI_API_KEY") or "")
+        model = os.getenv("GEMINI_IMAGE_MODEL", "gpt-image-1")
+    else:
+        client = _SimClient(_env_float("IMAGE_BENCH_LATENCY_SEC", 2.0))
+        model = "gpt-image-1"
+
+    for name, r in benchmark_paths(client, model, names=names).items():
+        print(f"{name:13s} sec={r['sec']:7.3f}  cost_units={r['cost_units']:.2f}  usd≈{r['usd']:.4f}")
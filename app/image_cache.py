@@ -0,0 +1,113 @@
+# app/image_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+def _env(key: str, default: str = "") -> str:
+    return (os.getenv(key) or default).strip()
+
+
+def _cache_dir() -> str:
+    return _env("IMAGE_CACHE_DIR", ".image_cache")
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(_env("IMAGE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+    except Exception:
+        return 200 * 1024 * 1024
+
+
+# 실행(프로세스) 단위 통계
+_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "puts": 0, "evicted": 0}
+
+
+def cache_stats() -> Dict[str, int]:
+    return dict(_STATS)
+
+
+def cache_enabled_for(topic: str) -> bool:
+    """
+    IMAGE_CACHE_TOPICS로 토픽별 opt-in (기본: 꺼짐)
+    - 예: "health,trend" / "all"
+    """
+    raw = _env("IMAGE_CACHE_TOPICS", "").lower()
+    if not raw:
+        return False
+    topics = {x.strip() for x in raw.split(",") if x.strip()}
+    return "all" in topics or (topic or "").lower() in topics
+
+
+def image_cache_key(model: str, size: str, quality: str, prompt: str) -> str:
+    s = "|".join([model or "", size or "", quality or "", prompt or ""])
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(_cache_dir(), f"{key}.img")
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except Exception:
+        _STATS["misses"] += 1
+        return None
+    if not data:
+        _STATS["misses"] += 1
+        return None
+    try:
+        os.utime(path, None)  # LRU: 최근 사용 시각 갱신
+    except Exception:
+        pass
+    _STATS["hits"] += 1
+    return data
+
+
+def _evict(max_bytes: int) -> None:
+    d = _cache_dir()
+    entries: List[Tuple[float, int, str]] = []
+    try:
+        for name in os.listdir(d):
+            if not name.endswith(".img"):
+                continue
+            p = os.path.join(d, name)
+            try:
+                st = os.stat(p)
+            except Exception:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+    except Exception:
+        return
+
+    total = sum(sz for _, sz, _ in entries)
+    for _, sz, p in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(p)
+            total -= sz
+            _STATS["evicted"] += 1
+        except Exception:
+            pass
+
+
+def cache_put(key: str, data: bytes) -> None:
+    if not data:
+        return
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+        path = _path(key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        _STATS["puts"] += 1
+        _evict(_max_bytes())
+    except Exception as e:
+        print(f"⚠️ image cache put 실패: {e}")
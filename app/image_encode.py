@@ -0,0 +1,167 @@
+# app/image_encode.py
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Optional, Tuple
+
+from PIL import Image
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # numpy 없으면 품질 하한 체크만 생략
+    np = None  # type: ignore
+
+
+def _env(key: str, default: str = "") -> str:
+    return (os.getenv(key) or default).strip()
+
+
+@dataclass
+class EncodeConfig:
+    # png(기존, 무손실) / webp / jpeg(progressive)
+    fmt: str = "png"
+    target_bytes: int = 250_000
+    # 블록 SSIM 하한(원본 대비). 예산보다 우선합니다.
+    min_ssim: float = 0.92
+    q_min: int = 40
+    q_max: int = 90
+
+
+def config_from_env() -> EncodeConfig:
+    d = EncodeConfig()
+    fmt = _env("IMAGE_UPLOAD_FORMAT", d.fmt).lower()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    try:
+        target = int(float(_env("IMAGE_TARGET_KB", str(d.target_bytes // 1000))) * 1000)
+    except Exception:
+        target = d.target_bytes
+    try:
+        min_ssim = float(_env("IMAGE_MIN_SSIM", str(d.min_ssim)))
+    except Exception:
+        min_ssim = d.min_ssim
+    return EncodeConfig(
+        fmt=fmt if fmt in ("png", "webp", "jpeg") else d.fmt,
+        target_bytes=max(10_000, target),
+        min_ssim=min_ssim,
+    )
+
+
+def _save(img: Image.Image, fmt: str, quality: int) -> bytes:
+    out = BytesIO()
+    if fmt == "webp":
+        img.save(out, format="WEBP", quality=quality, method=4)
+    elif fmt == "jpeg":
+        img.save(out, format="JPEG", quality=quality, progressive=True, optimize=True)
+    else:
+        img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def block_ssim(a: Image.Image, b: Image.Image, *, size: int = 512, block: int = 8) -> Optional[float]:
+    """
+    그레이스케일 size×size로 줄인 뒤 8×8 블록 SSIM 평균(가벼운 SSIM 근사).
+    numpy가 없으면 None.
+    """
+    if np is None:
+        return None
+    x = np.asarray(a.convert("L").resize((size, size), Image.BILINEAR), dtype=np.float64)
+    y = np.asarray(b.convert("L").resize((size, size), Image.BILINEAR), dtype=np.float64)
+    n = size // block
+    x = x.reshape(n, block, n, block).transpose(0, 2, 1, 3).reshape(-1, block * block)
+    y = y.reshape(n, block, n, block).transpose(0, 2, 1, 3).reshape(-1, block * block)
+
+    mx, my = x.mean(axis=1), y.mean(axis=1)
+    vx, vy = x.var(axis=1), y.var(axis=1)
+    cov = ((x - mx[:, None]) * (y - my[:, None])).mean(axis=1)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    s = ((2 * mx * my + c1) * (2 * cov + c2)) / ((mx ** 2 + my ** 2 + c1) * (vx + vy + c2))
+    return float(s.mean())
+
+
+def _ssim_of(img: Image.Image, data: bytes) -> Optional[float]:
+    if np is None:
+        return None
+    return block_ssim(img, Image.open(BytesIO(data)))
+
+
+def encode_to_budget(img: Image.Image, cfg: EncodeConfig) -> Tuple[bytes, dict]:
+    """
+    - 이분 탐색으로 target_bytes 이하가 되는 가장 높은 quality를 찾고
+    - 그 quality가 SSIM 하한을 못 넘으면 하한을 넘는 가장 낮은 quality로 올립니다(예산 초과 허용).
+    반환: (bytes, info{fmt, quality, bytes, ssim, tries})
+    """
+    if cfg.fmt == "png":
+        data = _save(img, "png", 0)
+        return data, {"fmt": "png", "quality": None, "bytes": len(data), "ssim": None, "tries": 1}
+
+    cache: dict = {}
+
+    def enc(q: int) -> bytes:
+        if q not in cache:
+            cache[q] = _save(img, cfg.fmt, q)
+        return cache[q]
+
+    lo, hi = cfg.q_min, cfg.q_max
+    best = cfg.q_min
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if len(enc(mid)) <= cfg.target_bytes:
+            best, lo = mid, mid + 1
+        else:
+            hi = mid - 1
+
+    ssim = _ssim_of(img, enc(best))
+    if ssim is not None and ssim < cfg.min_ssim:
+        lo, hi = best + 1, cfg.q_max
+        floor_q, floor_ssim = cfg.q_max, None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            s = _ssim_of(img, enc(mid))
+            if s is not None and s >= cfg.min_ssim:
+                floor_q, floor_ssim, hi = mid, s, mid - 1
+            else:
+                lo = mid + 1
+        best = floor_q
+        ssim = floor_ssim if floor_ssim is not None else _ssim_of(img, enc(best))
+
+    data = enc(best)
+    info = {
+        "fmt": cfg.fmt,
+        "quality": best,
+        "bytes": len(data),
+        "ssim": round(ssim, 4) if ssim is not None else None,
+        "tries": len(cache),
+    }
+    return data, info
+
+
+def make_upload_encoder(
+    cfg: Optional[EncodeConfig] = None,
+    *,
+    label: str = "image",
+    ref_bytes: int = 0,
+) -> Callable[[Image.Image], bytes]:
+    """
+    thumb_overlay.render_square_image(encoder=...)에 넘길 인코더.
+    - 인코드 시간/크기/quality/SSIM과 원본(ref_bytes) 대비 절감량을 로그로 남깁니다.
+    """
+    cfg = cfg or config_from_env()
+
+    def _encoder(img: Image.Image) -> bytes:
+        t0 = time.perf_counter()
+        data, info = encode_to_budget(img, cfg)
+        ms = int((time.perf_counter() - t0) * 1000)
+        saved = ""
+        if ref_bytes:
+            saved = f" | src={ref_bytes}B (-{max(0, ref_bytes - len(data)) * 100 // ref_bytes}%)"
+        print(
+            f"🖼️ encode {label}: {info['fmt']} q={info['quality']} ssim={info['ssim']} "
+            f"{len(data)}B in {ms}ms (tries={info['tries']}){saved}"
+        )
+        return data
+
+    return _encoder
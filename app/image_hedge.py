@@ -0,0 +1,161 @@
+# app/image_hedge.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from app.cost_estimator import estimate_post_usd
+
+# 지연 샘플은 최근 이만큼만 보관
+LATENCY_SAMPLES_MAX = 60
+
+
+def _env(key: str, default: str = "") -> str:
+    return (os.getenv(key) or default).strip()
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float(_env(key, str(default)))
+    except Exception:
+        return default
+
+
+def _kst_ymd() -> str:
+    # KST = UTC+9
+    t = int(time.time()) + 9 * 3600
+    return time.strftime("%Y-%m-%d", time.gmtime(t))
+
+
+def _percentile(xs: List[float], pct: float) -> float:
+    s = sorted(xs)
+    k = min(len(s) - 1, max(0, int(round((pct / 100.0) * (len(s) - 1)))))
+    return s[k]
+
+
+class HedgePolicy:
+    """
+    이미지 요청 헤징(늦으면 같은 요청을 1번 더 보내고 먼저 끝난 쪽 사용).
+    - 기준 시간: 같은 프로필(variant:size/quality) 과거 요청 지연의 IMAGE_HEDGE_PCT 분위(기본 p90),
+      샘플 부족 시 IMAGE_HEDGE_DEFAULT_SEC
+    - 하루 추가 비용 상한: IMAGE_HEDGE_MAX_USD_PER_DAY(기본 0.10, 0이면 헤징 끔)
+    - 지연 샘플/일일 사용량은 state에 저장(state["image_latency"][프로필], state["image_hedge_daily"])
+    - hero/body 동시 요청에서 같이 쓰므로 lock으로 보호
+    - 실행 중에는 사본에만 기록하고 close() 때 state에 한 번 반영:
+      제한 시간 초과로 버려진 요청 스레드가 save_state() 직렬화 중인 state를 건드리지 않음
+    """
+
+    def __init__(self, state: Dict[str, Any]):
+        self.state = state
+        self.extra_units = 0.0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        lat = state.get("image_latency")
+        self._latency: Dict[str, List[float]] = {}
+        if isinstance(lat, dict):
+            for k, xs in lat.items():
+                # 예전 형식 {"samples": [...]}(프로필 구분 없음)은 버립니다.
+                if k != "samples" and isinstance(xs, list):
+                    self._latency[str(k)] = [float(x) for x in xs][-LATENCY_SAMPLES_MAX:]
+
+        b = state.get("image_hedge_daily")
+        if not isinstance(b, dict) or b.get("date") != _kst_ymd():
+            b = {"date": _kst_ymd(), "usd": 0.0, "count": 0}
+        self._daily = dict(b)
+
+    # ---- 지연 기록 ----
+    def record(self, profile: str, sec: float) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            xs = self._latency.setdefault(profile, [])
+            xs.append(round(float(sec), 2))
+            del xs[:-LATENCY_SAMPLES_MAX]
+
+    def hedge_after_sec(self, profile: str) -> float:
+        with self._lock:
+            xs = list(self._latency.get(profile, []))
+        if len(xs) < int(_env_float("IMAGE_HEDGE_MIN_SAMPLES", 5)):
+            return _env_float("IMAGE_HEDGE_DEFAULT_SEC", 60.0)
+        return _percentile(xs, _env_float("IMAGE_HEDGE_PCT", 90.0))
+
+    # ---- 일일 추가 비용 ----
+    def try_reserve(self, units: float) -> bool:
+        """추가 요청 1건(units) 예산 확보. 일일 상한을 넘거나 close() 이후면 False."""
+        usd = estimate_post_usd(text_tokens=0, image_count=units)
+        cap = _env_float("IMAGE_HEDGE_MAX_USD_PER_DAY", 0.10)
+        with self._lock:
+            b = self._daily
+            if self._closed or cap <= 0 or float(b.get("usd", 0.0)) + usd > cap:
+                return False
+            b["usd"] = round(float(b.get("usd", 0.0)) + usd, 4)
+            b["count"] = int(b.get("count", 0)) + 1
+            self.extra_units += units
+            return True
+
+    def close(self) -> None:
+        """기록을 state에 반영하고 이후 기록/헤지는 무시(이미지 단계가 끝난 뒤, save_state 전에 호출)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self.state["image_latency"] = {k: list(xs) for k, xs in self._latency.items()}
+            self.state["image_hedge_daily"] = dict(self._daily)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"extra_units": self.extra_units, "daily": dict(self._daily)}
+
+
+def hedged_call(
+    fn: Callable[[], Any],
+    policy: Optional[HedgePolicy],
+    *,
+    units: float = 1.0,
+    label: str = "image",
+    profile: str = "image",
+) -> Any:
+    """
+    fn()을 실행하고, hedge_after_sec 안에 안 끝나면(예산 허용 시) 같은 fn()을 하나 더 띄워 먼저 성공한 결과를 반환.
+    - 늦은 쪽은 기다리지 않고 버립니다(HTTP 요청은 백그라운드에서 끝나며 과금될 수 있음 → extra_units로 계산).
+    - 둘 다 실패하면 마지막 예외를 그대로 올립니다.
+    - 성공한 요청의 지연을 policy의 profile(예: "hero:1024x1024/medium") 샘플에 기록합니다.
+    """
+    if policy is None:
+        return fn()
+
+    ex = ThreadPoolExecutor(max_workers=2)
+    t0 = time.perf_counter()
+    try:
+        first = ex.submit(fn)
+        after = policy.hedge_after_sec(profile)
+        done, _ = wait([first], timeout=after)
+        if done:
+            result = first.result()  # 실패면 여기서 예외 → 호출부 재시도 로직으로
+            policy.record(profile, time.perf_counter() - t0)
+            return result
+
+        pending = [first]
+        if policy.try_reserve(units):
+            print(f"🪁 {label} 요청 {after:.1f}s 초과 → 헤지 요청 발사")
+            pending.append(ex.submit(fn))
+
+        last_err: Optional[BaseException] = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                pending.remove(f)
+                err = f.exception()
+                if err is None:
+                    policy.record(profile, time.perf_counter() - t0)
+                    if f is not first:
+                        print(f"🪁 {label} 헤지 요청이 먼저 완료")
+                    return f.result()
+                last_err = err
+        raise last_err if last_err else RuntimeError("hedged call failed")
+    finally:
+        ex.shutdown(wait=False)
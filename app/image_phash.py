@@ -0,0 +1,164 @@
+# app/image_phash.py
+from __future__ import annotations
+
+import os
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from app.image_validate import ensure_valid_image
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # numpy 없으면 dHash만 사용
+    np = None  # type: ignore
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
+
+
+def _gray(img_bytes: bytes) -> Image.Image:
+    return Image.open(BytesIO(img_bytes)).convert("L")
+
+
+def dhash(img: Image.Image) -> str:
+    """64bit difference hash(9×8 그레이 → 가로 인접 픽셀 비교) → 16자리 hex"""
+    small = img.convert("L").resize((9, 8), Image.LANCZOS)
+    px = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = px[row * 9 + col]
+            right = px[row * 9 + col + 1]
+            bits = (bits << 1) | (1 if left > right else 0)
+    return f"{bits:016x}"
+
+
+_DCT_CACHE: Dict[int, Any] = {}
+
+
+def _dct_matrix(n: int):
+    m = _DCT_CACHE.get(n)
+    if m is None:
+        k = np.arange(n)[:, None]
+        i = np.arange(n)[None, :]
+        m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+        m[0, :] = np.sqrt(1.0 / n)
+        _DCT_CACHE[n] = m
+    return m
+
+
+def phash(img: Image.Image) -> Optional[str]:
+    """64bit perceptual hash(32×32 DCT 저주파 8×8, 중앙값 기준). numpy 없으면 None."""
+    if np is None:
+        return None
+    x = np.asarray(img.convert("L").resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    c = _dct_matrix(32)
+    low = (c @ x @ c.T)[:8, :8].flatten()
+    med = np.median(low[1:])
+    bits = 0
+    for v in low:
+        bits = (bits << 1) | (1 if v > med else 0)
+    return f"{bits:016x}"
+
+
+def image_hashes(img_bytes: bytes) -> Dict[str, str]:
+    """{"dhash": hex, "phash": hex} (디코드 실패 시 빈 dict)"""
+    try:
+        img = _gray(img_bytes)
+    except Exception:
+        return {}
+    out = {"dhash": dhash(img)}
+    p = phash(img)
+    if p:
+        out["phash"] = p
+    return out
+
+
+def hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def recent_image_hashes(history: List[Dict[str, Any]], n: int = 60) -> List[Dict[str, str]]:
+    """history[*].image_hashes(hero/body)에서 최근 n개 글의 해시 목록"""
+    out: List[Dict[str, str]] = []
+    for it in reversed((history or [])[-n:]):
+        hs = (it or {}).get("image_hashes") if isinstance(it, dict) else None
+        if not isinstance(hs, dict):
+            continue
+        for k in ("hero", "body"):
+            h = hs.get(k)
+            if isinstance(h, dict) and h.get("dhash"):
+                out.append(h)
+    return out
+
+
+def near_duplicate(h: Dict[str, str], index: List[Dict[str, str]]) -> Optional[int]:
+    """
+    index 중 가까운 것이 있으면 그 거리(없으면 None).
+    - dHash 거리 <= IMAGE_DUP_DHASH_DIST(기본 8) 또는 pHash 거리 <= IMAGE_DUP_PHASH_DIST(기본 8)
+    """
+    if not h or not h.get("dhash"):
+        return None
+    max_d = _env_int("IMAGE_DUP_DHASH_DIST", 8)
+    max_p = _env_int("IMAGE_DUP_PHASH_DIST", 8)
+    for other in index:
+        d = hamming(h["dhash"], other["dhash"])
+        if d <= max_d:
+            return d
+        if h.get("phash") and other.get("phash"):
+            p = hamming(h["phash"], other["phash"])
+            if p <= max_p:
+                return p
+    return None
+
+
+def avoid_repeat_images(
+    hero_img: bytes,
+    body_img: bytes,
+    history: List[Dict[str, Any]],
+    reroll_body: Callable[[], bytes],
+) -> Tuple[bytes, bytes, Dict[str, Any]]:
+    """
+    최근 글 이미지와 거의 같은 이미지를 걸러냅니다(추가 생성은 최대 1장).
+    - hero가 중복이고 body는 새로우면: body를 hero로 올리고 body만 다시 생성
+    - body가 중복(최근 글 또는 hero와)이면: body만 다시 생성
+      (body가 hero 재사용(같은 객체/같은 bytes)이면 hero와는 비교하지 않음 → 거리 0으로 유료 재생성하지 않도록)
+    - 재생성한 body는 ensure_valid_image로 검증(실패 시 hero 재사용)
+    반환: (hero, body, {"hero": hashes, "body": hashes, "rerolled": bool})
+    """
+    index = recent_image_hashes(history)
+    hero_h = image_hashes(hero_img)
+    body_h = image_hashes(body_img)
+
+    need_reroll = False
+    same = body_img is hero_img or body_img == hero_img
+    hero_dist = near_duplicate(hero_h, index)
+    body_dist = None if same else near_duplicate(body_h, index + ([hero_h] if hero_h else []))
+
+    if hero_dist is not None and body_dist is None and not same:
+        print(f"🔁 hero가 최근 이미지와 유사(dist={hero_dist}) → body를 hero로 쓰고 body 재생성")
+        hero_img, hero_h = body_img, body_h
+        need_reroll = True
+    elif body_dist is not None:
+        print(f"🔁 body가 최근/hero 이미지와 유사(dist={body_dist}) → body 재생성")
+        need_reroll = True
+    elif hero_dist is not None:
+        print(f"⚠️ hero가 최근 이미지와 유사(dist={hero_dist})하지만 대체 이미지 없음 → 유지")
+
+    rerolled = False
+    if need_reroll:
+        try:
+            body_img = ensure_valid_image(reroll_body(), "body", reroll_body, lambda: hero_img)
+            body_h = image_hashes(body_img)
+            rerolled = True
+        except Exception as e:
+            print(f"⚠️ body 재생성 실패 → hero 재사용: {e}")
+            body_img, body_h = hero_img, hero_h
+
+    return hero_img, body_img, {"hero": hero_h, "body": body_h, "rerolled": rerolled}
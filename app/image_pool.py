@@ -0,0 +1,265 @@
+# app/image_pool.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.image_phash import image_hashes, near_duplicate, recent_image_hashes
+from app.image_validate import validate_image
+
+# 발행에 쓴 이미지 sha256은 이 개수까지 기억(같은 bytes 재적재 방지)
+PUBLISHED_SHA_MAX = 500
+
+
+def _env(key: str, default: str = "") -> str:
+    return (os.getenv(key) or default).strip()
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int(_env(key, str(default)))
+    except Exception:
+        return default
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float(_env(key, str(default)))
+    except Exception:
+        return default
+
+
+def _pool_dir() -> str:
+    return _env("IMAGE_POOL_DIR", ".image_pool")
+
+
+def _index_path() -> str:
+    return os.path.join(_pool_dir(), "index.json")
+
+
+def pool_target_size() -> int:
+    """(topic, style_mode, variant)당 보관 장수 (IMAGE_POOL_SIZE, 기본 3)"""
+    return max(0, _env_int("IMAGE_POOL_SIZE", 3))
+
+
+def _max_age_sec() -> float:
+    return max(1.0, _env_float("IMAGE_POOL_MAX_AGE_DAYS", 30.0)) * 86400
+
+
+def live_budget_sec() -> float:
+    """
+    라이브 생성 대기 한도(초). 넘으면 풀에서 꺼내 씁니다. 0이면 무제한.
+    IMAGE_LIVE_BUDGET_SEC, 기본은 요청 타임아웃(IMAGE_REQUEST_TIMEOUT_SEC, 기본 180)과 같은 값:
+    한도보다 짧은 타임아웃으로 끊긴 요청이 계속 돌며 과금되지 않도록 요청에는 남은 시간이 timeout으로 전달됩니다.
+    """
+    return max(0.0, _env_float("IMAGE_LIVE_BUDGET_SEC", _env_float("IMAGE_REQUEST_TIMEOUT_SEC", 180.0)))
+
+
+def _load_index() -> Dict[str, Any]:
+    try:
+        with open(_index_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data.setdefault("entries", [])
+            data.setdefault("published_sha", [])
+            return data
+    except Exception:
+        pass
+    return {"entries": [], "published_sha": []}
+
+
+def _save_index(idx: Dict[str, Any]) -> None:
+    os.makedirs(_pool_dir(), exist_ok=True)
+    tmp = _index_path() + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(idx, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, _index_path())
+
+
+def _file_of(sha: str) -> str:
+    return os.path.join(_pool_dir(), f"{sha}.img")
+
+
+def _remove_file(sha: str) -> None:
+    try:
+        os.remove(_file_of(sha))
+    except Exception:
+        pass
+
+
+def _same_slot(e: Dict[str, Any], topic: str, style_mode: str, variant: str) -> bool:
+    return e.get("topic") == topic and e.get("style_mode") == style_mode and e.get("variant") == variant
+
+
+def _evict(idx: Dict[str, Any]) -> int:
+    """오래된 항목 + 슬롯별 보관 장수 초과분(오래된 것부터) 제거"""
+    now = time.time()
+    max_age = _max_age_sec()
+    size = pool_target_size()
+
+    keep: List[Dict[str, Any]] = []
+    removed = 0
+    per_slot: Dict[Tuple[str, str, str], int] = {}
+    for e in sorted(idx["entries"], key=lambda x: -float(x.get("created_at", 0))):
+        slot = (e.get("topic", ""), e.get("style_mode", ""), e.get("variant", ""))
+        fresh = now - float(e.get("created_at", 0)) <= max_age
+        if fresh and per_slot.get(slot, 0) < size and os.path.exists(_file_of(e.get("sha", ""))):
+            per_slot[slot] = per_slot.get(slot, 0) + 1
+            keep.append(e)
+        else:
+            _remove_file(e.get("sha", ""))
+            removed += 1
+    idx["entries"] = keep
+    return removed
+
+
+def pool_counts() -> Dict[str, int]:
+    """{"topic/style_mode/variant": 장수}"""
+    out: Dict[str, int] = {}
+    for e in _load_index()["entries"]:
+        k = f"{e.get('topic')}/{e.get('style_mode')}/{e.get('variant')}"
+        out[k] = out.get(k, 0) + 1
+    return out
+
+
+def pool_put(topic: str, style_mode: str, variant: str, img_bytes: bytes, prompt: str) -> bool:
+    """풀에 1장 적재(이미 발행했거나 이미 있는 bytes면 False)"""
+    if not img_bytes:
+        return False
+    sha = hashlib.sha256(img_bytes).hexdigest()
+    idx = _load_index()
+    if sha in idx["published_sha"] or any(e.get("sha") == sha for e in idx["entries"]):
+        return False
+
+    os.makedirs(_pool_dir(), exist_ok=True)
+    tmp = _file_of(sha) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(img_bytes)
+    os.replace(tmp, _file_of(sha))
+
+    idx["entries"].append({
+        "sha": sha,
+        "topic": topic,
+        "style_mode": style_mode,
+        "variant": variant,
+        "prompt": prompt,
+        "hashes": image_hashes(img_bytes),
+        "created_at": time.time(),
+    })
+    _evict(idx)
+    _save_index(idx)
+    return True
+
+
+def pool_take(
+    topic: str,
+    style_mode: str,
+    variant: str,
+    history: List[Dict[str, Any]],
+    *,
+    avoid: Optional[List[Dict[str, str]]] = None,
+) -> Optional[bytes]:
+    """
+    풀에서 1장 꺼냅니다(꺼낸 항목은 풀에서 삭제 + 발행 sha로 기록 → 다시 쓰이지 않음).
+    - 최근 발행 이미지(history image_hashes) 또는 avoid와 pHash/dHash가 가까운 항목은 버립니다.
+    - 같은 style_mode가 없으면 같은 topic의 다른 style_mode까지 봅니다.
+    """
+    idx = _load_index()
+    index = recent_image_hashes(history, n=len(history or [])) + list(avoid or [])
+
+    def _candidates(any_style: bool) -> List[Dict[str, Any]]:
+        xs = [
+            e for e in idx["entries"]
+            if e.get("topic") == topic and e.get("variant") == variant
+            and (any_style or e.get("style_mode") == style_mode)
+        ]
+        return sorted(xs, key=lambda x: -float(x.get("created_at", 0)))
+
+    picked: Optional[bytes] = None
+    dirty = False
+    for any_style in (False, True):
+        for e in _candidates(any_style):
+            sha = e.get("sha", "")
+            idx["entries"] = [x for x in idx["entries"] if x.get("sha") != sha]
+            dirty = True
+            try:
+                with open(_file_of(sha), "rb") as f:
+                    data = f.read()
+            except Exception:
+                continue
+            _remove_file(sha)
+            if near_duplicate(e.get("hashes") or image_hashes(data), index) is not None:
+                print(f"🗑️ image pool: 최근 발행 이미지와 유사 → 폐기 ({sha[:12]})")
+                continue
+            idx["published_sha"] = (idx["published_sha"] + [sha])[-PUBLISHED_SHA_MAX:]
+            picked = data
+            print(f"📦 image pool take: {topic}/{e.get('style_mode')}/{variant} ({sha[:12]})")
+            break
+        if picked:
+            break
+
+    if dirty:
+        _save_index(idx)
+    return picked
+
+
+def refill_pool(
+    topic: str,
+    style_mode: str,
+    generate: Callable[[str], bytes],
+    build_prompt: Callable[[str, int], str],
+    *,
+    max_new: int = 0,
+) -> Dict[str, int]:
+    """
+    인벤토리 모드: (topic, style_mode)의 hero/body를 목표 장수까지 채웁니다.
+    - generate(prompt) -> bytes / build_prompt(variant, seed) -> prompt
+    - max_new: 이번 실행 최대 생성 장수(0이면 제한 없음)
+    반환: {"added", "failed", "evicted"}
+    """
+    idx = _load_index()
+    evicted = _evict(idx)
+    _save_index(idx)
+
+    target = pool_target_size()
+    added = failed = 0
+    for variant in ("hero", "body"):
+        have = sum(1 for e in idx["entries"] if _same_slot(e, topic, style_mode, variant))
+        for i in range(max(0, target - have)):
+            if max_new and added + failed >= max_new:
+                break
+            prompt = build_prompt(variant, int(time.time() * 1000) % 1_000_000 + i)
+            try:
+                img = generate(prompt)
+                ok, reasons, _ = validate_image(img)
+                if not ok:
+                    raise RuntimeError(f"검증 실패: {', '.join(reasons)}")
+                if pool_put(topic, style_mode, variant, img, prompt):
+                    added += 1
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ image pool refill 실패({topic}/{style_mode}/{variant}): {e}")
+    return {"added": added, "failed": failed, "evicted": evicted}
+
+
+def call_with_deadline(fn: Callable[[], Any], timeout_sec: float) -> Any:
+    """
+    fn()을 timeout_sec 안에 끝나면 결과를, 넘으면 TimeoutError.
+    - 넘긴 호출은 백그라운드에서 끝까지 돌 수 있습니다(결과는 버림).
+    - timeout_sec <= 0이면 그냥 호출합니다.
+    """
+    if timeout_sec <= 0:
+        return fn()
+    ex = ThreadPoolExecutor(max_workers=1)
+    fut = ex.submit(fn)
+    try:
+        return fut.result(timeout=timeout_sec)
+    except FutureTimeout:
+        raise TimeoutError(f"image generation exceeded {timeout_sec:g}s budget")
+    finally:
+        ex.shutdown(wait=False)
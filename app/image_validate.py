@@ -0,0 +1,157 @@
+# app/image_validate.py
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # numpy 없으면 검증 생략(항상 통과)
+    np = None  # type: ignore
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
+
+
+@dataclass
+class ValidateConfig:
+    # 밝기 표준편차 하한(거의 단색/빈 이미지)
+    min_std: float = 10.0
+    # 밝기 히스토그램 엔트로피 하한(bit, 최대 8)
+    min_entropy: float = 3.0
+    # 가장 흔한 색(채널당 4bit 양자화) 비율 상한 — 여백 많은 수채화도 통과하도록 넉넉히
+    max_dominant: float = 0.70
+    # 글자처럼 보이는 블록(에지 밀도 높음) 비율 상한
+    max_text_blocks: float = 0.30
+
+
+def config_from_env() -> ValidateConfig:
+    d = ValidateConfig()
+    return ValidateConfig(
+        min_std=_env_float("IMAGE_VALID_MIN_STD", d.min_std),
+        min_entropy=_env_float("IMAGE_VALID_MIN_ENTROPY", d.min_entropy),
+        max_dominant=_env_float("IMAGE_VALID_MAX_DOMINANT", d.max_dominant),
+        max_text_blocks=_env_float("IMAGE_VALID_MAX_TEXT_BLOCKS", d.max_text_blocks),
+    )
+
+
+# 분석 해상도/블록(256×256, 16×16 블록 256개) — 1024 원본도 수 ms
+_SIZE = 256
+_BLOCK = 16
+# 에지 판단 기준(밝기 차) / 블록 내 에지 픽셀 비율이 이 이상이면 '글자 같은 블록'
+_EDGE_THR = 48
+_TEXT_BLOCK_EDGE_RATIO = 0.22
+
+
+def image_metrics(img: Image.Image) -> Dict[str, float]:
+    """std / entropy / dominant / text_blocks (numpy 없으면 빈 dict)"""
+    if np is None:
+        return {}
+    rgb = img.convert("RGB").resize((_SIZE, _SIZE), Image.BILINEAR)
+    a = np.asarray(rgb, dtype=np.int16)
+    gray = np.asarray(rgb.convert("L"), dtype=np.int16)
+
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    p = hist[hist > 0] / gray.size
+    entropy = float(-(p * np.log2(p)).sum()) + 0.0
+
+    q = (a >> 4).astype(np.int32)
+    codes = (q[..., 0] << 8) | (q[..., 1] << 4) | q[..., 2]
+    dominant = float(np.bincount(codes.ravel(), minlength=4096).max() / codes.size)
+
+    gx = np.abs(np.diff(gray, axis=1))[:-1, :]
+    gy = np.abs(np.diff(gray, axis=0))[:, :-1]
+    edges = np.pad((np.maximum(gx, gy) >= _EDGE_THR), ((0, 1), (0, 1)))
+    n = _SIZE // _BLOCK
+    per_block = edges.reshape(n, _BLOCK, n, _BLOCK).mean(axis=(1, 3))
+    text_blocks = float((per_block >= _TEXT_BLOCK_EDGE_RATIO).mean())
+
+    return {
+        "std": round(float(gray.std()), 2),
+        "entropy": round(entropy, 3),
+        "dominant": round(dominant, 3),
+        "text_blocks": round(text_blocks, 3),
+    }
+
+
+def validate_image(img_bytes: bytes, cfg: ValidateConfig | None = None) -> Tuple[bool, List[str], Dict[str, Any]]:
+    """
+    업로드 전 로컬 검증(디코드된 픽셀 기준).
+    반환: (ok, 실패 사유 목록, metrics)
+    - 디코드 실패는 실패, numpy가 없으면 통과
+    """
+    cfg = cfg or config_from_env()
+    try:
+        img = Image.open(BytesIO(img_bytes))
+        img.load()
+    except Exception as e:
+        return False, [f"decode: {e}"], {}
+
+    m = image_metrics(img)
+    if not m:
+        return True, [], {}
+
+    reasons: List[str] = []
+    if m["std"] < cfg.min_std:
+        reasons.append(f"low_variance(std={m['std']})")
+    if m["entropy"] < cfg.min_entropy:
+        reasons.append(f"low_entropy({m['entropy']})")
+    if m["dominant"] > cfg.max_dominant:
+        reasons.append(f"dominant_color({m['dominant']})")
+    if m["text_blocks"] > cfg.max_text_blocks:
+        reasons.append(f"text_like({m['text_blocks']})")
+    return not reasons, reasons, m
+
+
+def ensure_valid_image(
+    img_bytes: bytes,
+    label: str,
+    reroll: Callable[[], bytes],
+    fallback: Callable[[], Optional[bytes]],
+    *,
+    cfg: ValidateConfig | None = None,
+) -> bytes:
+    """
+    검증 실패 시 reroll()로 최대 IMAGE_VALID_MAX_REROLL(기본 1)번 다시 만들고,
+    그래도 실패하면 fallback() 결과(없으면 원본)를 씁니다.
+    """
+    cfg = cfg or config_from_env()
+    max_reroll = max(0, _env_int("IMAGE_VALID_MAX_REROLL", 1))
+
+    cur = img_bytes
+    for attempt in range(max_reroll + 1):
+        ok, reasons, m = validate_image(cur, cfg)
+        if ok:
+            if attempt:
+                print(f"✅ {label} image 재생성 후 검증 통과: {m}")
+            return cur
+        print(f"🧪 {label} image 검증 실패({attempt + 1}/{max_reroll + 1}): {', '.join(reasons)}")
+        if attempt >= max_reroll:
+            break
+        try:
+            cur = reroll()
+        except Exception as e:
+            print(f"⚠️ {label} image 재생성 실패: {e}")
+            break
+
+    try:
+        fb = fallback()
+    except Exception as e:
+        print(f"⚠️ {label} image fallback 실패: {e}")
+        fb = None
+    return fb or cur
@@ -0,0 +1,177 @@
+# app/image_workers.py
+"""
+이미지 후처리(crop/resize/오버레이/인코드) 프로세스 풀.
+
+- 여러 글을 한 번에 발행하거나 썸네일을 일괄 재렌더링할 때, PIL 작업을 IMAGE_WORKERS개 프로세스로 병렬로 돌립니다.
+- 입력/출력 bytes는 multiprocessing.shared_memory로 주고받습니다(수 MB PNG를 pickle하지 않음).
+- workers <= 1이거나 작업이 1개면 프로세스 없이 현재 스레드에서 같은 함수를 실행합니다.
+
+    python -m app.image_workers   # 워커 수별 처리량 벤치마크
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.image_encode import EncodeConfig, encode_to_budget
+from app.thumb_overlay import _decode, _draw_title, _encode_png, _square_1024, _square_1024_sharpened
+
+# 출력 버퍼 크기: 1024×1024 RGB 원시 크기 + 여유(최악의 PNG도 들어감). 넘치면 pickle로 돌려받음.
+_OUT_CAP = 1024 * 1024 * 3 + 512 * 1024
+
+
+@dataclass
+class RenderJob:
+    img_bytes: bytes
+    title: str = ""
+    label: str = "image"
+    # None이면 PNG(기존과 동일), 있으면 image_encode.encode_to_budget
+    encode: Optional[EncodeConfig] = None
+    # body 업로드: 저해상도 원본 업스케일 후 샤픈(render_square_image의 sharpen_upscaled)
+    sharpen_upscaled: bool = False
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
+
+
+def default_workers() -> int:
+    """IMAGE_WORKERS(기본 1 = 프로세스 풀 없이 현재 스레드). 벤치마크(python -m app.image_workers)로 정하세요."""
+    return max(1, _env_int("IMAGE_WORKERS", 1))
+
+
+def _render(
+    img_bytes: bytes, title: str, cfg: Optional[EncodeConfig], sharpen_upscaled: bool = False
+) -> Tuple[bytes, Dict[str, Any]]:
+    img = (_square_1024_sharpened if sharpen_upscaled else _square_1024)(_decode(img_bytes))
+    if title and title.strip():
+        img = _draw_title(img, title)
+    if cfg is None:
+        data = _encode_png(img)
+        return data, {"fmt": "png", "bytes": len(data)}
+    return encode_to_budget(img, cfg)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # 워커는 붙기만 하고 close만 합니다(unlink는 블록을 만든 부모 담당).
+    return shared_memory.SharedMemory(name=name)
+
+
+def _render_shm(
+    in_name: str,
+    in_len: int,
+    out_name: str,
+    title: str,
+    cfg: Optional[EncodeConfig],
+    sharpen_upscaled: bool = False,
+) -> Tuple[int, Dict[str, Any], Optional[bytes]]:
+    """워커: 공유 메모리에서 입력을 읽고 결과를 출력 블록에 씀 → (길이, info, 넘친 경우 bytes)"""
+    src = _attach(in_name)
+    dst = _attach(out_name)
+    try:
+        data, info = _render(bytes(src.buf[:in_len]), title, cfg, sharpen_upscaled)
+        if len(data) > dst.size:
+            return -1, info, data
+        dst.buf[: len(data)] = data
+        return len(data), info, None
+    finally:
+        src.close()
+        dst.close()
+
+
+def _log(job: RenderJob, info: Dict[str, Any], ms: int) -> None:
+    # image_encode.make_upload_encoder와 같은 형식(원본 대비 절감량 포함)
+    if job.encode is None:
+        return
+    size, ref_bytes = int(info.get("bytes") or 0), len(job.img_bytes)
+    saved = ""
+    if ref_bytes:
+        saved = f" | src={ref_bytes}B (-{max(0, ref_bytes - size) * 100 // ref_bytes}%)"
+    print(
+        f"🖼️ encode {job.label}: {info.get('fmt')} q={info.get('quality')} ssim={info.get('ssim')} "
+        f"{size}B in {ms}ms (tries={info.get('tries')}){saved}"
+    )
+
+
+def render_jobs(jobs: List[RenderJob], *, workers: Optional[int] = None) -> List[bytes]:
+    """
+    RenderJob 목록 → 결과 bytes 목록(입력 순서 유지).
+    결과는 thumb_overlay.render_square_image(img_bytes, title, encoder)와 같습니다.
+    """
+    if not jobs:
+        return []
+    workers = min(workers or default_workers(), len(jobs))
+
+    if workers <= 1:
+        out: List[bytes] = []
+        for job in jobs:
+            t0 = time.perf_counter()
+            data, info = _render(job.img_bytes, job.title, job.encode, job.sharpen_upscaled)
+            _log(job, info, int((time.perf_counter() - t0) * 1000))
+            out.append(data)
+        return out
+
+    blocks: List[Tuple[shared_memory.SharedMemory, shared_memory.SharedMemory]] = []
+    try:
+        for job in jobs:
+            src = shared_memory.SharedMemory(create=True, size=max(1, len(job.img_bytes)))
+            src.buf[: len(job.img_bytes)] = job.img_bytes
+            dst = shared_memory.SharedMemory(create=True, size=_OUT_CAP)
+            blocks.append((src, dst))
+
+        results: List[bytes] = []
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            t0 = time.perf_counter()
+            futs = [
+                ex.submit(
+                    _render_shm, src.name, len(job.img_bytes), dst.name, job.title, job.encode, job.sharpen_upscaled
+                )
+                for job, (src, dst) in zip(jobs, blocks)
+            ]
+            for job, (_, dst), fut in zip(jobs, blocks, futs):
+                n, info, overflow = fut.result()
+                results.append(overflow if n < 0 else bytes(dst.buf[:n]))
+                _log(job, info, int((time.perf_counter() - t0) * 1000))
+        return results
+    finally:
+        for src, dst in blocks:
+            for shm in (src, dst):
+                try:
+                    shm.close()
+                    shm.unlink()
+                except Exception:
+                    pass
+
+
+def benchmark_workers(n_jobs: int = 8, *, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """워커 수 1, 2, 4, ...별 처리량(jobs/s). 합성 1536×1024 PNG + 타이틀 오버레이."""
+    from app.image_bench import _sample
+
+    jobs = [RenderJob(_sample(i), "혈압 관리 핵심 정리" if i % 2 == 0 else "") for i in range(n_jobs)]
+    top = max_workers or (os.cpu_count() or 1)
+    counts: List[int] = []
+    w = 1
+    while w < top:
+        counts.append(w)
+        w *= 2
+    counts.append(top)
+
+    rows: List[Dict[str, Any]] = []
+    for w in counts:
+        t0 = time.perf_counter()
+        render_jobs(jobs, workers=w)
+        sec = time.perf_counter() - t0
+        rows.append({"workers": w, "sec": round(sec, 3), "jobs_per_sec": round(n_jobs / sec, 2)})
+    return rows
+
+
+if __name__ == "__main__":
+    for row in benchmark_workers(_env_int("IMAGE_BENCH_JOBS", 8)):
+        print(row)
@@ -1,8 +1,19 @@
 import os
 import random
-from typing import Dict, List, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 
 from app.naver_api import naver_blog_total_count
+from app.ttl_cache import TTLCache
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
 
 
 def _split_csv(s: str) -> List[str]:
@@ -14,6 +25,111 @@ def _split_csv(s: str) -> List[str]:
     return items
 
 
+def _total_cache() -> Optional[TTLCache]:
+    """
+    블로그 total 캐시(.naver_cache/blog_total.json, 정규화한 검색어 키)
+    - NAVER_TOTAL_CACHE=0이면 끔
+    - NAVER_TOTAL_FRESH_HOURS(기본 24): 이 안이면 조회 없이 사용
+    - NAVER_TOTAL_MAX_AGE_HOURS(기본 168): 여기까지는 일단 쓰고 백그라운드 갱신, 넘으면 새로 조회
+    """
+    if (os.getenv("NAVER_TOTAL_CACHE") or "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    d = (os.getenv("NAVER_CACHE_DIR") or ".naver_cache").strip()
+    return TTLCache(
+        os.path.join(d, "blog_total.json"),
+        fresh_sec=_env_float("NAVER_TOTAL_FRESH_HOURS", 24) * 3600,
+        max_age_sec=_env_float("NAVER_TOTAL_MAX_AGE_HOURS", 168) * 3600,
+    )
+
+
+def _revalidate(cache: TTLCache, naver_client_id: str, naver_client_secret: str, keywords: List[str]) -> threading.Thread:
+    """stale 항목을 백그라운드에서 다시 조회해 캐시에 저장(선택은 기다리지 않음)"""
+
+    def _run() -> None:
+        n = 0
+        for kw in keywords:
+            try:
+                cache.put(kw, naver_blog_total_count(naver_client_id, naver_client_secret, kw))
+                n += 1
+            except Exception as e:
+                print(f"⚠️ Naver 캐시 갱신 실패: {kw} / {e}")
+        if n:
+            cache.save()
+
+    # daemon: 느린 Naver 응답이 프로세스 종료를 붙잡지 않게 함
+    # (못 끝낸 갱신은 다음 실행에서 다시 stale로 잡힘, save는 tmp→replace라 중간에 끊겨도 캐시 파일은 온전함)
+    t = threading.Thread(target=_run, name="naver-revalidate", daemon=True)
+    t.start()
+    return t
+
+
+def _fetch_totals(
+    naver_client_id: str,
+    naver_client_secret: str,
+    candidates: List[str],
+) -> Dict[str, Optional[int]]:
+    """
+    후보별 total: 캐시(fresh/stale) → 나머지만 스레드 풀로 동시에 조회(초당 호출 수는 naver_api의 limiter가 제한).
+    - 동시 요청 수: NAVER_CONCURRENCY(기본 12 = 후보 최대 수 → 대기 시간 ≈ 가장 느린 1건)
+    - 전체 마감: NAVER_PICK_DEADLINE_SEC(기본 6초) — 그때까지 끝난 결과만 사용, 못 끝낸 후보는 None
+    - 실패한 후보는 0(캐시에 넣지 않음)
+    """
+    workers = max(1, int(_env_float("NAVER_CONCURRENCY", 12)))
+    deadline = _env_float("NAVER_PICK_DEADLINE_SEC", 6.0)
+
+    cache = _total_cache()
+    out: Dict[str, Optional[int]] = {}
+    stale: List[str] = []
+    to_fetch: List[str] = []
+    for kw in candidates:
+        if cache is not None:
+            value, status = cache.get(kw)
+            if status != "miss":
+                out[kw] = int(value or 0)
+                if status == "stale":
+                    stale.append(kw)
+                continue
+        to_fetch.append(kw)
+
+    def _one(kw: str) -> int:
+        try:
+            total = naver_blog_total_count(naver_client_id, naver_client_secret, kw)
+        except Exception as e:
+            # API 실패 시 해당 후보는 점수 0 처리
+            print(f"⚠️ Naver 조회 실패: {kw} / {e}")
+            return 0
+        if cache is not None:
+            cache.put(kw, total)
+        return total
+
+    if to_fetch:
+        t0 = time.perf_counter()
+        ex = ThreadPoolExecutor(max_workers=min(workers, len(to_fetch)))
+        try:
+            futs = {kw: ex.submit(_one, kw) for kw in to_fetch}
+            wait(list(futs.values()), timeout=deadline if deadline > 0 else None)
+            for kw, f in futs.items():
+                out[kw] = f.result() if f.done() else None
+        finally:
+            # 마감 후 남은 요청은 기다리지 않음(아직 시작 안 한 것은 취소)
+            ex.shutdown(wait=False, cancel_futures=True)
+
+        late = [kw for kw in to_fetch if out.get(kw) is None]
+        ms = int((time.perf_counter() - t0) * 1000)
+        if late:
+            print(f"⏱️ Naver 조회 마감({deadline:g}s) → 부분 결과 사용: {len(to_fetch) - len(late)}/{len(to_fetch)} ({ms}ms), 제외: {late}")
+        else:
+            print(f"🔎 Naver 조회 {len(to_fetch)}건 ({ms}ms, 동시 {workers})")
+        if cache is not None:
+            cache.save()
+
+    if cache is not None:
+        cache.report("naver total")
+        if stale:
+            _revalidate(cache, naver_client_id, naver_client_secret, stale)
+    return out
+
+
 def pick_keyword_by_naver(
     naver_client_id: str,
     naver_client_secret: str,
@@ -44,14 +160,13 @@ def pick_keyword_by_naver(
         # 다 썼으면 그냥 씨앗에서 랜덤 1개(운영 중단 방지)
         candidates = seeds[:max_candidates]
 
+    totals = _fetch_totals(naver_client_id, naver_client_secret, candidates)
+
     scored = []
     for kw in candidates:
-        try:
-            total = naver_blog_total_count(naver_client_id, naver_client_secret, kw)
-        except Exception as e:
-            # API 실패 시 해당 후보는 점수 0 처리
-            total = 0
-            print(f"⚠️ Naver 조회 실패: {kw} / {e}")
+        total = totals.get(kw)
+        if total is None:
+            continue  # 마감까지 응답 없음 → 이번 선택에서 제외
 
         # 간단 점수: total이 너무 큰 키워드는 경쟁도도 크니 완만하게 반영
         # (log 대신 **0.35로 완화)
@@ -66,5 +181,6 @@ def pick_keyword_by_naver(
         "candidates": candidates,
         "scored": [{"keyword": k, "total": t, "score": s} for (k, t, s) in scored],
         "chosen": chosen,
+        "timed_out": [k for k in candidates if totals.get(k) is None],
     }
     return chosen, debug
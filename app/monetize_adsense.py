@@ -1,6 +1,8 @@
 import os
 import re
-from typing import Optional
+from typing import List, Optional, Tuple
+
+from app.formatter_v2 import SLOT_END, SLOT_TOP, slot_before_section
 
 
 # formatter_v2.py 에서 넣어둔 마커를 치환합니다.
@@ -19,9 +21,10 @@ def _is_full_snippet(v: str) -> bool:
     return ("<ins" in low) or ("adsbygoogle" in low) or ("data-ad-slot" in low)
 
 
-def _render_adsense(slot_value: str) -> str:
+def _render_adsense(slot_value: str, *, inline_push: bool = True) -> str:
     """slot_value:
     - 숫자만 들어오면(예: 1234567890) => ins+script로 감쌉니다.
+      (inline_push=False면 push 스크립트 없이 <ins>만)
     - 이미 <ins ...> 형태면 그대로 사용합니다.
     """
     v = (slot_value or "").strip()
@@ -47,8 +50,9 @@ def _render_adsense(slot_value: str) -> str:
         f'<ins class="adsbygoogle" style="display:block" '
         f'data-ad-client="{client}" data-ad-slot="{slot}" '
         f'data-ad-format="auto" data-full-width-responsive="true"></ins>'
-        f'\n<script>(adsbygoogle = window.adsbygoogle || []).push({{}});</script>'
     )
+    if inline_push:
+        ins += '\n<script>(adsbygoogle = window.adsbygoogle || []).push({});</script>'
     return ins
 
 
@@ -71,8 +75,151 @@ def _maybe_include_script() -> str:
     return ""
 
 
+# -------------------------
+# 스크립트 모드
+# -------------------------
+# ADSENSE_SCRIPT_MODE
+# - inline(기본): 슬롯마다 <script>push</script> (기존 동작)
+# - deferred: 로더는 글당 최대 1번, push는 본문 끝 초기화 스크립트 1개로 묶음
+# - lazy: deferred + 중/하단 슬롯은 화면에 들어올 때(IntersectionObserver) push
+#   push({})는 "아직 처리 안 된 첫 번째 ins.adsbygoogle"를 채우므로, lazy 슬롯은
+#   class를 adsbygoogle-lazy로 두었다가 보일 때 adsbygoogle로 바꾼 직후 push → 그 슬롯만 채워짐
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+_LOADER_SRC_RE = re.compile(r"""<script\b[^>]*\bsrc\s*=\s*["']?[^"'>]*adsbygoogle\.js""", re.IGNORECASE)
+_ADS_INS_TAG_RE = re.compile(r"<ins\b[^>]*\badsbygoogle\b[^>]*>", re.IGNORECASE)
+_LAZY_CLASS_RE = re.compile(r"""(\bclass\s*=\s*["']?[^"'>]*?)\badsbygoogle\b(?!-)""", re.IGNORECASE)
+
+
+def _script_mode(mode: str = "") -> str:
+    m = (mode or _env("ADSENSE_SCRIPT_MODE")).strip().lower()
+    return m if m in ("inline", "deferred", "lazy") else "inline"
+
+
+def _ins_only(snippet: str, *, lazy: bool, loaders: Optional[List[str]] = None) -> str:
+    """슬롯 html에서 adsbygoogle 로더/push 스크립트를 걷어내고
+    초기화 스크립트가 찾을 수 있게 <ins>에 data-post-ad 표시를 붙입니다.
+    (lazy면 class adsbygoogle → adsbygoogle-lazy: 보이기 전에는 다른 push가 채우지 않도록)
+    - 사용자가 붙여넣은 로더(<script src=...adsbygoogle.js>)는 loaders에 모아 둡니다(본문 끝에 1개만 다시 넣음).
+    """
+    if not snippet:
+        return ""
+
+    def _drop(m: "re.Match[str]") -> str:
+        tag = m.group(0)
+        if "adsbygoogle" not in tag.lower():
+            return tag
+        if loaders is not None and _LOADER_SRC_RE.search(tag):
+            loaders.append(tag)
+        return ""
+
+    def _mark(m: "re.Match[str]") -> str:
+        tag = m.group(0)
+        if lazy:
+            tag = _LAZY_CLASS_RE.sub(r"\1adsbygoogle-lazy", tag, count=1)
+        mark = "lazy" if lazy else "now"
+        return f'<ins data-post-ad="{mark}"' + tag[len("<ins"):]
+
+    out = _SCRIPT_RE.sub(_drop, snippet).strip()
+    return _ADS_INS_TAG_RE.sub(_mark, out)
+
+
+def _deferred_initializer() -> str:
+    """본문 광고 push를 한 번에 처리하는 초기화 스크립트(글당 1개).
+    - data-post-ad="now": DOM 준비 후 바로 push
+    - data-post-ad="lazy": 뷰포트 근처(200px)에 들어올 때 class를 adsbygoogle로 바꾸고 push
+      (그 시점에 처리 안 된 adsbygoogle 슬롯은 이 슬롯뿐 → push가 이 슬롯을 채움)
+    """
+    js = (
+        "(function(){"
+        "function p(){(window.adsbygoogle=window.adsbygoogle||[]).push({});}"
+        "function show(el){el.className=el.className.replace(/\\badsbygoogle-lazy\\b/,'adsbygoogle');p();}"
+        "function run(){"
+        "var i,now=document.querySelectorAll('ins[data-post-ad=\"now\"]');"
+        "for(i=0;i<now.length;i++)p();"
+        "var lz=document.querySelectorAll('ins[data-post-ad=\"lazy\"]');"
+        "if(!lz.length)return;"
+        "if(!('IntersectionObserver' in window)){for(i=0;i<lz.length;i++)show(lz[i]);return;}"
+        "var o=new IntersectionObserver(function(es){es.forEach(function(e){"
+        "if(e.isIntersecting){o.unobserve(e.target);show(e.target);}});},{rootMargin:'200px 0px'});"
+        "for(i=0;i<lz.length;i++)o.observe(lz[i]);}"
+        "if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',run);}else{run();}"
+        "})();"
+    )
+    return f"<script>{js}</script>"
+
+
+def _deferred_fills(mode: str) -> List[Tuple[str, str]]:
+    top_v = _env("ADSENSE_SLOT_TOP") or _env("ADSENSE_SLOT_1")
+    mid_v = _env("ADSENSE_SLOT_MID") or _env("ADSENSE_SLOT_2")
+    bot_v = _env("ADSENSE_SLOT_BOTTOM") or _env("ADSENSE_SLOT_3")
+
+    lazy = mode == "lazy"
+    pasted: List[str] = []
+    top = _ins_only(_render_adsense(top_v, inline_push=False), lazy=False, loaders=pasted)
+    mid = _ins_only(_render_adsense(mid_v, inline_push=False), lazy=lazy, loaders=pasted)
+    bot = _ins_only(_render_adsense(bot_v, inline_push=False), lazy=lazy, loaders=pasted)
+    if not (top or mid or bot):
+        return []
+
+    fills: List[Tuple[str, str]] = []
+    if top:
+        fills.append((SLOT_MAP["top"], top))
+    if mid:
+        fills.append((SLOT_MAP["mid"], mid))
+    if bot:
+        fills.append((SLOT_MAP["bottom"], bot))
+
+    # 로더 1개(설정으로 넣는 것 → 없으면 사용자가 붙여넣은 첫 로더) + push 초기화 1개를 본문 끝에 모아서
+    loader = _maybe_include_script() or (pasted[0] if pasted else "")
+    tail = (loader + "\n" + _deferred_initializer()).strip()
+    fills.append((SLOT_END, tail))
+    return fills
+
+
+# 상/중/하 광고가 들어갈 formatter_v2 슬롯(중간 = 3번째 섹션 앞, 수동광고와 같은 위치)
+SLOT_MAP = {
+    "top": SLOT_TOP,
+    "mid": slot_before_section(3),
+    "bottom": SLOT_END,
+}
+
+
+def _render_slots() -> Tuple[str, str, str]:
+    top_v = _env("ADSENSE_SLOT_TOP") or _env("ADSENSE_SLOT_1")
+    mid_v = _env("ADSENSE_SLOT_MID") or _env("ADSENSE_SLOT_2")
+    bot_v = _env("ADSENSE_SLOT_BOTTOM") or _env("ADSENSE_SLOT_3")
+    return _render_adsense(top_v), _render_adsense(mid_v), _render_adsense(bot_v)
+
+
+def adsense_slot_fills(script_mode: str = "") -> List[Tuple[str, str]]:
+    """formatter_v2.assemble_slots()에 넘길 [(슬롯이름, html), ...]을 만듭니다.
+    - 본문을 다시 훑지 않고 format_post_v2가 기록한 슬롯 위치에 그대로 들어갑니다.
+    - 광고 설정이 없으면 빈 리스트.
+    - script_mode(Settings.ADSENSE_SCRIPT_MODE, 비우면 env)가 deferred/lazy면
+      스크립트를 글당 로더 1개 + 초기화 1개로 줄입니다.
+    """
+    mode = _script_mode(script_mode)
+    if mode != "inline":
+        return _deferred_fills(mode)
+
+    top, mid, bot = _render_slots()
+    if not (top or mid or bot):
+        return []
+
+    script_tag = _maybe_include_script()
+    fills: List[Tuple[str, str]] = []
+    if script_tag or top:
+        fills.append((SLOT_MAP["top"], (script_tag + "\n" + top).strip() if top else script_tag))
+    if mid:
+        fills.append((SLOT_MAP["mid"], mid))
+    if bot:
+        fills.append((SLOT_MAP["bottom"], bot))
+    return fills
+
+
 def inject_adsense_slots(html: str) -> str:
     """본문 HTML에 3개 슬롯(상/중/하)을 자연스럽게 삽입합니다.
+    - (구버전 호환) 새 파이프라인은 adsense_slot_fills() + assemble_slots()를 씁니다.
     - format_post_v2가 넣어둔 <!--AD_TOP-->, <!--AD_MID-->, <!--AD_BOTTOM--> 마커를 사용합니다.
     - 슬롯 값은 env로 받습니다:
       - ADSENSE_SLOT_TOP / MID / BOTTOM
@@ -81,13 +228,7 @@ def inject_adsense_slots(html: str) -> str:
     if not html:
         return html
 
-    top_v = _env("ADSENSE_SLOT_TOP") or _env("ADSENSE_SLOT_1")
-    mid_v = _env("ADSENSE_SLOT_MID") or _env("ADSENSE_SLOT_2")
-    bot_v = _env("ADSENSE_SLOT_BOTTOM") or _env("ADSENSE_SLOT_3")
-
-    top = _render_adsense(top_v)
-    mid = _render_adsense(mid_v)
-    bot = _render_adsense(bot_v)
+    top, mid, bot = _render_slots()
 
     # 광고 설정이 하나도 없으면 마커만 제거
     if not (top or mid or bot):
@@ -85,7 +85,7 @@ def _box_html(keyword: str, products: List[dict], box_id: str) -> str:
 <div style="display:flex; gap:12px; border:1px solid #e9ecef; border-radius:14px; padding:12px; background:#fff;">
   <a href="{url}" target="_blank" rel="nofollow sponsored noopener"
      style="display:block; width:92px; flex:0 0 92px;">
-    <img src="{img}" alt="{name}"
+    <img src="{img}" alt="{name}" width="92" height="92" loading="lazy" decoding="async"
          style="width:92px; height:92px; object-fit:cover; border-radius:12px; background:#f1f3f5;" />
   </a>
   <div style="flex:1; min-width:0;">
@@ -1,9 +1,51 @@
-import requests
+import os
+import threading
+import time
+
+from app import http_pool
 
 
 NAVER_BLOG_SEARCH_URL = "https://openapi.naver.com/v1/search/blog.json"
 
 
+class RateLimiter:
+    """
+    초당 요청 수 제한(요청 시작 간격을 1/rps 이상으로). 여러 스레드가 같이 써도 됩니다.
+    - rps <= 0이면 제한 없음
+    """
+
+    def __init__(self, rps: float):
+        self.interval = (1.0 / rps) if rps > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float((os.getenv(key) or str(default)).strip())
+    except Exception:
+        return default
+
+
+# 네이버 검색 API(블로그/뉴스 공용) 초당 호출 제한: NAVER_RPS(기본 10)
+_LIMITER = RateLimiter(_env_float("NAVER_RPS", 10.0))
+
+
+def naver_rate_limit() -> None:
+    """네이버 검색 API 호출 직전에 부르세요(프로세스 전체 공용 limiter)."""
+    _LIMITER.wait()
+
+
 def naver_blog_total_count(client_id: str, client_secret: str, query: str, timeout: int = 10) -> int:
     """
     네이버 블로그 검색 API로 해당 키워드의 '총 검색 결과 수(total)'를 가져옵니다.
@@ -19,7 +61,8 @@ def naver_blog_total_count(client_id: str, client_secret: str, query: str, timeo
         "start": 1,
         "sort": "sim",
     }
-    r = requests.get(NAVER_BLOG_SEARCH_URL, headers=headers, params=params, timeout=timeout)
+    naver_rate_limit()
+    r = http_pool.get(NAVER_BLOG_SEARCH_URL, headers=headers, params=params, timeout=timeout)
     if r.status_code != 200:
         raise RuntimeError(f"Naver API error {r.status_code}: {r.text[:200]}")
     data = r.json()
@@ -3,11 +3,16 @@ from __future__ import annotations
 
 import os
 import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Tuple
+from math import ceil
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 
-import requests
+from app import http_pool
+from app.naver_api import naver_rate_limit
+from app.ttl_cache import TTLCache
 
 KST = timezone(timedelta(hours=9))
 
@@ -80,53 +85,137 @@ def is_policy_keyword(keyword: str) -> bool:
     return any(s in k for s in signals)
 
 
-def fetch_naver_news_items(query: str, *, display: int = 10, sort: str = "date", timeout: int = 12) -> List[Dict[str, Any]]:
+def _news_cache() -> Optional[TTLCache]:
+    """
+    검색어별 뉴스 결과 캐시(.naver_cache/news.json) — 재실행/같은 날 재시도 시 재조회 없음
+    - NEWS_CACHE_MINUTES(기본 180, 0이면 끔)
+    """
+    minutes = _env_int("NEWS_CACHE_MINUTES", 180)
+    if minutes <= 0:
+        return None
+    d = _env("NAVER_CACHE_DIR", ".naver_cache")
+    return TTLCache(os.path.join(d, "news.json"), fresh_sec=minutes * 60, max_age_sec=minutes * 60, max_items=300)
+
+
+def fetch_naver_news_items(
+    query: str,
+    *,
+    display: int = 10,
+    sort: str = "date",
+    timeout: int = 12,
+    cache: Optional[TTLCache] = None,
+) -> List[Dict[str, Any]]:
     client_id = _env("NAVER_CLIENT_ID", "")
     client_secret = _env("NAVER_CLIENT_SECRET", "")
     if not client_id or not client_secret:
         print("⚠️ NAVER_CLIENT_ID/SECRET 없음 → 뉴스 컨텍스트 스킵")
         return []
 
+    display = max(1, min(display, 30))
+    cache_key = f"{query}|{display}|{sort}"
+    if cache is not None:
+        cached, status = cache.get(cache_key)
+        if status == "fresh" and isinstance(cached, list):
+            return cached
+
     url = "https://openapi.naver.com/v1/search/news.json"
     headers = {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
-    params = {"query": query, "display": max(1, min(display, 30)), "sort": sort}
+    params = {"query": query, "display": display, "sort": sort}
 
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=timeout)
+        naver_rate_limit()
+        r = http_pool.get(url, headers=headers, params=params, timeout=timeout)
         if r.status_code != 200:
             print(f"⚠️ naver news api http={r.status_code} body={(r.text or '')[:200]}")
             return []
         data = r.json() if isinstance(r.json(), dict) else {}
         items = data.get("items") or []
-        return items if isinstance(items, list) else []
+        items = items if isinstance(items, list) else []
     except Exception as e:
         print(f"⚠️ naver news api error: {e}")
         return []
 
+    # 성공한 응답만 캐시(빈 결과 포함)
+    if cache is not None:
+        cache.put(cache_key, items)
+    return items
 
-def _dedupe_news(items: List[Dict[str, Any]], sim_threshold: float = 0.62) -> List[Dict[str, Any]]:
+
+def _news_queries(keyword: str) -> List[str]:
+    """keyword + NEWS_CONTEXT_QUERY_SUFFIXES(기본 "정책,발표") 변형들"""
+    suffixes = [x.strip() for x in _env("NEWS_CONTEXT_QUERY_SUFFIXES", "정책,발표").split(",") if x.strip()]
+    out = [keyword]
+    for sfx in suffixes:
+        q = f"{keyword} {sfx}"
+        if q not in out:
+            out.append(q)
+    return out
+
+
+def fetch_news_fanout(keyword: str, *, display: int = 10, sort: str = "date") -> List[Dict[str, Any]]:
     """
-    제목 유사(자카드) 중복 제거
+    검색어 변형들을 동시에 조회(캐시 우선) → 라운드로빈으로 합침(원 키워드 결과가 각 순번의 맨 앞).
+    대기 시간 ≈ 가장 느린 1건.
     """
-    kept: List[Dict[str, Any]] = []
-    tokens_kept: List[set[str]] = []
+    queries = _news_queries(keyword)
+    cache = _news_cache()
+    with ThreadPoolExecutor(max_workers=len(queries)) as ex:
+        results = list(ex.map(lambda q: fetch_naver_news_items(q, display=display, sort=sort, cache=cache), queries))
+    if cache is not None:
+        cache.save()
+        cache.report("news")
+
+    merged: List[Dict[str, Any]] = []
+    for i in range(max((len(r) for r in results), default=0)):
+        for r in results:
+            if i < len(r):
+                merged.append(r[i])
+    return merged
+
 
+def _shingles(title: str) -> set[int]:
+    """제목 토큰(2자 이상) → 해시 집합"""
+    return {zlib.crc32(t.encode("utf-8")) for t in _tokenize(title)}
+
+
+def _dedupe_news(items: List[Dict[str, Any]], sim_threshold: float = 0.62) -> List[Dict[str, Any]]:
+    """
+    제목 유사(자카드) 중복 제거 — 해시 shingle 역색인 + prefix filter.
+    - 모든 제목의 shingle을 (등장 빈도, 해시) 순으로 정렬하고, 각 제목은 앞쪽 |x| - ceil(t·|x|) + 1개만 색인.
+      자카드 ≥ t인 두 집합은 이 prefix에서 반드시 겹치므로(AllPairs), 후보만 비교해도 결과는 전수 비교와 같습니다.
+    - 키워드처럼 모든 제목에 나오는 흔한 토큰은 prefix 뒤로 밀려 색인되지 않음 → 비교 횟수 ≈ O(n)
+    """
+    rows: List[Tuple[Dict[str, Any], set[int]]] = []
     for it in items:
         if not isinstance(it, dict):
             continue
         title = _strip_tags(str(it.get("title", "")))
         if len(title) < 6:
             continue
-        tok = _tokenize(title)
-        dup = False
-        for kt in tokens_kept:
-            if _jaccard(tok, kt) >= sim_threshold:
-                dup = True
-                break
-        if dup:
+        rows.append((it, _shingles(title)))
+
+    df: Dict[int, int] = {}
+    for _, sh in rows:
+        for h in sh:
+            df[h] = df.get(h, 0) + 1
+
+    if sim_threshold <= 0:
+        return [it for it, _ in rows[:1]]  # 모든 쌍이 중복
+
+    t = float(sim_threshold)
+    kept: List[Dict[str, Any]] = []
+    kept_sh: List[set[int]] = []
+    index: Dict[int, List[int]] = {}
+
+    for it, sh in rows:
+        prefix = sorted(sh, key=lambda h: (df[h], h))[: len(sh) - ceil(t * len(sh)) + 1] if sh else []
+        candidates = {j for h in prefix for j in index.get(h, ())}
+        if any(_jaccard(sh, kept_sh[j]) >= sim_threshold for j in candidates):
             continue
+        for h in prefix:
+            index.setdefault(h, []).append(len(kept))
         kept.append(it)
-        tokens_kept.append(tok)
+        kept_sh.append(sh)
     return kept
 
 
@@ -148,7 +237,7 @@ def build_news_context(keyword: str) -> str:
     keep = _env_int("NEWS_CONTEXT_KEEP", 3)
     max_chars = _env_int("NEWS_CONTEXT_MAX_CHARS", 900)
 
-    items = fetch_naver_news_items(keyword, display=display, sort="date")
+    items = fetch_news_fanout(keyword, display=display, sort="date")
     items = _dedupe_news(items, sim_threshold=float(_env("NEWS_CONTEXT_SIM_THRESHOLD", "0.62") or "0.62"))
 
     lines: List[str] = []
@@ -0,0 +1,155 @@
+# app/page_weight.py
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Tuple
+
+
+def _env(key: str, default: str = "") -> str:
+    return (os.getenv(key) or default).strip()
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int(_env(key, str(default)))
+    except Exception:
+        return default
+
+
+@dataclass
+class PageWeightBudget:
+    max_bytes: int = 150_000
+    max_dom_nodes: int = 1500
+    max_images: int = 20
+    max_inline_style_bytes: int = 60_000
+    max_script_tags: int = 4
+    # warn: 로그만 / block: 발행 중단
+    mode: str = "warn"
+
+
+def budget_from_env() -> PageWeightBudget:
+    d = PageWeightBudget()
+    mode = _env("PAGE_WEIGHT_MODE", d.mode).lower()
+    return PageWeightBudget(
+        max_bytes=_env_int("PAGE_WEIGHT_MAX_BYTES", d.max_bytes),
+        max_dom_nodes=_env_int("PAGE_WEIGHT_MAX_NODES", d.max_dom_nodes),
+        max_images=_env_int("PAGE_WEIGHT_MAX_IMAGES", d.max_images),
+        max_inline_style_bytes=_env_int("PAGE_WEIGHT_MAX_STYLE_BYTES", d.max_inline_style_bytes),
+        max_script_tags=_env_int("PAGE_WEIGHT_MAX_SCRIPTS", d.max_script_tags),
+        mode=mode if mode in ("warn", "block", "off") else d.mode,
+    )
+
+
+class _WeightParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.dom_nodes = 0
+        self.images = 0
+        self.images_lazy = 0
+        self.images_high_priority = 0
+        self.images_missing_dims = 0
+        self.inline_style_bytes = 0
+        self.script_tags = 0
+        self.external_scripts = 0
+        self._in_style = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Any]]) -> None:
+        self.dom_nodes += 1
+        if tag == "img":
+            a = dict(attrs)
+            self.images += 1
+            if (a.get("loading") or "").lower() == "lazy":
+                self.images_lazy += 1
+            if (a.get("fetchpriority") or "").lower() == "high":
+                self.images_high_priority += 1
+            if not (a.get("width") and a.get("height")):
+                self.images_missing_dims += 1
+        elif tag == "script":
+            self.script_tags += 1
+            if any(k == "src" for k, _ in attrs):
+                self.external_scripts += 1
+        elif tag == "style":
+            self._in_style = True
+        for k, v in attrs:
+            if k == "style" and v:
+                self.inline_style_bytes += len(v.encode("utf-8"))
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Any]]) -> None:
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "style":
+            self._in_style = False
+
+    def handle_data(self, data: str) -> None:
+        if self._in_style:
+            self.inline_style_bytes += len(data.encode("utf-8"))
+
+
+def analyze_page_weight(html: str) -> Dict[str, int]:
+    """
+    발행 직전 본문 HTML 정적 분석(네트워크 없음).
+    - bytes / dom_nodes(요소 수) / images / inline_style_bytes(style 속성+<style>) / script_tags
+    - images_lazy / images_high_priority / images_missing_dims(width·height 누락 → CLS 원인)
+    """
+    p = _WeightParser()
+    p.feed(html or "")
+    p.close()
+    return {
+        "bytes": len((html or "").encode("utf-8")),
+        "dom_nodes": p.dom_nodes,
+        "images": p.images,
+        "images_lazy": p.images_lazy,
+        "images_high_priority": p.images_high_priority,
+        "images_missing_dims": p.images_missing_dims,
+        "inline_style_bytes": p.inline_style_bytes,
+        "script_tags": p.script_tags,
+        "external_scripts": p.external_scripts,
+    }
+
+
+def check_page_weight(report: Dict[str, int], budget: PageWeightBudget) -> List[str]:
+    """예산 초과 항목 목록(비어 있으면 통과)"""
+    limits = [
+        ("bytes", budget.max_bytes),
+        ("dom_nodes", budget.max_dom_nodes),
+        ("images", budget.max_images),
+        ("inline_style_bytes", budget.max_inline_style_bytes),
+        ("script_tags", budget.max_script_tags),
+    ]
+    over: List[str] = []
+    for key, limit in limits:
+        val = int(report.get(key, 0))
+        if limit > 0 and val > limit:
+            over.append(f"{key} {val}/{limit}")
+    if int(report.get("images_missing_dims", 0)) > 0:
+        over.append(f"images_missing_dims {report['images_missing_dims']}")
+    return over
+
+
+def page_weight_gate(html: str, budget: PageWeightBudget | None = None) -> Dict[str, Any]:
+    """
+    분석 + 예산 체크 + 로그.
+    - mode=block 이고 초과가 있으면 RuntimeError → 발행 중단
+    - 반환값은 history item에 그대로 기록(페이지 무게 추이 확인용)
+    """
+    budget = budget or budget_from_env()
+    report: Dict[str, Any] = dict(analyze_page_weight(html))
+    if budget.mode == "off":
+        return report
+
+    over = check_page_weight(report, budget)
+    report["over_budget"] = over
+
+    print(
+        f"⚖️ page weight: {report['bytes']}B | nodes={report['dom_nodes']} | img={report['images']} "
+        f"| style={report['inline_style_bytes']}B | script={report['script_tags']}"
+    )
+    if over:
+        msg = "페이지 무게 예산 초과: " + ", ".join(over)
+        if budget.mode == "block":
+            raise RuntimeError(msg)
+        print(f"⚠️ {msg} (warn 모드 → 계속 진행)")
+    return report
@@ -0,0 +1,135 @@
+# app/procedural_image.py
+from __future__ import annotations
+
+import os
+import random
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageDraw
+
+from app.thumb_overlay import _load_korean_font
+
+RGB = Tuple[int, int, int]
+
+# 토픽별 팔레트: (배경 위, 배경 아래, 모티프 색들)
+_PALETTES: Dict[str, List[Tuple[RGB, RGB, List[RGB]]]] = {
+    "health": [
+        ((236, 253, 245), (167, 243, 208), [(16, 185, 129), (5, 150, 105), (52, 211, 153), (255, 255, 255)]),
+        ((240, 249, 255), (186, 230, 253), [(14, 165, 233), (20, 184, 166), (125, 211, 252), (255, 255, 255)]),
+    ],
+    "trend": [
+        ((238, 242, 255), (199, 210, 254), [(79, 70, 229), (99, 102, 241), (167, 139, 250), (255, 255, 255)]),
+        ((245, 243, 255), (221, 214, 254), [(124, 58, 237), (59, 130, 246), (196, 181, 253), (255, 255, 255)]),
+    ],
+    "life": [
+        ((255, 247, 237), (254, 215, 170), [(249, 115, 22), (234, 88, 12), (251, 191, 36), (255, 255, 255)]),
+        ((254, 242, 242), (254, 202, 202), [(244, 63, 94), (251, 146, 60), (253, 186, 116), (255, 255, 255)]),
+    ],
+}
+
+
+def _env(key: str, default: str = "") -> str:
+    return (os.getenv(key) or default).strip()
+
+
+def _gradient(size: int, top: RGB, bottom: RGB, *, flip: bool) -> Image.Image:
+    # 256단계 세로 그라디언트를 만들고 늘림(픽셀 단위 파이썬 루프 없음)
+    mask = Image.linear_gradient("L").resize((size, size))
+    if flip:
+        mask = mask.transpose(Image.FLIP_TOP_BOTTOM)
+    return Image.composite(Image.new("RGB", (size, size), bottom), Image.new("RGB", (size, size), top), mask)
+
+
+def _rgba(c: RGB, a: int) -> Tuple[int, int, int, int]:
+    return c[0], c[1], c[2], a
+
+
+def _draw_motifs(layer: Image.Image, rng: random.Random, colors: List[RGB], variant: str) -> None:
+    d = ImageDraw.Draw(layer)
+    W, H = layer.size
+
+    # 1) 큰 원(부드러운 면)
+    for _ in range(rng.randint(3, 5)):
+        r = rng.randint(W // 6, W // 3)
+        cx, cy = rng.randint(0, W), rng.randint(0, H)
+        d.ellipse((cx - r, cy - r, cx + r, cy + r), fill=_rgba(rng.choice(colors), rng.randint(40, 90)))
+
+    # 2) 링
+    for _ in range(rng.randint(2, 4)):
+        r = rng.randint(W // 12, W // 5)
+        cx, cy = rng.randint(0, W), rng.randint(0, H)
+        d.ellipse((cx - r, cy - r, cx + r, cy + r), outline=_rgba(rng.choice(colors), 150), width=rng.randint(6, 16))
+
+    # 3) hero: 둥근 카드 / body: 사선 스트라이프
+    if variant == "hero":
+        w, h = int(W * 0.56), int(H * 0.40)
+        x, y = (W - w) // 2, int(H * 0.22)
+        d.rounded_rectangle((x, y, x + w, y + h), radius=48, fill=(255, 255, 255, 170))
+        for i in range(3):
+            ly = y + 70 + i * 60
+            d.rounded_rectangle((x + 60, ly, x + w - 60 - i * 90, ly + 22), radius=11, fill=_rgba(colors[i % len(colors)], 200))
+    else:
+        step = rng.randint(70, 110)
+        c = _rgba(rng.choice(colors), 60)
+        for k in range(-H, W, step):
+            d.line((k, H, k + H, 0), fill=c, width=step // 3)
+
+    # 4) 점 패턴
+    for _ in range(rng.randint(18, 30)):
+        r = rng.randint(6, 16)
+        cx, cy = rng.randint(0, W), rng.randint(0, H)
+        d.ellipse((cx - r, cy - r, cx + r, cy + r), fill=_rgba(rng.choice(colors), 180))
+
+
+def render_procedural_png(keyword: str, *, topic: str, variant: str, seed: int, size: int = 1024) -> bytes:
+    """
+    API 없이 Pillow만으로 hero/body 이미지를 만듭니다(수십 ms).
+    - 토픽 팔레트 + 그라디언트 + 기하 모티프(seed로 재현 가능)
+    - body는 hero와 다른 배치/방향(다른 각도 느낌)
+    - 키워드는 한글 폰트로 작은 라벨만(hero에는 어차피 썸네일 타이틀이 올라감)
+    """
+    rng = random.Random(int(seed) * 2 + (0 if variant == "hero" else 1))
+    top, bottom, colors = rng.choice(_PALETTES.get(topic) or _PALETTES["health"])
+
+    base = _gradient(size, top, bottom, flip=(variant != "hero"))
+    layer = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    _draw_motifs(layer, rng, colors, variant)
+    img = Image.alpha_composite(base.convert("RGBA"), layer)
+
+    label = (keyword or "").strip()[:16]
+    if label and variant != "hero":
+        d = ImageDraw.Draw(img)
+        font = _load_korean_font(40)
+        b = d.textbbox((0, 0), label, font=font)
+        pad = 22
+        w, h = b[2] - b[0] + pad * 2, b[3] - b[1] + pad * 2
+        d.rounded_rectangle((48, 48, 48 + w, 48 + h), radius=h // 2, fill=(255, 255, 255, 215))
+        d.text((48 + pad - b[0], 48 + pad - b[1]), label, font=font, fill=colors[0])
+
+    out = BytesIO()
+    img.convert("RGB").save(out, format="PNG", compress_level=1)
+    return out.getvalue()
+
+
+def use_procedural_images(topic: str, *, budget_pressure: bool = False) -> bool:
+    """
+    IMAGE_MODE=procedural → 항상 / IMAGE_PROCEDURAL_TOPICS="life,trend" 또는 "all" → 토픽별
+    IMAGE_PROCEDURAL_ON_BUDGET=1(기본) → 예산 압박 시 자동
+    """
+    if _env("IMAGE_MODE", "api").lower() == "procedural":
+        return True
+    raw = _env("IMAGE_PROCEDURAL_TOPICS", "").lower()
+    topics = {x.strip() for x in raw.split(",") if x.strip()}
+    if "all" in topics or (topic or "").lower() in topics:
+        return True
+    on_budget = _env("IMAGE_PROCEDURAL_ON_BUDGET", "1").lower() in ("1", "true", "yes", "y", "on")
+    return bool(budget_pressure and on_budget)
+
+
+def procedural_pair(keyword: str, *, topic: str, seed: int) -> Tuple[bytes, bytes]:
+    return (
+        render_procedural_png(keyword, topic=topic, variant="hero", seed=seed),
+        render_procedural_png(keyword, topic=topic, variant="body", seed=seed),
+    )
+
@@ -0,0 +1,91 @@
+# app/thumb_base.py
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from io import BytesIO
+from typing import Any, Dict, Optional
+
+from app.thumb_overlay import THUMB_STYLE_VERSION, _decode, _square_1024
+
+# state["thumb_bases"]는 history(최근 200개)와 별도로 이만큼 보관 → 1,000개 단위 일괄 재렌더링 가능
+THUMB_BASE_MAX = 2000
+
+
+def _base_dir() -> str:
+    return (os.getenv("THUMB_BASE_DIR") or ".thumb_base").strip()
+
+
+def _path(sha: str) -> str:
+    return os.path.join(_base_dir(), f"{sha}.webp")
+
+
+def thumb_bases(state: Dict[str, Any]) -> Dict[str, Any]:
+    """{str(post_id): {sha, title, media_id, style, ts}}"""
+    b = state.get("thumb_bases")
+    if not isinstance(b, dict):
+        b = {}
+        state["thumb_bases"] = b
+    return b
+
+
+def save_thumb_base(
+    state: Dict[str, Any],
+    post_id: int,
+    raw_bytes: bytes,
+    title: str,
+    media_id: int,
+) -> Optional[str]:
+    """
+    오버레이 전 hero 이미지를 1024 정사각 WebP(q=92, ~150KB)로 보관하고 글과 연결합니다.
+    나중에 오버레이 스타일이 바뀌면 이 base + title로 썸네일을 다시 만듭니다.
+    """
+    try:
+        img = _square_1024(_decode(raw_bytes))
+        out = BytesIO()
+        img.save(out, format="WEBP", quality=92, method=4)
+        data = out.getvalue()
+        sha = hashlib.sha256(data).hexdigest()
+
+        os.makedirs(_base_dir(), exist_ok=True)
+        if not os.path.exists(_path(sha)):
+            tmp = _path(sha) + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, _path(sha))
+    except Exception as e:
+        print(f"⚠️ thumb base 저장 실패: {e}")
+        return None
+
+    bases = thumb_bases(state)
+    bases[str(int(post_id))] = {
+        "sha": sha,
+        "title": title,
+        "media_id": int(media_id or 0),
+        "style": THUMB_STYLE_VERSION,
+        "ts": int(time.time()),
+    }
+    if len(bases) > THUMB_BASE_MAX:
+        for k, v in sorted(bases.items(), key=lambda kv: int((kv[1] or {}).get("ts", 0)))[: len(bases) - THUMB_BASE_MAX]:
+            bases.pop(k, None)
+            if isinstance(v, dict) and v.get("sha"):
+                _remove_if_unused(bases, v["sha"])
+    return sha
+
+
+def _remove_if_unused(bases: Dict[str, Any], sha: str) -> None:
+    if any(isinstance(v, dict) and v.get("sha") == sha for v in bases.values()):
+        return
+    try:
+        os.remove(_path(sha))
+    except Exception:
+        pass
+
+
+def load_thumb_base(sha: str) -> Optional[bytes]:
+    try:
+        with open(_path(sha), "rb") as f:
+            return f.read()
+    except Exception:
+        return None
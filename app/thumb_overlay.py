@@ -1,24 +1,49 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+from functools import lru_cache
 from io import BytesIO
+from typing import Callable, List, Optional, Tuple
 import os
 
 
 # =========================
-# 1️⃣ 기존 to_square_1024 (복원)
+# 0️⃣ 메모리 내 단계(디코드/인코드는 파이프라인에서 1번씩만)
 # =========================
-def to_square_1024(img_bytes: bytes) -> bytes:
-    img = Image.open(BytesIO(img_bytes)).convert("RGB")
+def _decode(img_bytes: bytes) -> Image.Image:
+    return Image.open(BytesIO(img_bytes)).convert("RGB")
+
+
+def _encode_png(img: Image.Image) -> bytes:
+    out = BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+UPSCALE_SHARPEN_BELOW = 960  # 원본 정사각 한 변이 이보다 작으면 업스케일 후 샤픈(body 업로드만)
+
+
+def _square_1024(img: Image.Image) -> Image.Image:
     w, h = img.size
     size = min(w, h)
 
     left = (w - size) // 2
     top = (h - size) // 2
     img = img.crop((left, top, left + size, top + size))
-    img = img.resize((1024, 1024), Image.LANCZOS)
+    return img.resize((1024, 1024), Image.LANCZOS)
 
-    out = BytesIO()
-    img.save(out, format="PNG")
-    return out.getvalue()
+
+def _square_1024_sharpened(img: Image.Image) -> Image.Image:
+    """저해상도 body(작은 size 프로필/와이드 크롭) 업스케일: LANCZOS 뒤 약한 언샤프 마스크로 흐릿함 보정"""
+    out = _square_1024(img)
+    if min(img.size) < UPSCALE_SHARPEN_BELOW:
+        out = out.filter(ImageFilter.UnsharpMask(radius=1.2, percent=60, threshold=2))
+    return out
+
+
+# =========================
+# 1️⃣ 기존 to_square_1024 (복원)
+# =========================
+def to_square_1024(img_bytes: bytes) -> bytes:
+    return _encode_png(_square_1024(_decode(img_bytes)))
 
 
 # =========================
@@ -31,21 +56,99 @@ KOREAN_FONT_PATHS = [
 ]
 
 
-def _load_korean_font(size: int):
+@lru_cache(maxsize=1)
+def _korean_font_path() -> str:
+    # 경로 탐색은 프로세스당 1번
     for path in KOREAN_FONT_PATHS:
         if os.path.exists(path):
-            try:
-                return ImageFont.truetype(path, size)
-            except Exception:
-                pass
-    return ImageFont.load_default()
+            return path
+    return ""
+
+
+@lru_cache(maxsize=64)
+def _font_at(path: str, size: int):
+    """(path, size) 단위 폰트 캐시 — 큰 .ttc를 매번 다시 읽지 않습니다."""
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except Exception:
+            pass
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # 구버전 Pillow: 크기 지정 불가
+        return ImageFont.load_default()
+
+
+def _load_korean_font(size: int):
+    return _font_at(_korean_font_path(), int(size))
 
 
 # =========================
 # 3️⃣ 썸네일 타이틀 오버레이
 # =========================
-def add_title_to_image(img_bytes: bytes, title: str) -> bytes:
-    img = Image.open(BytesIO(img_bytes)).convert("RGB")
+# 오버레이 스타일 버전: _draw_title 모양을 바꾸면 올리세요 → app.thumb_rerender가 이전 버전 썸네일을 다시 만듭니다.
+THUMB_STYLE_VERSION = 1
+
+TITLE_MAX_W_RATIO = 0.9     # 바 폭 대비 텍스트 최대 폭
+TITLE_LINE_GAP_RATIO = 0.12  # 2줄일 때 줄 간격(폰트 크기 대비)
+
+
+def _line_h(font) -> int:
+    b = font.getbbox("가Ag")
+    return b[3] - b[1]
+
+
+def _fits(lines: List[str], size: int, max_w: float, max_h: float) -> bool:
+    font = _load_korean_font(size)
+    if max(font.getlength(x) for x in lines) > max_w:
+        return False
+    gap = int(size * TITLE_LINE_GAP_RATIO)
+    total_h = _line_h(font) * len(lines) + gap * (len(lines) - 1)
+    return total_h <= max_h
+
+
+def _largest_fit(lines: List[str], lo: int, hi: int, max_w: float, max_h: float) -> int:
+    """lo~hi 사이에서 들어가는 가장 큰 폰트 크기(이분 탐색). 없으면 0."""
+    best = 0
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if _fits(lines, mid, max_w, max_h):
+            best, lo = mid, mid + 1
+        else:
+            hi = mid - 1
+    return best
+
+
+def _split_two(text: str) -> List[str]:
+    """가운데에서 가장 가까운 공백으로 2줄 분리(공백이 없으면 글자 기준 반)."""
+    mid = len(text) // 2
+    spaces = [i for i, ch in enumerate(text) if ch == " "]
+    if spaces:
+        cut = min(spaces, key=lambda i: abs(i - mid))
+        return [text[:cut].strip(), text[cut + 1:].strip()]
+    return [text[:mid], text[mid:]]
+
+
+def _fit_title(text: str, W: int, bar_h: int) -> Tuple[List[str], int]:
+    """
+    1줄로 기본 크기(bar_h*0.38)까지 들어가면 1줄,
+    최소 크기(bar_h*0.22)보다 작아져야 하면 2줄로 나눠 다시 탐색합니다.
+    """
+    max_w = W * TITLE_MAX_W_RATIO
+    hi = int(bar_h * 0.38)
+    lo = max(8, int(bar_h * 0.22))
+
+    size = _largest_fit([text], lo, hi, max_w, bar_h * 0.9)
+    if size:
+        return [text], size
+
+    lines = _split_two(text)
+    size = _largest_fit(lines, 8, hi, max_w, bar_h * 0.9)
+    return lines, max(size, 8)
+
+
+def _draw_title(img: Image.Image, title: str) -> Image.Image:
     draw = ImageDraw.Draw(img)
 
     W, H = img.size
@@ -54,19 +157,126 @@ def add_title_to_image(img_bytes: bytes, title: str) -> bytes:
     bar = Image.new("RGBA", (W, bar_h), (0, 0, 0, 140))
     img.paste(bar, (0, H - bar_h), bar)
 
-    font_size = int(bar_h * 0.38)
+    text = title.strip()
+    if not text:
+        return img
+
+    lines, font_size = _fit_title(text, W, bar_h)
     font = _load_korean_font(font_size)
 
-    text = title.strip()
-    bbox = draw.textbbox((0, 0), text, font=font)
-    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    boxes = [draw.textbbox((0, 0), x, font=font) for x in lines]
+    heights = [b[3] - b[1] for b in boxes]
+    gap = int(font_size * TITLE_LINE_GAP_RATIO)
+    total_h = sum(heights) + gap * (len(lines) - 1)
 
-    x = (W - tw) // 2
-    y = H - bar_h + (bar_h - th) // 2
+    y = H - bar_h + (bar_h - total_h) // 2
+    for line, b, lh in zip(lines, boxes, heights):
+        # bbox 오프셋(b[0], b[1])을 빼서 실제 글자 영역 기준으로 가운데 정렬
+        x = (W - (b[2] - b[0])) // 2 - b[0]
+        ty = y - b[1]
+        draw.text((x + 2, ty + 2), line, font=font, fill=(0, 0, 0))
+        draw.text((x, ty), line, font=font, fill=(255, 255, 255))
+        y += lh + gap
+    return img
 
-    draw.text((x + 2, y + 2), text, font=font, fill=(0, 0, 0))
-    draw.text((x, y), text, font=font, fill=(255, 255, 255))
 
-    out = BytesIO()
-    img.save(out, format="PNG")
-    return out.getvalue()
+def add_title_to_image(img_bytes: bytes, title: str) -> bytes:
+    return _encode_png(_draw_title(_decode(img_bytes), title))
+
+
+# =========================
+# 4️⃣ 단일 디코드 파이프라인
+# =========================
+def render_square_image(
+    img_bytes: bytes,
+    title: str = "",
+    encoder: Optional[Callable[[Image.Image], bytes]] = None,
+    sharpen_upscaled: bool = False,
+) -> bytes:
+    """
+    원본 bytes를 1번만 디코드 → crop → resize → (title 있으면) 오버레이 → 1번만 인코드.
+    기존 to_square_1024(add_title_to_image(to_square_1024(x)))와 같은 결과입니다.
+    - encoder: 마지막 인코드 단계(기본 PNG). 예: image_encode.make_upload_encoder()
+    - sharpen_upscaled=True(body 업로드용): 원본이 UPSCALE_SHARPEN_BELOW보다 작으면 업스케일 후 샤픈
+      (이 경우만 기존 경로와 결과가 다름)
+    """
+    square = _square_1024_sharpened if sharpen_upscaled else _square_1024
+    img = square(_decode(img_bytes))
+    if title and title.strip():
+        img = _draw_title(img, title)
+    return (encoder or _encode_png)(img)
+
+
+# =========================
+# 5️⃣ 와이드 캔버스 1장 → hero/body 정사각 크롭 2개
+# =========================
+BODY_ZOOM = 0.72        # body 크롭 한 변 = 캔버스 높이 × BODY_ZOOM (가까이 본 '다른 각도')
+BODY_MAX_IOU = 0.35     # hero 크롭과 이만큼 이상 겹치는 body 후보는 제외(후보가 없으면 무시)
+_ANALYSIS_H = 128       # 엔트로피 계산용 축소 높이
+_ANALYSIS_STEP = 8      # 후보 창 이동 간격(축소 좌표)
+
+Box = Tuple[int, int, int, int]
+
+
+def _iou(a: Box, b: Box) -> float:
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union else 0.0
+
+
+def _windows(W: int, H: int, side: int, step: int) -> List[Box]:
+    xs = list(range(0, W - side + 1, step)) or [0]
+    ys = list(range(0, H - side + 1, step)) or [0]
+    if xs[-1] != W - side:
+        xs.append(max(0, W - side))
+    if ys[-1] != H - side:
+        ys.append(max(0, H - side))
+    return [(x, y, x + side, y + side) for y in ys for x in xs]
+
+
+def pick_square_crops(img: Image.Image) -> Tuple[Box, Box]:
+    """
+    엔트로피(정보량)가 큰 곳을 기준으로 hero/body 정사각 크롭 영역을 고릅니다.
+    - hero: 캔버스 높이만큼의 정사각 창 중 엔트로피 최대
+    - body: 더 작은 창(BODY_ZOOM) 중 hero와 덜 겹치는(IoU <= BODY_MAX_IOU) 엔트로피 최대 → 다른 구도/클로즈업
+    반환: (hero_box, body_box) 원본 좌표
+    """
+    W, H = img.size
+    scale = _ANALYSIS_H / float(H)
+    small = img.convert("L").resize((max(1, int(W * scale)), _ANALYSIS_H), Image.BILINEAR)
+    sw, sh = small.size
+
+    def best(side: int, exclude: Optional[Box]) -> Box:
+        cands = _windows(sw, sh, side, _ANALYSIS_STEP)
+        if exclude is not None:
+            far = [b for b in cands if _iou(b, exclude) <= BODY_MAX_IOU]
+            cands = far or cands
+        return max(cands, key=lambda b: small.crop(b).entropy())
+
+    hero_s = best(min(sw, sh), None)
+    body_s = best(max(8, int(min(sw, sh) * BODY_ZOOM)), hero_s)
+
+    def up(b: Box) -> Box:
+        x0, y0 = int(b[0] / scale), int(b[1] / scale)
+        side = min(int((b[2] - b[0]) / scale), W - x0, H - y0)
+        return x0, y0, x0 + side, y0 + side
+
+    return up(hero_s), up(body_s)
+
+
+def wide_canvas_crops(img_bytes: bytes) -> Tuple[bytes, bytes]:
+    """
+    와이드 이미지(예: 1536×1024) 1장 → (hero, body) 정사각 PNG bytes.
+    이후 단계(render_square_image)가 1024로 맞추고 최종 인코드하므로 여기서는 빠른 PNG(compress_level=1).
+    """
+    img = _decode(img_bytes)
+    hero_box, body_box = pick_square_crops(img)
+
+    def enc(b: Box) -> bytes:
+        out = BytesIO()
+        img.crop(b).save(out, format="PNG", compress_level=1)
+        return out.getvalue()
+
+    return enc(hero_box), enc(body_box)
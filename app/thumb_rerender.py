@@ -0,0 +1,181 @@
+# app/thumb_rerender.py
+"""
+기존 글 썸네일 일괄 재렌더링.
+
+_draw_title 스타일을 바꾸고 thumb_overlay.THUMB_STYLE_VERSION을 올린 뒤 실행하면,
+state["thumb_bases"]에 base 이미지가 남아 있는 글마다
+  base + thumb_title → 오버레이 재렌더(프로세스 풀) → 미디어 업로드 → featured_media 교체(동시성 제한)
+를 수행합니다. 청크마다 state를 저장하므로 중간에 끊겨도 다시 실행하면 이어서 진행합니다.
+업로드는 state["media_index"]로 중복 제거 → 체크포인트 이후 끊긴 항목도 다시 올리지 않고 기존 미디어를 재사용합니다.
+
+    python -m app.thumb_rerender
+
+ENV
+- THUMB_RERENDER_LIMIT: 이번 실행 최대 글 수(기본 0 = 전부)
+- THUMB_RERENDER_CHUNK: 청크 크기(기본 16)
+- THUMB_RERENDER_CONCURRENCY: 업로드/PATCH 동시 요청 수(기본 4)
+- THUMB_RERENDER_MAX_MINUTES: 이 시간을 넘기면 현재 청크까지만 하고 종료(기본 0 = 제한 없음, 다음 실행이 이어서)
+- THUMB_RERENDER_FORCE=1: 스타일 버전과 무관하게 전부 / THUMB_RERENDER_DRY_RUN=1: 렌더링만(업로드 안 함)
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app import http_pool
+from app.image_encode import config_from_env as encode_config_from_env
+from app.image_workers import RenderJob, render_jobs
+from app.store import load_state, save_state
+from app.thumb_base import load_thumb_base, thumb_bases
+from app.thumb_overlay import THUMB_STYLE_VERSION
+from app.wp_client import set_featured_media, upload_media_dedup
+
+
+def _env(key: str, default: str = "") -> str:
+    return (os.getenv(key) or default).strip()
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int(_env(key, str(default)))
+    except Exception:
+        return default
+
+
+def _env_bool(key: str, default: str = "0") -> bool:
+    return _env(key, default).lower() in ("1", "true", "yes", "y", "on")
+
+
+def pending_items(state: Dict[str, Any], *, force: bool = False) -> List[Tuple[int, Dict[str, Any]]]:
+    """현재 스타일 버전이 아닌(또는 force) 항목을 post_id 오름차순으로"""
+    out: List[Tuple[int, Dict[str, Any]]] = []
+    for k, v in thumb_bases(state).items():
+        if not isinstance(v, dict) or not v.get("sha"):
+            continue
+        if not force and int(v.get("style", 0)) == THUMB_STYLE_VERSION:
+            continue
+        try:
+            out.append((int(k), v))
+        except Exception:
+            continue
+    return sorted(out, key=lambda x: x[0])
+
+
+def rerender_thumbnails(
+    state: Dict[str, Any],
+    wp_url: str,
+    wp_user: str,
+    wp_pw: str,
+    *,
+    limit: int = 0,
+    chunk: int = 16,
+    concurrency: int = 4,
+    workers: Optional[int] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    max_minutes: float = 0,
+    save: Callable[[Dict[str, Any]], None] = save_state,
+) -> Dict[str, int]:
+    """
+    반환: {"total", "done", "failed", "missing"}
+    - 성공한 항목은 style/media_id를 갱신(→ 재실행 시 건너뜀), 실패한 항목은 그대로 두어 다음 실행에서 재시도
+    """
+    items = pending_items(state, force=force)
+    if limit > 0:
+        items = items[:limit]
+    total = len(items)
+    stats = {"total": total, "done": 0, "failed": 0, "missing": 0}
+    if not total:
+        print(f"✅ 재렌더링할 썸네일 없음 (style v{THUMB_STYLE_VERSION})")
+        return stats
+
+    enc_cfg = encode_config_from_env()
+    t0 = time.perf_counter()
+    print(f"🔁 thumbnail re-render: {total}개 → style v{THUMB_STYLE_VERSION} (dry_run={dry_run})")
+
+    for start in range(0, total, max(1, chunk)):
+        if max_minutes > 0 and time.perf_counter() - t0 > max_minutes * 60:
+            print(f"⏸️ 시간 제한({max_minutes:g}분) 도달 → 여기서 중단, 다음 실행에서 이어서 진행")
+            break
+        batch: List[Tuple[int, Dict[str, Any], bytes]] = []
+        for post_id, entry in items[start:start + chunk]:
+            base = load_thumb_base(entry["sha"])
+            if not base:
+                stats["missing"] += 1
+                print(f"⚠️ post={post_id}: base 이미지 없음(캐시 만료?) → 건너뜀")
+                continue
+            batch.append((post_id, entry, base))
+        if not batch:
+            continue
+
+        rendered = render_jobs(
+            [RenderJob(base, entry.get("title") or "", label=f"post{pid}", encode=enc_cfg) for pid, entry, base in batch],
+            workers=workers,
+        )
+
+        def _apply(args: Tuple[int, Dict[str, Any], bytes]) -> Tuple[int, Optional[int], str]:
+            pid, _, data = args
+            if dry_run:
+                return pid, None, ""
+            try:
+                _, media_id = upload_media_dedup(
+                    wp_url, wp_user, wp_pw, data, f"featured-{pid}-v{THUMB_STYLE_VERSION}", state
+                )
+                set_featured_media(wp_url, wp_user, wp_pw, pid, media_id)
+                return pid, media_id, ""
+            except Exception as e:
+                return pid, None, str(e)[:200]
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+            results = list(ex.map(_apply, [(pid, entry, data) for (pid, entry, _), data in zip(batch, rendered)]))
+
+        for (pid, entry, _), (_, media_id, err) in zip(batch, results):
+            if err:
+                stats["failed"] += 1
+                print(f"⚠️ post={pid}: {err}")
+                continue
+            stats["done"] += 1
+            if not dry_run:
+                entry["media_id"] = int(media_id or 0)
+                entry["style"] = THUMB_STYLE_VERSION
+                entry["rerendered_at"] = int(time.time())
+
+        if not dry_run:
+            save(state)  # 청크 단위 체크포인트 → 중단 후 재실행 시 이어서
+
+        handled = stats["done"] + stats["failed"] + stats["missing"]
+        elapsed = time.perf_counter() - t0
+        eta = elapsed / handled * (total - handled) if handled else 0.0
+        print(
+            f"🔁 [{handled}/{total}] done={stats['done']} failed={stats['failed']} "
+            f"missing={stats['missing']} | {elapsed:.0f}s 경과, 남은 시간 ~{eta:.0f}s"
+        )
+
+    return stats
+
+
+def main() -> None:
+    from app.config import Settings
+
+    S = Settings()
+    state = load_state()
+    stats = rerender_thumbnails(
+        state,
+        S.WP_URL,
+        S.WP_USERNAME,
+        S.WP_APP_PASSWORD,
+        limit=_env_int("THUMB_RERENDER_LIMIT", 0),
+        chunk=_env_int("THUMB_RERENDER_CHUNK", 16),
+        concurrency=_env_int("THUMB_RERENDER_CONCURRENCY", 4),
+        force=_env_bool("THUMB_RERENDER_FORCE"),
+        dry_run=_env_bool("THUMB_RERENDER_DRY_RUN"),
+        max_minutes=float(_env_int("THUMB_RERENDER_MAX_MINUTES", 0)),
+    )
+    print("✅ thumbnail re-render:", stats)
+    http_pool.report_http()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# app/ttl_cache.py
+"""
+작은 JSON 파일 기반 TTL 캐시(네이버 검색 결과 등).
+
+- 항목: {key: {"v": 값, "ts": 저장 시각}}, 파일 1개(원자적 교체로 저장)
+- get(key) → (값, "fresh" | "stale" | "miss")
+  - fresh: ts가 fresh_sec 이내 → 그대로 사용
+  - stale: fresh_sec 초과, max_age_sec 이내 → 일단 사용하고 호출부가 백그라운드로 갱신(stale-while-revalidate)
+  - miss: 없거나 max_age_sec 초과
+- 여러 스레드에서 put/save 해도 됩니다(lock).
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_query(q: str) -> str:
+    """캐시 키용: NFKC + 소문자 + 공백 정리"""
+    q = unicodedata.normalize("NFKC", q or "").lower()
+    return re.sub(r"\s+", " ", q).strip()
+
+
+class TTLCache:
+    def __init__(self, path: str, *, fresh_sec: float, max_age_sec: float, max_items: int = 500):
+        self.path = path
+        self.fresh_sec = float(fresh_sec)
+        self.max_age_sec = max(float(max_age_sec), self.fresh_sec)
+        self.max_items = max_items
+        self.stats: Dict[str, int] = {"fresh": 0, "stale": 0, "miss": 0}
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {k: v for k, v in data.items() if isinstance(v, dict) and "ts" in v} if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def get(self, key: str, *, now: Optional[float] = None) -> Tuple[Any, str]:
+        now = time.time() if now is None else now
+        with self._lock:
+            it = self._items.get(normalize_query(key))
+            age = (now - float(it.get("ts", 0))) if it else None
+            if age is None or age > self.max_age_sec:
+                status, value = "miss", None
+            else:
+                status, value = ("fresh" if age <= self.fresh_sec else "stale"), it.get("v")
+            self.stats[status] += 1
+        return value, status
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._items[normalize_query(key)] = {"v": value, "ts": int(time.time())}
+            if len(self._items) > self.max_items:
+                for k, _ in sorted(self._items.items(), key=lambda kv: kv[1].get("ts", 0))[: len(self._items) - self.max_items]:
+                    self._items.pop(k, None)
+
+    def save(self) -> None:
+        with self._lock:
+            data = dict(self._items)
+            try:
+                d = os.path.dirname(self.path)
+                if d:
+                    os.makedirs(d, exist_ok=True)
+                tmp = f"{self.path}.{threading.get_ident()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"⚠️ cache save 실패({self.path}): {e}")
+
+    def hit_rate(self) -> float:
+        n = sum(self.stats.values())
+        return (self.stats["fresh"] + self.stats["stale"]) / n if n else 0.0
+
+    def report(self, label: str) -> None:
+        s = self.stats
+        print(f"🗃️ {label} cache: fresh={s['fresh']} stale={s['stale']} miss={s['miss']} (hit {self.hit_rate():.0%})")
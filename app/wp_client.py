@@ -1,7 +1,10 @@
 import base64
-from typing import Any, Optional, Tuple
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
-import requests
+from app import http_pool
 
 
 def _sniff_image_mime_and_ext(data: bytes, fallback_ext: str = "png"):
@@ -16,15 +19,7 @@ def _sniff_image_mime_and_ext(data: bytes, fallback_ext: str = "png"):
     return "application/octet-stream", fallback_ext
 
 
-def upload_media_to_wp(
-    wp_url: str,
-    username: str,
-    app_password: str,
-    img_bytes: bytes,
-    file_name: str,
-) -> Tuple[str, int]:
-    """WordPress REST API로 미디어 업로드 (415 방지: MIME/확장자 자동 감지)."""
-    wp_url = wp_url.rstrip("/")
+def _media_upload_request(username: str, app_password: str, img_bytes: bytes, file_name: str) -> Dict[str, str]:
     auth = base64.b64encode(f"{username}:{app_password}".encode("utf-8")).decode("utf-8")
     mime, ext = _sniff_image_mime_and_ext(img_bytes, fallback_ext="png")
 
@@ -35,15 +30,14 @@ def upload_media_to_wp(
     else:
         file_name = f"image.{ext}"
 
-    headers = {
+    return {
         "Authorization": f"Basic {auth}",
         "Content-Disposition": f'attachment; filename="{file_name}"',
         "Content-Type": mime,
     }
 
-    media_endpoint = f"{wp_url}/wp-json/wp/v2/media"
-    resp = requests.post(media_endpoint, headers=headers, data=img_bytes, timeout=90)
 
+def _media_upload_result(resp: Any) -> Tuple[str, int]:
     if resp.status_code not in (200, 201):
         raise RuntimeError(f"Media upload failed: {resp.status_code} {resp.text[:500]}")
 
@@ -51,6 +45,174 @@ def upload_media_to_wp(
     return j.get("source_url"), int(j.get("id"))
 
 
+def upload_media_to_wp(
+    wp_url: str,
+    username: str,
+    app_password: str,
+    img_bytes: bytes,
+    file_name: str,
+) -> Tuple[str, int]:
+    """WordPress REST API로 미디어 업로드 (415 방지: MIME/확장자 자동 감지)."""
+    wp_url = wp_url.rstrip("/")
+    headers = _media_upload_request(username, app_password, img_bytes, file_name)
+    media_endpoint = f"{wp_url}/wp-json/wp/v2/media"
+    resp = http_pool.post(media_endpoint, headers=headers, data=img_bytes, timeout=90)
+    return _media_upload_result(resp)
+
+
+async def upload_media_to_wp_async(
+    wp_url: str,
+    username: str,
+    app_password: str,
+    img_bytes: bytes,
+    file_name: str,
+) -> Tuple[str, int]:
+    """upload_media_to_wp의 비동기 버전(http_pool.async_post)"""
+    wp_url = wp_url.rstrip("/")
+    headers = _media_upload_request(username, app_password, img_bytes, file_name)
+    media_endpoint = f"{wp_url}/wp-json/wp/v2/media"
+    resp = await http_pool.async_post(media_endpoint, headers=headers, data=img_bytes, timeout=90)
+    return _media_upload_result(resp)
+
+
+# -------------------------
+# 미디어 중복 업로드 방지(state.media_index: sha256 → id/url)
+# -------------------------
+MEDIA_INDEX_MAX = 300
+
+# 여러 스레드(썸네일 재렌더링 업로드 등)가 같은 state["media_index"]를 고치므로 인덱스 접근만 잠금
+_INDEX_LOCK = threading.RLock()
+
+
+def _media_index(state: Dict[str, Any]) -> Dict[str, Any]:
+    with _INDEX_LOCK:
+        idx = state.get("media_index")
+        if not isinstance(idx, dict):
+            idx = {}
+            state["media_index"] = idx
+        return idx
+
+
+def _media_index_hit(state: Dict[str, Any], digest: str) -> Optional[int]:
+    with _INDEX_LOCK:
+        hit = _media_index(state).get(digest)
+        return int(hit["id"]) if isinstance(hit, dict) and hit.get("id") else None
+
+
+def _media_index_touch(state: Dict[str, Any], digest: str, alive: bool) -> None:
+    """재사용 확인 결과 반영: 살아 있으면 ts 갱신, 없어졌으면 인덱스에서 제거"""
+    with _INDEX_LOCK:
+        idx = _media_index(state)
+        if not alive:
+            idx.pop(digest, None)
+        elif isinstance(idx.get(digest), dict):
+            idx[digest]["ts"] = int(time.time())
+
+
+def _media_fields_url(r: Any) -> Optional[str]:
+    if r.status_code != 200:
+        return None
+    j = r.json()
+    return (j.get("source_url") or None) if isinstance(j, dict) else None
+
+
+def _media_still_exists(wp_url: str, username: str, app_password: str, media_id: int) -> Optional[str]:
+    """필드 최소 GET으로 미디어 생존 확인 → source_url (없으면 None)"""
+    try:
+        r = http_pool.get(
+            f"{wp_url}/wp-json/wp/v2/media/{int(media_id)}",
+            auth=(username, app_password),
+            params={"_fields": "id,source_url"},
+            timeout=15,
+        )
+        return _media_fields_url(r)
+    except Exception:
+        return None
+
+
+async def _media_still_exists_async(wp_url: str, username: str, app_password: str, media_id: int) -> Optional[str]:
+    try:
+        r = await http_pool.async_get(
+            f"{wp_url}/wp-json/wp/v2/media/{int(media_id)}",
+            auth=(username, app_password),
+            params={"_fields": "id,source_url"},
+            timeout=15,
+        )
+        return _media_fields_url(r)
+    except Exception:
+        return None
+
+
+def _media_index_put(state: Dict[str, Any], digest: str, url: str, media_id: int) -> None:
+    with _INDEX_LOCK:
+        idx = _media_index(state)
+        idx[digest] = {"id": int(media_id), "url": url, "ts": int(time.time())}
+
+        # 오래된 항목부터 정리
+        if len(idx) > MEDIA_INDEX_MAX:
+            for k, _ in sorted(idx.items(), key=lambda kv: int((kv[1] or {}).get("ts", 0)))[: len(idx) - MEDIA_INDEX_MAX]:
+                idx.pop(k, None)
+
+
+def upload_media_dedup(
+    wp_url: str,
+    username: str,
+    app_password: str,
+    img_bytes: bytes,
+    file_name: str,
+    state: Dict[str, Any],
+) -> Tuple[str, int]:
+    """
+    같은 바이트(sha256)가 이미 미디어 라이브러리에 있으면 재업로드 없이 재사용합니다.
+    - state["media_index"][sha256] = {id, url, ts}
+    - 재사용 전 미디어가 아직 있는지 가벼운 GET(_fields=id,source_url)으로 확인
+    - 없어졌으면 인덱스에서 지우고 새로 업로드
+    - 스레드에서 동시에 불러도 됩니다(인덱스 접근은 잠금)
+    """
+    wp_url = wp_url.rstrip("/")
+    digest = hashlib.sha256(img_bytes or b"").hexdigest()
+
+    hit_id = _media_index_hit(state, digest)
+    if hit_id:
+        url = _media_still_exists(wp_url, username, app_password, hit_id)
+        _media_index_touch(state, digest, alive=bool(url))
+        if url:
+            print(f"♻️ media reuse: id={hit_id} ({len(img_bytes)} bytes 업로드 생략)")
+            return url, hit_id
+
+    url, media_id = upload_media_to_wp(wp_url, username, app_password, img_bytes, file_name)
+    _media_index_put(state, digest, url, media_id)
+    return url, media_id
+
+
+async def upload_media_dedup_async(
+    wp_url: str,
+    username: str,
+    app_password: str,
+    img_bytes: bytes,
+    file_name: str,
+    state: Dict[str, Any],
+) -> Tuple[str, int]:
+    """
+    upload_media_dedup의 비동기 버전(규칙 동일).
+    같은 바이트를 동시에 두 번 올리면 인덱스 재사용이 안 되므로, 호출부는 같은 bytes끼리는 순서대로 await 하세요.
+    """
+    wp_url = wp_url.rstrip("/")
+    digest = hashlib.sha256(img_bytes or b"").hexdigest()
+
+    hit_id = _media_index_hit(state, digest)
+    if hit_id:
+        url = await _media_still_exists_async(wp_url, username, app_password, hit_id)
+        _media_index_touch(state, digest, alive=bool(url))
+        if url:
+            print(f"♻️ media reuse: id={hit_id} ({len(img_bytes)} bytes 업로드 생략)")
+            return url, hit_id
+
+    url, media_id = await upload_media_to_wp_async(wp_url, username, app_password, img_bytes, file_name)
+    _media_index_put(state, digest, url, media_id)
+    return url, media_id
+
+
 def ensure_category_id(
     wp_url: str,
     wp_user: str,
@@ -71,7 +233,7 @@ def ensure_category_id(
 
     try:
         # search로 후보 찾기
-        r = requests.get(base, auth=(wp_user, wp_pw), params={"search": name, "per_page": 100}, timeout=20)
+        r = http_pool.get(base, auth=(wp_user, wp_pw), params={"search": name, "per_page": 100}, timeout=20)
         if r.status_code == 200 and isinstance(r.json(), list):
             for it in r.json():
                 if isinstance(it, dict) and (it.get("name") == name):
@@ -85,7 +247,7 @@ def ensure_category_id(
         payload["slug"] = slug
 
     try:
-        r2 = requests.post(base, auth=(wp_user, wp_pw), json=payload, timeout=20)
+        r2 = http_pool.post(base, auth=(wp_user, wp_pw), json=payload, timeout=20)
         if r2.status_code in (200, 201) and isinstance(r2.json(), dict):
             return int(r2.json().get("id"))
         # 생성 실패는 치명적이지 않게 None 처리
@@ -128,7 +290,7 @@ def publish_to_wp(
     print("📝 POST ->", api_endpoint)
     print("📝 title ->", (payload["title"] or "")[:80])
 
-    res = requests.post(api_endpoint, auth=(wp_user, wp_pw), json=payload, timeout=timeout)
+    res = http_pool.post(api_endpoint, auth=(wp_user, wp_pw), json=payload, timeout=timeout)
     print("📝 WP status:", res.status_code)
     print("📝 WP resp:", (res.text or "")[:500])
 
@@ -136,3 +298,12 @@ def publish_to_wp(
         raise RuntimeError(f"워드프레스 글 발행 실패: {res.status_code} / {res.text}")
 
     return int(res.json()["id"])
+
+
+def set_featured_media(wp_url: str, wp_user: str, wp_pw: str, post_id: int, media_id: int, timeout: int = 30) -> None:
+    """기존 글의 대표 이미지(featured_media) 교체"""
+    wp_url = wp_url.rstrip("/")
+    endpoint = f"{wp_url}/wp-json/wp/v2/posts/{int(post_id)}"
+    r = http_pool.post(endpoint, auth=(wp_user, wp_pw), json={"featured_media": int(media_id)}, timeout=timeout)
+    if r.status_code not in (200, 201):
+        raise RuntimeError(f"featured_media patch failed: {r.status_code} {r.text[:200]}")
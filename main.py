@@ -1,6 +1,7 @@
 # main.py (LATEST INTEGRATED FINAL + WP RETRY + last_run AFTER SUCCESS + TITLE PREFIX STRIP - copy/paste)
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import hmac
@@ -11,27 +12,38 @@ import re
 import time
 import unicodedata
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, List, Tuple, Optional
-
-import requests
+from typing import List, Tuple, Optional
 
 from app.config import Settings
+from app import http_pool
 from app.ai_openai import (
     make_openai_client,
+    make_async_openai_client,
     generate_blog_post,
     generate_thumbnail_title,
+    generate_thumbnail_title_async,
 )
 from app.ai_gemini_image import (
+    cached_image_units,
     make_gemini_client,
     generate_nanobanana_image_png_bytes,
+    generate_hero_body_png_bytes,
+    image_profile,
 )
 from app.topic_style_stats import (
     record_impression as record_topic_style_impression,
     update_score as update_topic_style_score,
 )
-from app.thumb_overlay import to_square_1024, add_title_to_image
-from app.wp_client import upload_media_to_wp, publish_to_wp, ensure_category_id
+from app.thumb_overlay import render_square_image, wide_canvas_crops
+from app.image_encode import config_from_env as encode_config_from_env, make_upload_encoder
+from app.image_workers import RenderJob, default_workers, render_jobs
+from app.image_hedge import HedgePolicy
+from app.thumb_base import save_thumb_base
+from app.image_cache import cache_enabled_for, cache_stats
+from app.image_phash import avoid_repeat_images, image_hashes as image_hashes_of
+from app.wp_client import upload_media_dedup, upload_media_dedup_async, publish_to_wp, ensure_category_id
 from app.store import load_state, save_state, add_history_item
 from app.dedupe import pick_retry_reason, _title_fingerprint
 from app.keyword_picker import pick_keyword_by_naver
@@ -39,7 +51,17 @@ from app.click_ingest import ingest_click_log
 from app.prioritizer import pick_best_publishing_combo
 from app.cooldown import CooldownRule, apply_cooldown_rules
 from app.news_context import build_news_context
-from app.formatter_v2 import format_post_v2
+from app.formatter_v2 import (
+    format_post_v2,
+    assemble_slots,
+    slot_before_section,
+    SLOT_TOP,
+    SLOT_AFTER_FIRST_LIST,
+    SLOT_END,
+)
+from app.monetize_adsense import adsense_slot_fills
+from app.html_minify import minify_html
+from app.page_weight import page_weight_gate
 from app.image_stats import (
     record_impression as record_image_impression,
     update_score as update_image_score,
@@ -47,7 +69,17 @@ from app.image_stats import (
 from app.image_style_picker import pick_image_style
 from app.quality_gate import quality_retry_loop
 from app.prompt_router import build_system_prompt, build_user_prompt
-from app.guardrails import GuardConfig, check_limits_or_raise, increment_post_count
+from app.guardrails import (
+    GuardConfig,
+    add_month_usd,
+    check_limits_or_raise,
+    image_budget_pressure,
+    increment_post_count,
+)
+from app.cost_estimator import estimate_post_usd, image_cost_units
+from app.procedural_image import use_procedural_images, procedural_pair, render_procedural_png
+from app.image_validate import ensure_valid_image
+from app.image_pool import call_with_deadline, live_budget_sec, pool_counts, pool_take, refill_pool
 from app.thumb_title_stats import (
     record_impression as record_thumb_impression,
     update_score as update_thumb_score,
@@ -82,12 +114,6 @@ def _env_int(key: str, default: int) -> int:
         return default
 
 
-def _as_html(x: Any) -> str:
-    if isinstance(x, tuple) and len(x) >= 1:
-        return x[0] or ""
-    return x or ""
-
-
 # -----------------------------
 # WP PUBLISH RETRY (503/502/504/429 등 일시 장애 자동 재시도)
 # -----------------------------
@@ -569,7 +595,7 @@ def _coupang_deeplink_batch(urls: List[str]) -> List[str]:
     payload = {"coupangUrls": urls}
 
     try:
-        r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=12)
+        r = http_pool.post(url, headers=headers, data=json.dumps(payload), timeout=12)
         if r.status_code != 200:
             print(f"⚠️ coupang deeplink http={r.status_code} body={r.text[:200]}")
             return []
@@ -663,60 +689,6 @@ def _coupang_buttons_html(links: List[Tuple[str, str]], keyword: str) -> str:
     )
 
 
-# -----------------------------
-# HTML INSERT (pre/code 안쪽 회피)
-# -----------------------------
-def _count_tags_before(html: str, pos: int, open_pat: str, close_pat: str) -> tuple[int, int]:
-    opens = len(re.findall(open_pat, html[:pos], flags=re.I))
-    closes = len(re.findall(close_pat, html[:pos], flags=re.I))
-    return opens, closes
-
-
-def _is_inside_code_like(html: str, pos: int) -> bool:
-    pre_o, pre_c = _count_tags_before(html, pos, r"<pre\b", r"</pre>")
-    code_o, code_c = _count_tags_before(html, pos, r"<code\b", r"</code>")
-    return (pre_o > pre_c) or (code_o > code_c)
-
-
-def _insert_after_first_ul_safe(html: str, block: str) -> str:
-    if not block:
-        return html
-
-    start = 0
-    while True:
-        idx = html.find("</ul>", start)
-        if idx == -1:
-            return block + "\n" + html
-        insert_pos = idx + 5
-        if not _is_inside_code_like(html, insert_pos):
-            return html[:insert_pos] + "\n" + block + "\n" + html[insert_pos:]
-        start = insert_pos
-
-
-def _insert_near_second_h2_safe(html: str, block: str) -> str:
-    if not block:
-        return html
-    hs = [m.start() for m in re.finditer(r"<h2\b", html, re.I)]
-    candidates = []
-    if len(hs) >= 2:
-        candidates.append(hs[1])
-    if hs:
-        candidates.append(hs[-1])
-
-    for pos in candidates:
-        if not _is_inside_code_like(html, pos):
-            return html[:pos] + "\n" + block + "\n" + html[pos:]
-
-    pos = max(0, len(html) // 2)
-    if _is_inside_code_like(html, pos):
-        pos = min(len(html), pos + 2000)
-    return html[:pos] + "\n" + block + "\n" + html[pos:]
-
-
-def _insert_end(html: str, block: str) -> str:
-    return html + "\n" + block if block else html
-
-
 # -----------------------------
 # CATEGORY
 # -----------------------------
@@ -732,7 +704,7 @@ def _set_post_category(wp_url: str, user: str, pw: str, post_id: int, cat_id: in
     try:
         wp_url = wp_url.rstrip("/")
         endpoint = f"{wp_url}/wp-json/wp/v2/posts/{post_id}"
-        r = requests.post(endpoint, auth=(user, pw), json={"categories": [cat_id]}, timeout=30)
+        r = http_pool.post(endpoint, auth=(user, pw), json={"categories": [cat_id]}, timeout=30)
         if r.status_code not in (200, 201):
             print(f"⚠️ category patch failed: {r.status_code} {r.text[:200]}")
     except Exception as e:
@@ -742,313 +714,700 @@ def _set_post_category(wp_url: str, user: str, pw: str, post_id: int, cat_id: in
 # -----------------------------
 # RUN
 # -----------------------------
-def run() -> None:
-    S = Settings()
-    run_id = uuid.uuid4().hex[:10]
+class _PostRun:
+    """
+    발행 1회의 단계별 상태. run()은 단계를 순서대로 부르고,
+    async_run()은 서로 독립인 단계만 겹쳐서 부릅니다(같은 메서드/같은 입력 → 같은 결과).
+    """
 
-    event_name = _env("GITHUB_EVENT_NAME", "")
-    is_schedule = (event_name == "schedule")
+    def __init__(self, S: Settings):
+        self.S = S
+        self.run_id = uuid.uuid4().hex[:10]
 
-    openai_client = make_openai_client(S.OPENAI_API_KEY)
-    img_key = _env("IMAGE_API_KEY", "") or getattr(S, "IMAGE_API_KEY", "") or S.OPENAI_API_KEY
-    img_client = make_gemini_client(img_key)
+        self.event_name = _env("GITHUB_EVENT_NAME", "")
+        self.is_schedule = (self.event_name == "schedule")
 
-    state = load_state()
-    state = ingest_click_log(state, S.WP_URL)
-    state = try_update_from_post_metrics(state)
-
-    history = state.get("history", []) if isinstance(state.get("history", []), list) else []
+        self.openai_client = make_openai_client(S.OPENAI_API_KEY)
+        img_key = _env("IMAGE_API_KEY", "") or getattr(S, "IMAGE_API_KEY", "") or S.OPENAI_API_KEY
+        self.img_client = make_gemini_client(img_key)
 
-    # Guardrails
-    cfg = GuardConfig(
-        max_posts_per_day=int(getattr(S, "MAX_POSTS_PER_DAY", 3)),
-        max_usd_per_month=float(getattr(S, "MAX_USD_PER_MONTH", 30.0)),
-    )
-    allow_over_budget = _env_bool("ALLOW_OVER_BUDGET", str(getattr(S, "ALLOW_OVER_BUDGET", 1)))
-    if allow_over_budget:
-        try:
-            check_limits_or_raise(state, cfg)
-        except Exception as e:
-            print(f"⚠️ 가드레일 초과(허용 모드) → 계속 진행: {e}")
-    else:
-        check_limits_or_raise(state, cfg)
-
-    # slot/topic
-    forced_slot, topic = _pick_run_topic(state)
-    print(f"🕒 run_id={run_id} | event={event_name} | forced_slot={forced_slot} -> topic={topic} | kst_now={_kst_now()}")
-
-    # ✅ 시간창 강제(기본 OFF 권장)
-    if _env("RUN_SLOT", "").lower() in ("health", "trend", "life"):
-        if is_schedule and _env_bool("ENFORCE_TIME_WINDOW", "0"):
-            if not _in_time_window(forced_slot):
-                print(f"🛑 out of time window: slot={forced_slot} expected={_expected_hour(forced_slot)}:00 KST → exit(0)")
-                return
-
-    # ✅ 같은 슬롯 중복 방지: 스케줄에서만
-    if is_schedule and _env_bool("SKIP_DUPLICATE_SLOT", "1"):
-        if _already_ran_this_slot(state, forced_slot):
-            print(f"🛑 same slot already ran today: {forced_slot} → exit(0)")
-            return
+        self.api_image_calls: float = 0  # 비용 단위(1024x1024/medium 1장 = 1.0)
+        self.thumb_title = ""
 
-    # keyword
-    keyword, _ = pick_keyword_by_naver(S.NAVER_CLIENT_ID, S.NAVER_CLIENT_SECRET, history)
+    # ---- state / guardrails / slot ----
+    def setup(self) -> bool:
+        """False면 이번 실행은 발행하지 않고 종료"""
+        S = self.S
+        state = load_state()
+        state = ingest_click_log(state, S.WP_URL)
+        state = try_update_from_post_metrics(state)
+        self.state = state
 
-    # life(=쇼핑) subtopic
-    life_subtopic = ""
-    if topic == "life":
-        life_subtopic, sub_dbg = pick_life_subtopic(state)
-        print("🧩 life_subtopic:", life_subtopic, "| dbg(top3):", (sub_dbg.get("scored") or [])[:3])
-        keyword = f"{keyword} {life_subtopic}".strip()
+        self.history = state.get("history", []) if isinstance(state.get("history", []), list) else []
 
-    seed = _stable_seed_int(keyword, run_id, str(int(time.time())))
+        # Guardrails
+        cfg = GuardConfig(
+            max_posts_per_day=int(getattr(S, "MAX_POSTS_PER_DAY", 3)),
+            max_usd_per_month=float(getattr(S, "MAX_USD_PER_MONTH", 30.0)),
+        )
+        allow_over_budget = _env_bool("ALLOW_OVER_BUDGET", str(getattr(S, "ALLOW_OVER_BUDGET", 1)))
+        if allow_over_budget:
+            try:
+                check_limits_or_raise(state, cfg)
+            except Exception as e:
+                print(f"⚠️ 가드레일 초과(허용 모드) → 계속 진행: {e}")
+        else:
+            check_limits_or_raise(state, cfg)
+        # 절차 이미지 전환은 월 비용 기준만(일일 발행 수 초과는 해당 없음)
+        self.budget_pressure = image_budget_pressure(
+            state, cfg, float(_env("IMAGE_PROCEDURAL_BUDGET_RATIO", "0.9") or "0.9")
+        )
 
-    system_prompt = build_system_prompt(topic)
+        # slot/topic
+        forced_slot, topic = _pick_run_topic(state)
+        self.forced_slot, self.topic = forced_slot, topic
+        print(f"🕒 run_id={self.run_id} | event={self.event_name} | forced_slot={forced_slot} -> topic={topic} | kst_now={_kst_now()}")
+
+        # ✅ 시간창 강제(기본 OFF 권장)
+        if _env("RUN_SLOT", "").lower() in ("health", "trend", "life"):
+            if self.is_schedule and _env_bool("ENFORCE_TIME_WINDOW", "0"):
+                if not _in_time_window(forced_slot):
+                    print(f"🛑 out of time window: slot={forced_slot} expected={_expected_hour(forced_slot)}:00 KST → exit(0)")
+                    return False
+
+        # ✅ 같은 슬롯 중복 방지: 스케줄에서만
+        if self.is_schedule and _env_bool("SKIP_DUPLICATE_SLOT", "1"):
+            if _already_ran_this_slot(state, forced_slot):
+                print(f"🛑 same slot already ran today: {forced_slot} → exit(0)")
+                return False
+
+        # 쿠팡: life만
+        self.coupang_planned = bool(topic == "life" and _env_bool("FORCE_COUPANG_IN_LIFE", "1"))
+        return True
+
+    # ---- keyword ----
+    def pick_keyword(self) -> None:
+        S = self.S
+        keyword, _ = pick_keyword_by_naver(S.NAVER_CLIENT_ID, S.NAVER_CLIENT_SECRET, self.history)
+
+        # life(=쇼핑) subtopic
+        self.life_subtopic = ""
+        if self.topic == "life":
+            self.life_subtopic, sub_dbg = pick_life_subtopic(self.state)
+            print("🧩 life_subtopic:", self.life_subtopic, "| dbg(top3):", (sub_dbg.get("scored") or [])[:3])
+            keyword = f"{keyword} {self.life_subtopic}".strip()
+
+        self.keyword = keyword
+        self.seed = _stable_seed_int(keyword, self.run_id, str(int(time.time())))
+
+    # ---- text ----
+    def write_post(self) -> None:
+        S, topic, keyword, history = self.S, self.topic, self.keyword, self.history
+        openai_client = self.openai_client
+
+        system_prompt = build_system_prompt(topic)
+
+        extra_context = ""
+        if topic == "trend":
+            extra_context = build_news_context(keyword)
 
-    extra_context = ""
-    if topic == "trend":
-        extra_context = build_news_context(keyword)
+        try:
+            base_user_prompt = build_user_prompt(topic, keyword, extra_context=extra_context)
+        except TypeError:
+            base_user_prompt = build_user_prompt(topic, keyword)
 
-    try:
-        base_user_prompt = build_user_prompt(topic, keyword, extra_context=extra_context)
-    except TypeError:
-        base_user_prompt = build_user_prompt(topic, keyword)
+        user_prompt = base_user_prompt + (
+            "\n\n[추가 지시] 같은 단어/같은 문장 패턴 반복을 피하고, 소제목 표현도 다양하게. "
+            "각 소제목 본문은 공백 제외 260자 이상."
+        )
 
-    user_prompt = base_user_prompt + (
-        "\n\n[추가 지시] 같은 단어/같은 문장 패턴 반복을 피하고, 소제목 표현도 다양하게. "
-        "각 소제목 본문은 공백 제외 260자 이상."
-    )
+        self.best_image_style, self.thumb_variant, _ = pick_best_publishing_combo(self.state, topic=topic)
+        recent = _recent_titles(history, n=30)
+
+        def _gen():
+            try:
+                post = generate_blog_post(
+                    openai_client,
+                    S.OPENAI_MODEL,
+                    keyword,
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                )
+            except TypeError:
+                post = generate_blog_post(openai_client, S.OPENAI_MODEL, keyword)
+
+            post["title"] = _normalize_title(post.get("title", ""))
+
+            # 품질게이트에서 img_prompt 단어로 실패 방지
+            post["img_prompt"] = f"{keyword} concept illustration, single scene, no collage, no text, no watermark"
+
+            dup, reason = pick_retry_reason(post.get("title", ""), history)
+            if dup or _title_too_similar(post.get("title", ""), recent, threshold=0.45):
+                post["sections"] = []
+                print(f"♻️ 제목 유사/중복({reason or 'similarity'}) → 재생성 유도")
+            return post
+
+        # 품질게이트 실패 시 강제 진행 옵션
+        try:
+            post, _ = quality_retry_loop(_gen, max_retry=4)
+        except Exception as e:
+            if _env_bool("ALLOW_QUALITY_FALLBACK", "1"):
+                print(f"⚠️ quality_gate 실패 → 마지막 초안으로 진행(허용): {e}")
+                post = _gen()
+            else:
+                raise
 
-    best_image_style, thumb_variant, _ = pick_best_publishing_combo(state, topic=topic)
-    recent = _recent_titles(history, n=30)
+        # ✅ 티스토리식 짧은 제목 강제
+        raw_title = post.get("title", "")
+        post["title"] = _finalize_title(topic, keyword, raw_title, recent, self.seed)
+
+        for _ in range(2):
+            if (not post["title"]) or _title_too_similar(post["title"], recent, threshold=0.45):
+                t2 = _rewrite_title_openai_tistory(
+                    openai_client,
+                    S.OPENAI_MODEL,
+                    topic=topic,
+                    keyword=keyword,
+                    bad_title=post["title"] or raw_title,
+                    recent_titles=recent,
+                )
+                post["title"] = _finalize_title(topic, keyword, t2, recent, self.seed)
+            else:
+                break
+        self.post = post
+
+    # ---- thumb title ----
+    def _clean_thumb_title(self, thumb_title: str) -> str:
+        thumb_title = (thumb_title or "").strip()
+        if len(thumb_title) > 18:
+            thumb_title = thumb_title[:18].rstrip()
+        print("🧩 thumb_title:", thumb_title, "| thumb_variant:", self.thumb_variant)
+        return thumb_title
+
+    def make_thumb_title(self) -> str:
+        return self._clean_thumb_title(generate_thumbnail_title(self.openai_client, self.S.OPENAI_MODEL, self.post["title"]))
+
+    async def make_thumb_title_async(self) -> str:
+        client = make_async_openai_client(self.S.OPENAI_API_KEY)
+        return self._clean_thumb_title(
+            await generate_thumbnail_title_async(client, self.S.OPENAI_MODEL, self.post["title"])
+        )
 
-    def _gen():
-        try:
-            post = generate_blog_post(
-                openai_client,
-                S.OPENAI_MODEL,
-                keyword,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-            )
-        except TypeError:
-            post = generate_blog_post(openai_client, S.OPENAI_MODEL, keyword)
+    # ---- images ----
+    def plan_images(self) -> None:
+        topic, keyword, seed = self.topic, self.keyword, self.seed
 
-        post["title"] = _normalize_title(post.get("title", ""))
+        forced_style_mode = ""
+        if topic in ("health", "trend"):
+            forced_style_mode = "watercolor"
+        elif topic == "life" and self.coupang_planned:
+            forced_style_mode = "photo"
 
-        # 품질게이트에서 img_prompt 단어로 실패 방지
-        post["img_prompt"] = f"{keyword} concept illustration, single scene, no collage, no text, no watermark"
+        learned_style = self.best_image_style or pick_image_style(self.state, topic=topic)
+        self.style_mode = forced_style_mode or learned_style
+        self.image_style_for_stats = forced_style_mode or learned_style
 
-        dup, reason = pick_retry_reason(post.get("title", ""), history)
-        if dup or _title_too_similar(post.get("title", ""), recent, threshold=0.45):
-            post["sections"] = []
-            print(f"♻️ 제목 유사/중복({reason or 'similarity'}) → 재생성 유도")
-        return post
+        print("🎨 style_mode:", self.style_mode, "| forced:", bool(forced_style_mode), "| learned:", learned_style)
+        print("🛒 coupang_planned:", self.coupang_planned)
 
-    # 품질게이트 실패 시 강제 진행 옵션
-    try:
-        post, _ = quality_retry_loop(_gen, max_retry=4)
-    except Exception as e:
-        if _env_bool("ALLOW_QUALITY_FALLBACK", "1"):
-            print(f"⚠️ quality_gate 실패 → 마지막 초안으로 진행(허용): {e}")
-            post = _gen()
-        else:
-            raise
-
-    # ✅ 티스토리식 짧은 제목 강제
-    raw_title = post.get("title", "")
-    post["title"] = _finalize_title(topic, keyword, raw_title, recent, seed)
-
-    for _ in range(2):
-        if (not post["title"]) or _title_too_similar(post["title"], recent, threshold=0.45):
-            t2 = _rewrite_title_openai_tistory(
-                openai_client,
-                S.OPENAI_MODEL,
-                topic=topic,
-                keyword=keyword,
-                bad_title=post["title"] or raw_title,
-                recent_titles=recent,
+        # 안전 base_prompt
+        if topic == "life" and self.coupang_planned:
+            self.base_prompt = (
+                f"{keyword} related household item, practical home product, "
+                f"product clearly visible, clean minimal background, no packaging text, no labels"
             )
-            post["title"] = _finalize_title(topic, keyword, t2, recent, seed)
         else:
-            break
+            self.base_prompt = f"{keyword} calm illustration, clean background"
+
+        self.hero_prompt = _build_image_prompt(self.base_prompt, variant="hero", seed=seed, style_mode=self.style_mode)
+        self.body_prompt = _build_image_prompt(self.base_prompt, variant="body", seed=seed, style_mode=self.style_mode)
+
+        # 이미지 디스크 캐시(IMAGE_CACHE_TOPICS로 토픽별 opt-in)
+        # 프롬프트는 seed(run_id+시각)에 따라 달라지므로 키는 재실행에서도 같은 값으로:
+        # 날짜|슬롯|topic|keyword|style_mode(+variant) → 발행 실패 후 같은 슬롯 재실행 시 이미지 재생성 없음
+        self.use_img_cache = cache_enabled_for(topic)
+        self.img_cache_id = "|".join([_kst_date_key(), self.forced_slot, topic, keyword, self.style_mode])
+
+        # 로컬 절차 생성 모드(IMAGE_MODE/IMAGE_PROCEDURAL_TOPICS 또는 예산 압박 시 자동) → 이미지 API 호출 없음
+        self.procedural = use_procedural_images(topic, budget_pressure=self.budget_pressure)
+
+    def make_images(self) -> None:
+        """라이브 생성/풀/폴백 → 검증 → 중복 회피"""
+        S, topic, keyword, seed, history = self.S, self.topic, self.keyword, self.seed, self.history
+        img_client, style_mode, base_prompt = self.img_client, self.style_mode, self.base_prompt
+        hero_prompt, body_prompt = self.hero_prompt, self.body_prompt
+        use_img_cache, img_cache_id = self.use_img_cache, self.img_cache_id
+
+        if self.procedural:
+            print(f"🎨 procedural image mode (budget_pressure={self.budget_pressure}) → 이미지 API 생략")
+            hero_img, body_img = procedural_pair(keyword, topic=topic, seed=seed)
+        else:
+            # 느린 요청 헤징(과거 지연 p90 초과 시 동일 요청 1회 추가, 일일 추가 비용 상한) — 기록은 state에
+            image_hedge = HedgePolicy(self.state)
+
+            # variant별 생성 프로필(IMAGE_HERO_*/IMAGE_BODY_*): 기본은 둘 다 1024/medium → pair 요청
+            # IMAGE_BODY_QUALITY=low 등으로 프로필이 달라지면 개별 동시 요청(body 비용 절감, 화질 저하)
+            hero_profile = image_profile("hero")
+            body_profile = image_profile("body")
+            # n=2 요청은 두 장이 같은 size/quality → 프로필이 다르면 개별 요청(동시 실행)이 더 쌉니다.
+            pair_request = (
+                _env("IMAGE_PAIR_REQUEST", "1").lower() in ("1", "true", "yes", "y", "on")
+                and hero_profile == body_profile
+            )
 
-    # thumb title
-    thumb_title = generate_thumbnail_title(openai_client, S.OPENAI_MODEL, post["title"])
-    thumb_title = (thumb_title or "").strip()
-    if len(thumb_title) > 18:
-        thumb_title = thumb_title[:18].rstrip()
-    print("🧩 thumb_title:", thumb_title, "| thumb_variant:", thumb_variant)
-
-    # 쿠팡: life만
-    coupang_planned = bool(topic == "life" and _env_bool("FORCE_COUPANG_IN_LIFE", "1"))
-
-    forced_style_mode = ""
-    if topic in ("health", "trend"):
-        forced_style_mode = "watercolor"
-    elif topic == "life" and coupang_planned:
-        forced_style_mode = "photo"
-
-    learned_style = best_image_style or pick_image_style(state, topic=topic)
-    style_mode = forced_style_mode or learned_style
-    image_style_for_stats = forced_style_mode or learned_style
-
-    print("🎨 style_mode:", style_mode, "| forced:", bool(forced_style_mode), "| learned:", learned_style)
-    print("🛒 coupang_planned:", coupang_planned)
-
-    # 안전 base_prompt
-    if topic == "life" and coupang_planned:
-        base_prompt = (
-            f"{keyword} related household item, practical home product, "
-            f"product clearly visible, clean minimal background, no packaging text, no labels"
-        )
-    else:
-        base_prompt = f"{keyword} calm illustration, clean background"
+            wide_canvas = _env("IMAGE_WIDE_CANVAS", "0").lower() in ("1", "true", "yes", "y", "on")
+            wide_size = _env("IMAGE_WIDE_SIZE", "1536x1024")
+
+            # 요청마다 남은 시간을 SDK timeout으로 넘김 → 한도를 넘겨 버린 요청은 그 시점에 끊김
+            budget = live_budget_sec()
+            deadline = time.monotonic() + budget if budget > 0 else None
+
+            def _live_images() -> Tuple[Optional[bytes], Optional[bytes], float]:
+                if wide_canvas:
+                    # 와이드 1장 → hero/body를 로컬에서 엔트로피 기준 크롭(요청 1회, 1024 정사각 2장보다 저렴)
+                    wide_prompt = _build_image_prompt(base_prompt, variant="hero", seed=seed, style_mode=style_mode)
+                    wide_prompt = wide_prompt.replace("square 1:1", "wide 3:2 landscape")
+                    wide_prompt += ", wide scene with several points of interest spread across the frame"
+                    wide = generate_nanobanana_image_png_bytes(
+                        img_client, S.GEMINI_IMAGE_MODEL, wide_prompt, size=wide_size,
+                        use_cache=use_img_cache, cache_id=f"{img_cache_id}|wide", deadline=deadline,
+                        hedge=image_hedge,
+                    )
+                    h, b = wide_canvas_crops(wide)
+                    return h, b, image_cost_units(wide_size)
+                if pair_request:
+                    # hero/body를 images.generate 1회(n=2)로: 요청 수/대기 시간 절반, 이미지 비용은 동일
+                    h, b, n = generate_hero_body_png_bytes(
+                        img_client, S.GEMINI_IMAGE_MODEL, hero_prompt, body_prompt,
+                        size=hero_profile[0], quality=hero_profile[1], use_cache=use_img_cache,
+                        cache_ids=(f"{img_cache_id}|hero", f"{img_cache_id}|body"), deadline=deadline,
+                        hedge=image_hedge,
+                    )
+                    return h, b, n * image_cost_units(*hero_profile)
+
+                # hero/body 개별 요청(각자 프로필) → 동시에 실행해 대기 시간은 둘 중 긴 쪽만큼
+                def _one(prompt: str, variant: str) -> Optional[bytes]:
+                    try:
+                        return generate_nanobanana_image_png_bytes(
+                            img_client, S.GEMINI_IMAGE_MODEL, prompt,
+                            variant=variant, use_cache=use_img_cache, cache_id=f"{img_cache_id}|{variant}",
+                            hedge=image_hedge, deadline=deadline,
+                        )
+                    except Exception as e:
+                        print(f"⚠️ {variant} image fail: {e}")
+                        return None
+
+                with ThreadPoolExecutor(max_workers=2) as ex:
+                    fh = ex.submit(_one, hero_prompt, "hero")
+                    fb = ex.submit(_one, body_prompt, "body")
+                    h, b = fh.result(), fb.result()
+                return h, b, image_cost_units(*hero_profile) + image_cost_units(*body_profile)
+
+            # 라이브 생성이 IMAGE_LIVE_BUDGET_SEC를 넘거나 실패하면 웜 풀(.image_pool)에서 꺼내 씁니다.
+            hero_img, body_img = None, None
+            try:
+                hero_img, body_img, n_calls = call_with_deadline(_live_images, budget)
+                self.api_image_calls += n_calls
+            except Exception as e:
+                print(f"⚠️ live image generation fail: {e}")
+                # 제한 시간 초과 시 백그라운드 요청이 과금될 수 있어 보수적으로 계산
+                self.api_image_calls += image_cost_units(*hero_profile) + image_cost_units(*body_profile)
+
+            # 제한 시간 후에도 남은 요청 스레드는 이후 state를 건드리지 않도록 여기서 마감
+            image_hedge.close()
+            if image_hedge.extra_units:
+                print("🪁 image hedge:", image_hedge.summary())
+                self.api_image_calls += image_hedge.extra_units
+
+            if not hero_img:
+                hero_img = pool_take(topic, style_mode, "hero", history)
+            if not hero_img:
+                print("⚠️ hero image fail -> procedural fallback")
+                try:
+                    hero_img = render_procedural_png(keyword, topic=topic, variant="hero", seed=seed)
+                except Exception:
+                    hero_img = _fallback_png_bytes(keyword)
+            if not body_img:
+                body_img = pool_take(topic, style_mode, "body", history, avoid=[image_hashes_of(hero_img)])
+            if not body_img:
+                print("⚠️ body image fail -> reuse hero")
+                body_img = hero_img
+
+        if use_img_cache:
+            print("🗃️ image cache:", cache_stats())
+
+        # body 변주만 저품질로 1장 재생성(검증 실패/중복 공용, 부를 때마다 다른 seed)
+        reroll_n = 0
+
+        def _reroll_body() -> bytes:
+            nonlocal reroll_n
+            reroll_n += 1
+            if self.procedural:
+                return render_procedural_png(keyword, topic=topic, variant="body", seed=seed + 101 * reroll_n)
+            p = _build_image_prompt(base_prompt, variant="body", seed=seed + 101 * reroll_n, style_mode=style_mode)
+            p += ", alternative composition, different color palette"
+            reroll_quality = _env("IMAGE_REROLL_QUALITY", "low")
+            self.api_image_calls += image_cost_units(quality=reroll_quality)
+            return generate_nanobanana_image_png_bytes(
+                img_client, S.GEMINI_IMAGE_MODEL, p,
+                retries=1, quality=reroll_quality,
+            )
 
-    hero_prompt = _build_image_prompt(base_prompt, variant="hero", seed=seed, style_mode=style_mode)
-    body_prompt = _build_image_prompt(base_prompt, variant="body", seed=seed, style_mode=style_mode)
+        def _reroll_hero() -> bytes:
+            p = _build_image_prompt(base_prompt, variant="hero", seed=seed + 202, style_mode=style_mode)
+            self.api_image_calls += 1
+            return generate_nanobanana_image_png_bytes(img_client, S.GEMINI_IMAGE_MODEL, p, retries=1)
 
-    try:
-        hero_img = generate_nanobanana_image_png_bytes(img_client, S.GEMINI_IMAGE_MODEL, hero_prompt)
-    except Exception as e:
-        print(f"⚠️ hero image fail -> fallback: {e}")
-        hero_img = _fallback_png_bytes(keyword)
+        def _hero_fallback() -> bytes:
+            return pool_take(topic, style_mode, "hero", history) or render_procedural_png(
+                keyword, topic=topic, variant="hero", seed=seed
+            )
 
-    try:
-        body_img = generate_nanobanana_image_png_bytes(img_client, S.GEMINI_IMAGE_MODEL, body_prompt)
-    except Exception as e:
-        print(f"⚠️ body image fail -> reuse hero: {e}")
-        body_img = hero_img
+        # 업로드 전 로컬 검증(빈/거의 단색/글자로 덮인 이미지) → 아직 로컬에 있을 때 재생성
+        # 임계값: IMAGE_VALID_MIN_STD / _MIN_ENTROPY / _MAX_DOMINANT / _MAX_TEXT_BLOCKS, 재생성 횟수: IMAGE_VALID_MAX_REROLL
+        if not self.procedural:
+            hero_img = ensure_valid_image(hero_img, "hero", _reroll_hero, _hero_fallback)
+            if body_img is not hero_img:
+                body_img = ensure_valid_image(body_img, "body", _reroll_body, lambda: hero_img)
+
+        # 최근 글과 거의 같은 이미지(dHash/pHash) → body 변주만 재생성
+        self.hero_img, self.body_img, self.image_hashes = avoid_repeat_images(hero_img, body_img, history, _reroll_body)
+
+    def render_images(self) -> None:
+        # 원본 bytes 1번 디코드 → crop/resize/오버레이 → 1번 인코드
+        # 업로드 포맷: IMAGE_UPLOAD_FORMAT=png(기본)/webp/jpeg (+ IMAGE_TARGET_KB, IMAGE_MIN_SSIM)
+        # IMAGE_WORKERS>1이면 hero/body를 프로세스 풀에서 동시에(입출력은 공유 메모리)
+        hero_img, body_img = self.hero_img, self.body_img
+        image_workers = default_workers()
+        if image_workers > 1:
+            enc_cfg = encode_config_from_env()
+            self.hero_upload, self.body_upload = render_jobs(
+                [
+                    RenderJob(hero_img, self.thumb_title, label="hero", encode=enc_cfg),
+                    RenderJob(body_img, label="body", encode=enc_cfg, sharpen_upscaled=True),
+                ],
+                workers=image_workers,
+            )
+        else:
+            self.hero_upload = render_square_image(
+                hero_img, self.thumb_title, encoder=make_upload_encoder(label="hero", ref_bytes=len(hero_img))
+            )
+            self.body_upload = render_square_image(
+                body_img, encoder=make_upload_encoder(label="body", ref_bytes=len(body_img)), sharpen_upscaled=True
+            )
 
-    hero_img = to_square_1024(hero_img)
-    body_img = to_square_1024(body_img)
-    hero_img_titled = to_square_1024(add_title_to_image(hero_img, thumb_title))
+    # ---- WordPress ----
+    def upload_images(self) -> None:
+        # 같은 바이트는 재업로드하지 않음(state.media_index)
+        S = self.S
+        self.hero_url, self.hero_media_id = upload_media_dedup(
+            S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD,
+            self.hero_upload, make_ascii_filename("featured"), self.state
+        )
+        self.body_url, _ = upload_media_dedup(
+            S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD,
+            self.body_upload, make_ascii_filename("body"), self.state
+        )
 
-    hero_url, hero_media_id = upload_media_to_wp(
-        S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD,
-        hero_img_titled, make_ascii_filename("featured")
-    )
-    body_url, _ = upload_media_to_wp(
-        S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD,
-        body_img, make_ascii_filename("body")
-    )
+    async def upload_images_async(self) -> None:
+        """hero/body 동시 업로드. 같은 bytes면 두 번째가 인덱스를 재사용하도록 순서대로."""
+        if self.body_upload == self.hero_upload:
+            await asyncio.to_thread(self.upload_images)
+            return
+        S = self.S
+        (self.hero_url, self.hero_media_id), (self.body_url, _) = await asyncio.gather(
+            upload_media_dedup_async(
+                S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD,
+                self.hero_upload, make_ascii_filename("featured"), self.state
+            ),
+            upload_media_dedup_async(
+                S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD,
+                self.body_upload, make_ascii_filename("body"), self.state
+            ),
+        )
 
-    # 카테고리(발행 후 PATCH로 확정)
-    cat_id = 0
-    cat_name = _category_name_for_topic(topic)
-    try:
-        cid = ensure_category_id(S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD, name=cat_name)
-        cat_id = int(cid or 0)
-    except Exception as e:
-        print(f"⚠️ category resolve error: {e}")
+    def resolve_category(self) -> int:
+        # 카테고리(발행 후 PATCH로 확정) — topic만 필요
+        S = self.S
+        try:
+            cid = ensure_category_id(S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD, name=_category_name_for_topic(self.topic))
+            return int(cid or 0)
+        except Exception as e:
+            print(f"⚠️ category resolve error: {e}")
+            return 0
+
+    def apply_category(self, cat_id: int) -> None:
+        self.cat_id = cat_id
+        cat_name = _category_name_for_topic(self.topic)
+        if cat_id:
+            self.post["categories"] = [cat_id]
+            print(f"📁 category set: {cat_name} (id={cat_id})")
+        else:
+            print(f"⚠️ category resolve failed: {cat_name} → skip categories")
 
-    if cat_id:
-        post["categories"] = [cat_id]
-        print(f"📁 category set: {cat_name} (id={cat_id})")
-    else:
-        print(f"⚠️ category resolve failed: {cat_name} → skip categories")
+    def coupang_links(self) -> List[Tuple[str, str]]:
+        # keyword만 필요
+        return _coupang_links_from_keyword(self.keyword) if self.coupang_planned else []
 
-    html = _as_html(
-        format_post_v2(
+    # ---- HTML ----
+    def build_html(self, coupang_urls: List[Tuple[str, str]]) -> None:
+        post, keyword = self.post, self.keyword
+        html, slots = format_post_v2(
             title=post["title"],
             keyword=keyword,
-            hero_url=hero_url,
-            body_url=body_url,
+            hero_url=self.hero_url,
+            body_url=self.body_url,
             disclosure_html="",
             summary_bullets=post.get("summary_bullets"),
             sections=post.get("sections"),
             warning_bullets=post.get("warning_bullets"),
             checklist_bullets=post.get("checklist_bullets"),
             outro=post.get("outro"),
+            with_slots=True,
         )
-    )
 
-    # 쿠팡 버튼
-    coupang_inserted = False
-    coupang_urls: List[Tuple[str, str]] = []
-    if topic == "life" and coupang_planned:
-        coupang_urls = _coupang_links_from_keyword(keyword)
-        if coupang_urls:
-            disclosure = _coupang_disclosure_html()
-            buttons = _coupang_buttons_html(coupang_urls, keyword=keyword)
-            html = disclosure + "\n" + html
-            html = _insert_after_first_ul_safe(html, buttons)
-            html = _insert_near_second_h2_safe(html, buttons)
-            html = _insert_end(html, buttons)
-            coupang_inserted = True
-            print("🛒 coupang injected: buttons only")
-        else:
-            print("⚠️ coupang planned BUT deeplink generation failed → skip")
-
-    post["content_html"] = html
-
-    # ✅ WP 일시 장애 재시도 포함 발행
-    post_id = publish_to_wp_with_retry(
-        wp_url=S.WP_URL,
-        wp_user=S.WP_USERNAME,
-        wp_pw=S.WP_APP_PASSWORD,
-        post=post,
-        hero_url=hero_url,
-        body_url=body_url,
-        featured_media_id=int(hero_media_id or 0),
-    )
+        # 광고/쿠팡 블록은 슬롯에 모아두었다가 마지막에 한 번만 조립
+        fills: List[Tuple[str, str]] = []
+
+        # 쿠팡 버튼
+        self.coupang_inserted = False
+        self.coupang_urls = coupang_urls
+        if self.coupang_planned:
+            if coupang_urls:
+                disclosure = _coupang_disclosure_html()
+                buttons = _coupang_buttons_html(coupang_urls, keyword=keyword)
+                fills.append((SLOT_TOP, disclosure))
+                fills.append((SLOT_AFTER_FIRST_LIST, buttons))
+                fills.append((slot_before_section(2), buttons))
+                fills.append((SLOT_END, buttons))
+                self.coupang_inserted = True
+                print("🛒 coupang injected: buttons only")
+            else:
+                print("⚠️ coupang planned BUT deeplink generation failed → skip")
+
+        # AdSense 자동 삽입은 ADSENSE_AUTO_INSERT=1일 때만(기본 OFF)
+        if int(getattr(self.S, "ADSENSE_AUTO_INSERT", 0) or 0):
+            fills.extend(adsense_slot_fills(getattr(self.S, "ADSENSE_SCRIPT_MODE", "")))
+        html = assemble_slots(html, slots, fills)
+
+        # 발행 전 HTML 경량화(들여쓰기/주석/따옴표 정리, pre/script는 그대로)
+        if _env_bool("HTML_MINIFY", "1"):
+            before = len(html.encode("utf-8"))
+            html = minify_html(html)
+            after = len(html.encode("utf-8"))
+            print(f"🗜️ html minify: {before} -> {after} bytes (-{before - after})")
+
+        post["content_html"] = html
+
+        # 페이지 무게 예산(PAGE_WEIGHT_MODE=block이면 초과 시 발행 중단)
+        self.page_weight = page_weight_gate(html)
+
+    def publish(self) -> None:
+        # ✅ WP 일시 장애 재시도 포함 발행
+        S = self.S
+        self.post_id = publish_to_wp_with_retry(
+            wp_url=S.WP_URL,
+            wp_user=S.WP_USERNAME,
+            wp_pw=S.WP_APP_PASSWORD,
+            post=self.post,
+            hero_url=self.hero_url,
+            body_url=self.body_url,
+            featured_media_id=int(self.hero_media_id or 0),
+        )
+
+        # ✅ 발행 성공했을 때만 last_run 기록
+        self.state = _mark_ran_this_slot(self.state, self.forced_slot, self.run_id)
+
+    def save_base(self) -> None:
+        # 오버레이 전 hero를 보관 → 썸네일 스타일 변경 시 app.thumb_rerender로 일괄 재렌더링
+        save_thumb_base(self.state, self.post_id, self.hero_img, self.thumb_title, int(self.hero_media_id or 0))
+
+    def patch_category(self) -> None:
+        # ✅ categories PATCH
+        if self.cat_id:
+            S = self.S
+            _set_post_category(S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD, int(self.post_id), int(self.cat_id))
+
+    # ---- stats / state ----
+    def finish(self) -> None:
+        S, state, topic = self.S, self.state, self.topic
+        image_style_for_stats, thumb_variant = self.image_style_for_stats, self.thumb_variant
+
+        # stats
+        state = record_image_impression(state, image_style_for_stats)
+        state = update_image_score(state, image_style_for_stats)
+        state = record_topic_style_impression(state, topic, image_style_for_stats)
+        state = update_topic_style_score(state, topic, image_style_for_stats)
+
+        state = record_thumb_impression(state, thumb_variant)
+        state = update_thumb_score(state, thumb_variant)
+        state = record_topic_thumb_impression(state, topic, thumb_variant)
+        state = update_topic_thumb_score(state, topic, thumb_variant)
+
+        if topic == "life" and self.life_subtopic:
+            state = record_life_subtopic_impression(state, self.life_subtopic, n=1)
+
+        # 월 비용 누적(이미지 API 호출 수 기준 추정, 캐시 적중분 제외) → 다음 실행의 예산 압박 판단에 사용
+        api_images = max(0, self.api_image_calls - cached_image_units())
+        increment_post_count(
+            state,
+            estimated_usd=estimate_post_usd(text_tokens=_env_int("EST_TEXT_TOKENS", 8000), image_count=api_images),
+        )
 
-    # ✅ 발행 성공했을 때만 last_run 기록
-    state = _mark_ran_this_slot(state, forced_slot, run_id)
+        rule = CooldownRule(
+            min_impressions=int(getattr(S, "COOLDOWN_MIN_IMPRESSIONS", 120)),
+            ctr_floor=float(getattr(S, "COOLDOWN_CTR_FLOOR", 0.0025)),
+            cooldown_days=int(getattr(S, "COOLDOWN_DAYS", 3)),
+        )
+        state = apply_cooldown_rules(state, topic=topic, img=image_style_for_stats, tv=thumb_variant, rule=rule)
+
+        state = add_history_item(
+            state,
+            {
+                "run_id": self.run_id,
+                "post_id": self.post_id,
+                "keyword": self.keyword,
+                "title": self.post["title"],
+                "title_fp": _title_fingerprint(self.post["title"]),
+                "thumb_variant": thumb_variant,
+                "image_style": image_style_for_stats,
+                "topic": topic,
+                "life_subtopic": self.life_subtopic,
+                "coupang_planned": self.coupang_planned,
+                "coupang_inserted": self.coupang_inserted,
+                "coupang_urls": self.coupang_urls,
+                "kst_date": _kst_date_key(),
+                "kst_hour": _kst_now().hour,
+                "forced_slot": self.forced_slot,
+                "page_weight": self.page_weight,
+                "image_hashes": {"hero": self.image_hashes["hero"], "body": self.image_hashes["body"]},
+                "image_mode": "procedural" if self.procedural else "api",
+            },
+        )
+        save_state(state)
+        self.state = state
 
-    # ✅ categories PATCH
-    if cat_id:
-        _set_post_category(S.WP_URL, S.WP_USERNAME, S.WP_APP_PASSWORD, int(post_id), int(cat_id))
+        print(
+            f"✅ 발행 완료: post_id={self.post_id} | topic={topic} | forced_slot={self.forced_slot} "
+            f"| coupang={self.coupang_inserted} | img_style={image_style_for_stats}"
+        )
+        http_pool.report_http()
 
-    # stats
-    state = record_image_impression(state, image_style_for_stats)
-    state = update_image_score(state, image_style_for_stats)
-    state = record_topic_style_impression(state, topic, image_style_for_stats)
-    state = update_topic_style_score(state, topic, image_style_for_stats)
 
-    state = record_thumb_impression(state, thumb_variant)
-    state = update_thumb_score(state, thumb_variant)
-    state = record_topic_thumb_impression(state, topic, thumb_variant)
-    state = update_topic_thumb_score(state, topic, thumb_variant)
+def run() -> None:
+    r = _PostRun(Settings())
+    if not r.setup():
+        return
+    r.pick_keyword()
+    r.write_post()
+    r.thumb_title = r.make_thumb_title()
+    r.plan_images()
+    r.make_images()
+    r.render_images()
+    r.upload_images()
+    r.apply_category(r.resolve_category())
+    r.build_html(r.coupang_links())
+    r.publish()
+    r.save_base()
+    r.patch_category()
+    r.finish()
+
+
+async def async_run() -> None:
+    """
+    RUN_MODE=async: run()과 같은 단계/같은 결과(HTML/state)를, 서로 독립인 단계만 겹쳐서 실행합니다.
+    - 카테고리 조회/생성(topic만 필요), 쿠팡 딥링크(keyword만 필요) ↔ 키워드/본문/이미지 생성
+    - 썸네일 문구(AsyncOpenAI) ↔ 이미지 생성
+    - hero/body 미디어 업로드(비동기 HTTP) 동시
+    - 발행 후 thumb base 저장 ↔ 카테고리 PATCH
+    동기 I/O 단계는 asyncio.to_thread로 실행해 이벤트 루프를 막지 않습니다.
+    """
+    r = _PostRun(Settings())
+    try:
+        if not await asyncio.to_thread(r.setup):
+            return
+        category = asyncio.create_task(asyncio.to_thread(r.resolve_category))
+        await asyncio.to_thread(r.pick_keyword)
+        coupang = asyncio.create_task(asyncio.to_thread(r.coupang_links))
+        await asyncio.to_thread(r.write_post)
 
-    if topic == "life" and life_subtopic:
-        state = record_life_subtopic_impression(state, life_subtopic, n=1)
+        r.plan_images()
+        r.thumb_title, _ = await asyncio.gather(r.make_thumb_title_async(), asyncio.to_thread(r.make_images))
+        await asyncio.to_thread(r.render_images)
+        await r.upload_images_async()
 
-    increment_post_count(state)
+        r.apply_category(await category)
+        r.build_html(await coupang)
+        await asyncio.to_thread(r.publish)
+        await asyncio.gather(asyncio.to_thread(r.save_base), asyncio.to_thread(r.patch_category))
+        await asyncio.to_thread(r.finish)
+    finally:
+        await http_pool.aclose_async_clients()
 
-    rule = CooldownRule(
-        min_impressions=int(getattr(S, "COOLDOWN_MIN_IMPRESSIONS", 120)),
-        ctr_floor=float(getattr(S, "COOLDOWN_CTR_FLOOR", 0.0025)),
-        cooldown_days=int(getattr(S, "COOLDOWN_DAYS", 3)),
-    )
-    state = apply_cooldown_rules(state, topic=topic, img=image_style_for_stats, tv=thumb_variant, rule=rule)
-
-    state = add_history_item(
-        state,
-        {
-            "run_id": run_id,
-            "post_id": post_id,
-            "keyword": keyword,
-            "title": post["title"],
-            "title_fp": _title_fingerprint(post["title"]),
-            "thumb_variant": thumb_variant,
-            "image_style": image_style_for_stats,
-            "topic": topic,
-            "life_subtopic": life_subtopic,
-            "coupang_planned": coupang_planned,
-            "coupang_inserted": coupang_inserted,
-            "coupang_urls": coupang_urls,
-            "kst_date": _kst_date_key(),
-            "kst_hour": _kst_now().hour,
-            "forced_slot": forced_slot,
-        },
-    )
-    save_state(state)
 
-    print(
-        f"✅ 발행 완료: post_id={post_id} | topic={topic} | forced_slot={forced_slot} "
-        f"| coupang={coupang_inserted} | img_style={image_style_for_stats}"
+# -----------------------------
+# IMAGE POOL (inventory mode)
+# -----------------------------
+# 토픽별 범용(키워드 무관) base 프롬프트: 어떤 글에 붙어도 어색하지 않은 이미지
+_POOL_BASE_PROMPTS = {
+    "health": "healthy daily routine, fresh food and water, calm wellness scene",
+    "life": "tidy home interior, practical everyday household items, warm light",
+    "trend": "modern city life, people using smartphones, soft abstract background",
+}
+
+
+def run_inventory() -> None:
+    """
+    RUN_MODE=inventory: 발행 없이 (topic, style_mode)별 hero/body 웜 풀만 채웁니다(한가한 시간대 실행용).
+    - IMAGE_POOL_TOPICS(기본: health,life,trend) / IMAGE_POOL_STYLES(기본: photo,watercolor)
+    - IMAGE_POOL_MAX_NEW: 이번 실행 최대 생성 장수(기본 12)
+    - 예산 압박(IMAGE_PROCEDURAL_BUDGET_RATIO 이상)이면 건너뜀. 생성 비용은 월 비용에 누적.
+    """
+    S = Settings()
+    img_key = _env("IMAGE_API_KEY", "") or getattr(S, "IMAGE_API_KEY", "") or S.OPENAI_API_KEY
+    img_client = make_gemini_client(img_key)
+
+    state = load_state()
+    cfg = GuardConfig(
+        max_posts_per_day=int(getattr(S, "MAX_POSTS_PER_DAY", 3)),
+        max_usd_per_month=float(getattr(S, "MAX_USD_PER_MONTH", 30.0)),
     )
+    if image_budget_pressure(state, cfg, float(_env("IMAGE_PROCEDURAL_BUDGET_RATIO", "0.9") or "0.9")):
+        print("💸 월 예산 압박 → image pool refill 생략")
+        return
+
+    topics = [x.strip() for x in _env("IMAGE_POOL_TOPICS", "health,life,trend").split(",") if x.strip()]
+    styles = [x.strip() for x in _env("IMAGE_POOL_STYLES", "photo,watercolor").split(",") if x.strip()]
+    budget_left = _env_int("IMAGE_POOL_MAX_NEW", 12)
+    generated = 0
+
+    for topic in topics:
+        base = _POOL_BASE_PROMPTS.get(topic) or _POOL_BASE_PROMPTS["health"]
+        for style_mode in styles:
+            if budget_left <= 0:
+                break
+            r = refill_pool(
+                topic,
+                style_mode,
+                generate=lambda p: generate_nanobanana_image_png_bytes(img_client, S.GEMINI_IMAGE_MODEL, p),
+                build_prompt=lambda variant, seed, b=base, sm=style_mode: _build_image_prompt(
+                    b, variant=variant, seed=seed, style_mode=sm
+                ),
+                max_new=budget_left,
+            )
+            budget_left -= r["added"] + r["failed"]
+            generated += r["added"] + r["failed"]
+            print(f"📦 image pool refill {topic}/{style_mode}: {r}")
+
+    add_month_usd(state, estimate_post_usd(text_tokens=0, image_count=generated))
+    save_state(state)
+    print("📦 image pool:", pool_counts())
 
 
 if __name__ == "__main__":
-    run()
+    if _env("RUN_MODE", "").lower() == "inventory":
+        run_inventory()
+    elif _env("RUN_MODE", "").lower() == "async":
+        asyncio.run(async_run())
+    else:
+        run()
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# 저장소 루트(app 패키지)를 import 경로에
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,44 @@
+# tests/test_guardrails.py
+import pytest
+
+from app.guardrails import (
+    GuardConfig,
+    _kst_month_key,
+    _kst_today_key,
+    check_limits_or_raise,
+    image_budget_pressure,
+)
+from app.procedural_image import use_procedural_images
+
+
+def _state(posts_today: int, month_usd: float) -> dict:
+    return {
+        "limits": {
+            "posts_by_day": {_kst_today_key(): posts_today},
+            "usd_by_month": {_kst_month_key(): month_usd},
+        }
+    }
+
+
+@pytest.fixture(autouse=True)
+def _image_env(monkeypatch):
+    for k in ("IMAGE_MODE", "IMAGE_PROCEDURAL_TOPICS", "IMAGE_PROCEDURAL_ON_BUDGET"):
+        monkeypatch.delenv(k, raising=False)
+
+
+def test_post_limit_does_not_force_procedural_images():
+    cfg = GuardConfig(max_posts_per_day=3, max_usd_per_month=30.0)
+    state = _state(posts_today=5, month_usd=1.0)
+
+    with pytest.raises(RuntimeError):
+        check_limits_or_raise(state, cfg)  # 일일 발행 수 초과
+
+    pressure = image_budget_pressure(state, cfg, 0.9)
+    assert pressure is False
+    assert use_procedural_images("health", budget_pressure=pressure) is False
+
+
+@pytest.mark.parametrize("month_usd, ratio, expected", [(27.0, 0.9, True), (26.0, 0.9, False), (31.0, 1.5, True)])
+def test_monthly_spend_drives_pressure(month_usd, ratio, expected):
+    cfg = GuardConfig(max_posts_per_day=3, max_usd_per_month=30.0)
+    assert image_budget_pressure(_state(0, month_usd), cfg, ratio) is expected
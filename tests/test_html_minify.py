@@ -0,0 +1,32 @@
+# tests/test_html_minify.py
+from app.html_minify import minify_html
+
+
+def test_attribute_values_are_kept_byte_for_byte():
+    html = (
+        '<img src="a.png" alt="두  칸   공백" title=\'줄\n바꿈\'>\n'
+        '<div style="color:red;\n  margin:0" data-x="  앞뒤 공백  ">본문</div>'
+    )
+    out = minify_html(html)
+    assert 'alt="두  칸   공백"' in out
+    assert 'title="줄\n바꿈"' in out
+    assert 'style="color:red;\n  margin:0"' in out
+    assert 'data-x="  앞뒤 공백  "' in out
+
+
+def test_quoted_gt_in_attribute():
+    out = minify_html('<img src="x.png" alt="a > b" loading=lazy>')
+    assert out == '<img src="x.png" alt="a > b" loading="lazy">'
+
+
+def test_wordpress_structural_comments_are_kept():
+    html = "<p>요약</p>\n<!--more-->\n<p>1쪽</p>\n<!--nextpage-->\n<p>2쪽</p>\n<!-- 지울 주석 -->"
+    out = minify_html(html)
+    assert "<!--more-->" in out
+    assert "<!--nextpage-->" in out
+    assert "지울 주석" not in out
+
+
+def test_inline_spacing_kept_block_spacing_dropped():
+    out = minify_html("<div>\n  <p><strong>굵게</strong>\n  <a href=\"/x\">링크</a></p>\n</div>")
+    assert out == '<div><p><strong>굵게</strong> <a href="/x">링크</a></p></div>'
@@ -0,0 +1,49 @@
+# tests/test_image_attrs.py
+import re
+
+import pytest
+
+from app.formatter_v2 import SLOT_AFTER_SUMMARY, assemble_slots, format_post_v2
+from app.html_minify import minify_html
+from app.monetize_coupang import _box_html
+from app.page_weight import analyze_page_weight
+
+HERO = "https://example.com/featured.png"
+BODY = "https://example.com/body.png"
+
+
+def _post_html():
+    html, slots = format_post_v2(
+        title="혈압 관리 핵심",
+        keyword="혈압",
+        hero_url=HERO,
+        body_url=BODY,
+        summary_bullets=["하나", "둘"],
+        sections=[{"title": f"소제목 {i}", "body": "본문 문단"} for i in range(1, 4)],
+        warning_bullets=["주의"],
+        outro="마무리 문단",
+        with_slots=True,
+    )
+    products = [
+        {"name": "혈압계 A > B 세트", "price": "39,000", "url": "https://link.coupang.com/a", "image": "https://img/a.jpg"},
+        {"name": "혈압계 C", "price": "29,000", "url": "https://link.coupang.com/c", "image": "https://img/c.jpg"},
+    ]
+    box = _box_html("혈압", products, "mid")
+    return assemble_slots(html, slots, [(SLOT_AFTER_SUMMARY, box)])
+
+
+@pytest.mark.parametrize("minify", [False, True])
+def test_img_dimensions_and_priority(minify):
+    html = _post_html()
+    if minify:
+        html = minify_html(html)
+    report = analyze_page_weight(html)
+
+    assert report["images"] == 4  # hero + body + 쿠팡 상품 2개
+    assert report["images_missing_dims"] == 0
+    assert report["images_high_priority"] == 1
+    assert report["images_lazy"] == 3  # hero만 즉시 로드
+
+    # fetchpriority=high는 대표 이미지(hero)에 붙어야 함
+    hero_tag = re.search(r"<img\b[^>]*" + re.escape(HERO) + r"[^>]*>", html).group(0)
+    assert "fetchpriority" in hero_tag and "loading=" not in hero_tag
@@ -0,0 +1,91 @@
+# tests/test_image_hedge.py
+import base64
+import threading
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from app.ai_gemini_image import generate_hero_body_png_bytes
+from app.image_hedge import HedgePolicy
+
+
+def _png_b64(color) -> str:
+    out = BytesIO()
+    Image.new("RGB", (64, 64), color).save(out, format="PNG")
+    return base64.b64encode(out.getvalue()).decode()
+
+
+class _SlowFirstImages:
+    """첫 요청만 느린 images.generate"""
+
+    def __init__(self, slow_sec: float):
+        self.slow_sec = slow_sec
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, *, n: int = 1, **_):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            time.sleep(self.slow_sec)
+        data = [type("D", (), {"b64_json": _png_b64((40 * i, 90, 160))})() for i in range(n)]
+        return type("R", (), {"data": data})()
+
+
+class _Client:
+    def __init__(self, images):
+        self.images = images
+
+
+def test_pair_request_is_hedged_and_recorded(monkeypatch):
+    monkeypatch.setenv("IMAGE_HEDGE_DEFAULT_SEC", "0.05")
+    monkeypatch.setenv("IMAGE_HEDGE_MAX_USD_PER_DAY", "10")
+    monkeypatch.setattr("app.ai_gemini_image._check_image_bytes", lambda b: b)
+
+    state: dict = {}
+    policy = HedgePolicy(state)
+    images = _SlowFirstImages(slow_sec=1.0)
+
+    t0 = time.perf_counter()
+    hero, body, calls = generate_hero_body_png_bytes(
+        _Client(images), "gpt-image-1", "hero", "body", retries=1, hedge=policy
+    )
+    elapsed = time.perf_counter() - t0
+    policy.close()
+
+    assert hero and body and calls == 2
+    assert images.calls == 2  # 원 요청 + 헤지 1회
+    assert elapsed < 0.9
+    assert policy.extra_units == 2.0  # n=2 헤지 = 2장분
+    assert list(state["image_latency"]) == ["pair:1024x1024/medium"]
+
+
+class _AlwaysSlowImages:
+    """timeout까지 기다렸다가 실패하는 images.generate(받은 timeout 기록)"""
+
+    def __init__(self):
+        self.timeouts = []
+
+    def generate(self, *, timeout: float, **_):
+        self.timeouts.append(timeout)
+        time.sleep(min(timeout, 0.2))
+        raise RuntimeError("timeout")
+
+
+def test_deadline_is_split_across_retries(monkeypatch):
+    monkeypatch.setenv("IMAGE_REQUEST_TIMEOUT_SEC", "180")
+    images = _AlwaysSlowImages()
+
+    try:
+        generate_hero_body_png_bytes(
+            _Client(images), "gpt-image-1", "hero", "body",
+            retries=3, sleep_sec=0.0, deadline=time.monotonic() + 90,
+        )
+    except RuntimeError:
+        pass
+
+    assert len(images.timeouts) == 3  # 첫 시도가 한도를 다 쓰지 않아 재시도가 남음
+    assert 29 <= images.timeouts[0] <= 30
+    assert all(t <= 180 for t in images.timeouts)
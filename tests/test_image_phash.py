@@ -0,0 +1,47 @@
+# tests/test_image_phash.py
+from io import BytesIO
+
+from PIL import Image
+
+from app.image_phash import avoid_repeat_images, image_hashes
+
+
+def _png(img: Image.Image) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _noise() -> bytes:
+    return _png(Image.effect_noise((256, 256), 60).convert("RGB"))
+
+
+def _flat() -> bytes:
+    return _png(Image.new("RGB", (256, 256), "white"))
+
+
+def _no_reroll() -> bytes:
+    raise AssertionError("reroll_body should not be called")
+
+
+def test_body_reusing_hero_is_not_rerolled():
+    hero = _noise()
+    for body in (hero, bytes(hero)):  # 같은 객체 / 같은 bytes
+        _, out, info = avoid_repeat_images(hero, body, [], _no_reroll)
+        assert info["rerolled"] is False
+        assert out == hero
+
+
+def test_rerolled_body_is_validated():
+    hero, body = _noise(), _noise()
+    history = [{"image_hashes": {"body": image_hashes(body)}}]
+    calls = []
+
+    def reroll() -> bytes:
+        calls.append(1)
+        return _flat()  # 단색 → 검증 실패
+
+    _, out, info = avoid_repeat_images(hero, body, history, reroll)
+    assert info["rerolled"] is True
+    assert calls
+    assert out is hero  # 검증 실패 → hero 재사용
@@ -0,0 +1,69 @@
+# tests/test_monetize_adsense.py
+import re
+
+import pytest
+
+from app.monetize_adsense import adsense_slot_fills
+
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+_FULL_SNIPPET = (
+    '<script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-1"'
+    ' crossorigin="anonymous"></script>\n'
+    '<ins class="adsbygoogle" style="display:block" data-ad-client="ca-pub-1" data-ad-slot="333"></ins>\n'
+    "<script>(adsbygoogle = window.adsbygoogle || []).push({});</script>"
+)
+
+
+@pytest.fixture(autouse=True)
+def _adsense_env(monkeypatch):
+    monkeypatch.setenv("ADSENSE_CLIENT", "ca-pub-1")
+    monkeypatch.setenv("ADSENSE_SLOT_TOP", "111")
+    monkeypatch.setenv("ADSENSE_SLOT_MID", "222")
+    monkeypatch.setenv("ADSENSE_SLOT_BOTTOM", _FULL_SNIPPET)  # 사용자가 넣은 전체 코드(로더+push 포함)
+    monkeypatch.delenv("ADSENSE_INCLUDE_SCRIPT", raising=False)
+    monkeypatch.delenv("ADSENSE_SCRIPT_MODE", raising=False)
+
+
+def _joined(fills):
+    return "\n".join(html for _, html in fills)
+
+
+@pytest.mark.parametrize("include_script", ["1", "0"])
+@pytest.mark.parametrize("mode", ["deferred", "lazy"])
+def test_one_loader_and_one_initializer(monkeypatch, mode, include_script):
+    # include_script=0: 설정 로더 없음 → 사용자가 붙여넣은 로더를 남겨야 광고가 뜸
+    monkeypatch.setenv("ADSENSE_INCLUDE_SCRIPT", include_script)
+    html = _joined(adsense_slot_fills(mode))
+    scripts = _SCRIPT_RE.findall(html)
+    loaders = [s for s in scripts if "adsbygoogle.js" in s]
+    initializers = [s for s in scripts if ".push(" in s]
+
+    assert len(loaders) == 1
+    assert len(initializers) <= 1
+    assert len(scripts) == len(loaders) + len(initializers)
+    assert len(re.findall(r'<ins data-post-ad="', html)) == 3
+
+
+def test_inline_mode_pushes_per_slot():
+    html = _joined(adsense_slot_fills("inline"))
+    initializers = [s for s in _SCRIPT_RE.findall(html) if ".push(" in s]
+    assert len(initializers) == 3
+
+
+def test_lazy_slots_hidden_from_global_push():
+    html = _joined(adsense_slot_fills("lazy"))
+    ins = re.findall(r"<ins\b[^>]*>", html)
+    now = [t for t in ins if 'data-post-ad="now"' in t]
+    lazy = [t for t in ins if 'data-post-ad="lazy"' in t]
+
+    assert len(now) == 1 and len(lazy) == 2
+    # push({})는 처리 안 된 첫 ins.adsbygoogle을 채움 → lazy 슬롯은 보이기 전까지 그 class가 없어야 함
+    assert all(re.search(r'class="adsbygoogle"', t) for t in now)
+    assert all(re.search(r'class="adsbygoogle-lazy"', t) for t in lazy)
+
+
+def test_settings_mode_overrides_env(monkeypatch):
+    monkeypatch.setenv("ADSENSE_SCRIPT_MODE", "inline")
+    html = _joined(adsense_slot_fills("deferred"))
+    assert len([s for s in _SCRIPT_RE.findall(html) if ".push(" in s]) == 1
@@ -0,0 +1,45 @@
+# tests/test_thumb_overlay.py
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from app.thumb_overlay import render_square_image, to_square_1024
+
+
+def _png(size) -> bytes:
+    img = Image.effect_noise(size, 40).convert("RGB")
+    ImageDraw.Draw(img).ellipse((10, 10, size[0] // 2, size[1] // 2), fill=(200, 60, 30))
+    out = BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def _baseline_square_1024(img_bytes: bytes) -> Image.Image:
+    """변경 전 to_square_1024: 가운데 정사각 crop → LANCZOS 1024"""
+    img = Image.open(BytesIO(img_bytes)).convert("RGB")
+    w, h = img.size
+    size = min(w, h)
+    left, top = (w - size) // 2, (h - size) // 2
+    return img.crop((left, top, left + size, top + size)).resize((1024, 1024), Image.LANCZOS)
+
+
+def _same(a: Image.Image, b: Image.Image) -> bool:
+    return a.size == b.size and ImageChops.difference(a, b).getbbox() is None
+
+
+def _open(b: bytes) -> Image.Image:
+    return Image.open(BytesIO(b)).convert("RGB")
+
+
+@pytest.mark.parametrize("size", [(512, 384), (1536, 1024)])
+def test_to_square_1024_matches_baseline(size):
+    src = _png(size)
+    assert _same(_open(to_square_1024(src)), _baseline_square_1024(src))
+    assert _same(_open(render_square_image(src)), _baseline_square_1024(src))
+
+
+def test_sharpen_only_when_requested_for_small_sources():
+    small, large = _png((512, 512)), _png((1024, 1024))
+    assert not _same(_open(render_square_image(small, sharpen_upscaled=True)), _baseline_square_1024(small))
+    assert _same(_open(render_square_image(large, sharpen_upscaled=True)), _baseline_square_1024(large))